@@ -35,6 +35,7 @@ Usage:
 from __future__ import annotations
 
 import argparse
+import asyncio
 import io
 import logging
 import os
@@ -47,6 +48,7 @@ from pathlib import Path
 from google import genai
 from google.cloud import texttospeech
 from google.genai import types
+from podcast_shared import RateLimitedGemini
 from pydub import AudioSegment
 
 logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
@@ -223,7 +225,7 @@ def chunk_ssml(ssml: str, max_chars: int = CHUNK_SIZE) -> list[str]:
 # ---------------------------------------------------------------------------
 
 
-def enrich_with_ssml(text: str, gemini_client: genai.Client) -> str | None:
+async def enrich_with_ssml(text: str, gemini_client: RateLimitedGemini) -> str | None:
     """Use Gemini to convert plain text to SSML.
 
     Returns:
@@ -231,7 +233,7 @@ def enrich_with_ssml(text: str, gemini_client: genai.Client) -> str | None:
 
     """
     try:
-        response = gemini_client.models.generate_content(
+        response = await gemini_client.agenerate_content(
             model=SSML_ENRICHMENT_MODEL,
             config=types.GenerateContentConfig(
                 system_instruction=SSML_SYSTEM_PROMPT,
@@ -258,7 +260,11 @@ def enrich_with_ssml(text: str, gemini_client: genai.Client) -> str | None:
         return None
 
 
-def generate_ssml_s1(body: str, gemini_client: genai.Client, output_dir: Path) -> list[str] | None:
+async def _enrich_all(chunks: list[str], gemini_client: RateLimitedGemini) -> list[str | None]:
+    return await asyncio.gather(*(enrich_with_ssml(chunk, gemini_client) for chunk in chunks))
+
+
+def generate_ssml_s1(body: str, gemini_client: RateLimitedGemini, output_dir: Path) -> list[str] | None:
     """Generate LLM SSML (S-1) for the full article body.
 
     Returns:
@@ -270,9 +276,10 @@ def generate_ssml_s1(body: str, gemini_client: genai.Client, output_dir: Path) -
     ssml_parts: list[str] = []
     fallback_count = 0
 
-    for i, chunk in enumerate(enrichment_chunks):
-        logging.info("  Enriching chunk %d/%d...", i + 1, len(enrichment_chunks))
-        result = enrich_with_ssml(chunk, gemini_client)
+    # Chunks are enriched concurrently; the client enforces rate and concurrency limits.
+    logging.info("  Enriching %d chunks...", len(enrichment_chunks))
+    results = asyncio.run(_enrich_all(enrichment_chunks, gemini_client))
+    for chunk, result in zip(enrichment_chunks, results, strict=True):
         if result:
             ssml_parts.append(result)
         else:
@@ -383,7 +390,7 @@ def synthesize_cloud_tts(
 
 
 def synthesize_gemini_tts(
-    gemini_client: genai.Client,
+    gemini_client: RateLimitedGemini,
     text: str,
     *,
     model: str,
@@ -403,7 +410,7 @@ def synthesize_gemini_tts(
     for i, chunk in enumerate(chunks):
         logging.info("  [%s] Synthesizing chunk %d/%d (%d chars)...", label, i + 1, len(chunks), len(chunk))
         try:
-            response = gemini_client.models.generate_content(
+            response = gemini_client.generate_content(
                 model=model,
                 contents=f"{GEMINI_STYLE_PROMPT}\n\n{chunk}",
                 config=types.GenerateContentConfig(
@@ -420,7 +427,6 @@ def synthesize_gemini_tts(
             for part in response.candidates[0].content.parts:
                 if part.inline_data and part.inline_data.mime_type.startswith("audio/"):
                     all_audio_data.append(part.inline_data.data)
-            time.sleep(0.5)
         except Exception:
             logging.exception("  [%s] Chunk %d failed", label, i + 1)
 
@@ -559,7 +565,7 @@ def main() -> None:
         if not api_key:
             logging.error("GOOGLE_API_KEY or GEMINI_API_KEY required")
             sys.exit(1)
-        gemini_client = genai.Client(api_key=api_key)
+        gemini_client = RateLimitedGemini(genai.Client(api_key=api_key))
         logging.info("Gemini client initialized")
 
     # --- Generate SSML if needed ---
@@ -0,0 +1,150 @@
+"""Micro-benchmark single-parse extraction against bare_extraction + extract.
+
+Times both ways of getting a page's title and text over a corpus of saved HTML
+pages, keeping the best of several runs per page, and checks that they agree.
+The default corpus is every .html file under ../html-comparison/ (the
+source.html files written by compare_html_extraction.py); any files or
+directories of saved pages can be given instead.
+
+Usage:
+    cd imap && uv run python3 bench_extraction.py [PATH ...] [--repeat N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import pathlib
+import statistics
+import time
+from typing import TYPE_CHECKING
+
+from podcast_shared.extraction import extract_article
+from trafilatura import bare_extraction, extract
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+
+DEFAULT_CORPUS = "../html-comparison"
+DEFAULT_REPEAT = 5
+
+
+def load_pages(paths: list[str]) -> dict[str, str]:
+    """Read every .html file under *paths* (files are taken as given).
+
+    Returns:
+        Page HTML keyed by path.
+
+    """
+    pages: dict[str, str] = {}
+    for raw_path in paths:
+        path = pathlib.Path(raw_path)
+        files = sorted(path.rglob("*.html")) if path.is_dir() else [path]
+        for file in files:
+            pages[str(file)] = file.read_text(encoding="utf-8", errors="replace")
+    return pages
+
+
+def two_pass(html: str) -> tuple[str, str]:
+    """Title from bare_extraction and text from a second, full extract (the previous approach).
+
+    Returns:
+        ``(title, text)``.
+
+    """
+    document: object | None = bare_extraction(html, with_metadata=True)
+    as_dict_fn = getattr(document, "as_dict", None)
+    raw: object = as_dict_fn() if callable(as_dict_fn) else None
+    title = ""
+    if isinstance(raw, dict):
+        title = str(raw.get("title") or "")  # pyright: ignore[reportUnknownMemberType, reportUnknownArgumentType]
+    return title, str(extract(html, include_comments=False, favor_recall=True) or "")
+
+
+def one_pass(html: str) -> tuple[str, str]:
+    """Title and text from a single extract_article parse.
+
+    Returns:
+        ``(title, text)``.
+
+    """
+    extraction = extract_article(html)
+    return (extraction["title"], extraction["text"]) if extraction else ("", "")
+
+
+def benchmark(
+    pages: dict[str, str],
+    approaches: dict[str, Callable[[str], tuple[str, str]]],
+    repeat: int,
+) -> tuple[dict[str, dict[str, int]], dict[str, dict[str, tuple[str, str]]]]:
+    """Run every approach on every page *repeat* times, interleaved so drift affects all alike.
+
+    Returns:
+        Best nanoseconds per approach and page, and each approach's output per page.
+
+    """
+    best: dict[str, dict[str, int]] = {name: {} for name in approaches}
+    outputs: dict[str, dict[str, tuple[str, str]]] = {name: {} for name in approaches}
+    for _ in range(repeat):
+        for page, html in pages.items():
+            for name, approach in approaches.items():
+                started = time.perf_counter_ns()
+                outputs[name][page] = approach(html)
+                elapsed = time.perf_counter_ns() - started
+                best[name][page] = min(elapsed, best[name].get(page, elapsed))
+    return best, outputs
+
+
+def main() -> None:
+    """Parse command-line options, benchmark both approaches, and report mismatches.
+
+    Raises:
+        SystemExit: With status 1 when the approaches disagree on any page.
+
+    """
+    arg_parser = argparse.ArgumentParser(description="Benchmark single-parse extraction against two passes")
+    _ = arg_parser.add_argument(
+        "paths",
+        nargs="*",
+        default=[DEFAULT_CORPUS],
+        help=f"Saved .html files or directories of them (default: {DEFAULT_CORPUS})",
+    )
+    _ = arg_parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="Timed runs; the best is kept")
+    args = arg_parser.parse_args()
+    repeat: int = args.repeat  # pyright: ignore[reportAny]
+    if repeat < 1:
+        arg_parser.error("--repeat must be at least 1")
+
+    # trafilatura logs a warning for every page it cannot extract
+    logging.getLogger("trafilatura").setLevel(logging.ERROR)
+    pages = load_pages(args.paths)  # pyright: ignore[reportAny]
+    if not pages:
+        arg_parser.error("no .html pages found")
+    total_size = sum(len(html.encode("utf-8")) for html in pages.values())
+
+    best, outputs = benchmark(pages, {"bare_extraction + extract": two_pass, "extract_article": one_pass}, repeat)
+
+    print(f"{len(pages)} pages, {total_size / 1e6:.2f} MB, best of {repeat}\n")
+    print(f"{'approach':<26}  {'total ms':>9}  {'median ms':>9}  {'MB/s':>6}")
+    for name, per_page in best.items():
+        total_ns = sum(per_page.values())
+        print(
+            f"{name:<26}  {total_ns / 1e6:>9.1f}  {statistics.median(per_page.values()) / 1e6:>9.2f}  "
+            f"{total_size / 1e6 / (total_ns / 1e9):>6.2f}",
+        )
+    before, after = (sum(per_page.values()) for per_page in best.values())
+    print(f"\nsaving: {100 * (1 - after / before):.0f}% ({before / after:.2f}x)")
+
+    two_pass_outputs, one_pass_outputs = outputs.values()
+    mismatches = [page for page in pages if two_pass_outputs[page] != one_pass_outputs[page]]
+    for page in mismatches:
+        logging.warning("Output differs for %s", page)
+    logging.info("%d of %d pages extract identically", len(pages) - len(mismatches), len(pages))
+    if mismatches:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,12 @@
 """Fetch unseen Gmail messages and write raw text files for the pipeline."""
 
+import asyncio
 import logging
 import os
 import pathlib
 import re
-from typing import TYPE_CHECKING
+import time
+from typing import TYPE_CHECKING, TypedDict
 from urllib.parse import parse_qs, urlencode, urlparse, urlunparse
 
 if TYPE_CHECKING:
@@ -16,31 +18,33 @@ from imap_tools.consts import MailMessageFlags
 from imap_tools.mailbox import MailBox
 from imap_tools.message import MailMessage
 from imap_tools.query import AND
-from playwright.sync_api import sync_playwright
 from podcast_shared import apply_id3_tags, generate_summary, send_gotify_notification
-from trafilatura import bare_extraction, extract
+from podcast_shared.browser import AsyncBrowserPool, aload_until_stable
+from podcast_shared.extraction import Extraction, extract_article
+from podcast_shared.fetch import MIN_EXTRACTION_SCORE, FetchTierStats, fetch_html, score_extraction
 
 logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
 
 output_folder = "../prepare-text/text-input-raw"
+# Per-run fetch tier hit rates, kept next to prepare_text's stats
+fetch_stats_dir = "../prepare-text/stats/fetch"
 gmail_user = os.getenv("GMAIL_PODCAST_ACCOUNT")
 gmail_password = os.getenv("GMAIL_PODCAST_ACCOUNT_APP_PASSWORD")
 local_scraper_url = "http://localhost:3001/fetch"
 nyt_scraper_url = "http://localhost:3002/fetch"
+# Pages loading at once; each waits a few seconds at most for its DOM to settle after loading.
+link_fetch_concurrency = 4
+youtube_max_concurrent = 2
 
 
-def extract_title(obj: object) -> str:
-    """Extract the title from a trafilatura result via as_dict().
+class PendingEmail(TypedDict):
+    """A link or YouTube email waiting for its fetch."""
 
-    Returns:
-        The title string, or empty string if unavailable.
-
-    """
-    as_dict_fn = getattr(obj, "as_dict", None)
-    raw: object = as_dict_fn() if callable(as_dict_fn) else None
-    if isinstance(raw, dict):
-        return str(raw.get("title") or "")  # pyright: ignore[reportUnknownMemberType, reportUnknownArgumentType]
-    return ""
+    msg: MailMessage
+    kind: str
+    url: str
+    date_stamp: str
+    from_name: str
 
 
 def normalize_text(value: str) -> str:
@@ -154,7 +158,53 @@ def find_source_url(links: list[dict[str, str]], source_kind: str, subject: str)
     return ""
 
 
-def fetch_and_process_html(url: str, request_body: dict[str, str] | None = None) -> tuple[object | None, str | None]:
+def extract_page_text(html_content: str, url: str) -> tuple[Extraction | None, str | None]:
+    """Extract the title and article text from rendered HTML with trafilatura.
+
+    Returns:
+        ``(extraction, extracted_text)``, or ``(None, None)`` when trafilatura
+        finds no document.
+
+    """
+    extraction = extract_article(html_content)
+    if extraction is None:
+        logging.error("trafilatura returned no metadata for %s", url)
+        return None, None
+    content_text: str = extraction["title"] + ".\n" + "\n" + extraction["text"]
+
+    return extraction, content_text
+
+
+def fetch_via_http(url: str) -> tuple[Extraction | None, str | None]:
+    """Fetch *url* with a plain GET and keep the extraction if it scores as a complete article.
+
+    Returns:
+        ``(extraction, extracted_text)``, or ``(None, None)`` when
+        the page has to go through the scraper and browser instead.
+
+    """
+    html_content = fetch_html(url)
+    if html_content is None:
+        return None, None
+    try:
+        parsed, content_text = extract_page_text(html_content, url)
+    except Exception:
+        logging.exception("Extraction of %s failed; falling back to the browser", url)
+        return None, None
+    if parsed is None or content_text is None:
+        return None, None
+    score = score_extraction(parsed["title"], content_text, html=html_content)
+    if score < MIN_EXTRACTION_SCORE:
+        logging.info("HTTP extraction of %s scored %.2f; falling back to the browser", url, score)
+        return None, None
+    return parsed, content_text
+
+
+async def fetch_and_process_html(
+    url: str,
+    request_body: dict[str, str] | None,
+    browser_pool: AsyncBrowserPool,
+) -> tuple[Extraction | None, str | None]:
     """Fetch a URL via headless Chromium and extract text with trafilatura.
 
     Parameters
@@ -164,76 +214,229 @@ def fetch_and_process_html(url: str, request_body: dict[str, str] | None = None)
         target becomes ``url?url=<request_body['url']>``.
     request_body : dict | None
         If provided, its ``url`` value is appended as a query parameter.
+    browser_pool : AsyncBrowserPool
+        Run-wide browser to open the page in; it caps how many pages load at once.
 
     Returns
     -------
-    tuple[object | None, str | None]
-        ``(trafilatura_metadata, extracted_text)`` on success, or
+    tuple[Extraction | None, str | None]
+        ``(extraction, extracted_text)`` on success, or
         ``(None, None)`` when the page could not be fetched or parsed.
 
     """
     try:
         logging.info("Fetching %s", url)
 
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=True)
-            context = browser.new_context()
-            page = context.new_page()
-
+        async with browser_pool.page() as page:
             try:
                 if request_body:
                     logging.info(
                         "Making GET request to %s with url query parameter",
                         url,
                     )
-                    _ = page.goto(
-                        f"{url}?url={request_body['url']}",
-                        wait_until="networkidle",
-                        timeout=180000,
-                    )
+                    await aload_until_stable(page, f"{url}?url={request_body['url']}", timeout_ms=180000)
                 else:
                     logging.info("Making GET request to %s", url)
-                    _ = page.goto(url, wait_until="networkidle", timeout=180000)
+                    await aload_until_stable(page, url, timeout_ms=180000)
 
                 # Get rendered HTML content
-                html_content = page.content()
+                html_content = await page.content()
 
             except Exception:
                 logging.exception("Error occurred while fetching %s", url)
                 html_content = None
 
-            finally:
-                browser.close()
-
         if html_content is None:
             logging.error("Playwright returned no content for %s", url)
             return None, None
 
-        trafilatura_result: object | None = bare_extraction(
-            html_content,
-            with_metadata=True,
-        )
-        if trafilatura_result is None:
-            logging.error("trafilatura returned no metadata for %s", url)
-            return None, None
-        webpage_text: str = str(extract(html_content, include_comments=False, favor_recall=True) or "")
-        title: str = extract_title(trafilatura_result)
-        content_text: str = title + ".\n" + "\n" + webpage_text
-
-        return trafilatura_result, content_text
+        # Parse off the event loop so other pages keep loading meanwhile
+        return await asyncio.to_thread(extract_page_text, html_content, url)
 
     except Exception:
         logging.exception("Error occurred")
         return None, None
 
 
+def download_youtube_audio(youtube_url: str) -> None:
+    """Download a YouTube video's audio as MP3 and tag it with a Gemini summary."""
+    logging.info("fetching youtube audio: %s", youtube_url)
+    ydl_opts: _Params = {
+        "format": "bestaudio[protocol!=m3u8][protocol!=m3u8_native]/bestaudio/best",
+        "extractor_args": {"youtube": {"player_client": ["android"]}},
+        "fragment_retries": 10,
+        "retries": 5,
+        "postprocessors": [
+            {
+                "key": "FFmpegExtractAudio",
+                "preferredcodec": "mp3",
+                "preferredquality": "192",
+            },
+        ],
+        "outtmpl": "../dropcaster-docker/audio/%(uploader)s- %(title)s.%(ext)s",
+    }
+    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+        info = ydl.extract_info(youtube_url, download=True)
+        base_filename: str = str(ydl.prepare_filename(info))
+        mp3_filename = str(pathlib.Path(base_filename).with_suffix(".mp3"))
+        info_dict: dict[str, object] = dict(info) if info else {}
+        video_title: str = str(info_dict.get("title") or "YouTube Video")
+        video_url: str = str(info_dict.get("webpage_url") or youtube_url)
+        video_description: str = str(info_dict.get("description") or "")
+        summary = generate_summary(video_description, video_title)
+        description_body = summary or "Summary unavailable."
+        description = (
+            f'{video_title}<br/><br/>{description_body}<br/><br/>Source: <a href="{video_url}">{video_url}</a>'
+        )
+        if pathlib.Path(mp3_filename).exists():
+            apply_id3_tags(mp3_filename, title=video_title, description=description, source_url=video_url, v1=1)
+        else:
+            logging.error("Expected MP3 not found: %s", mp3_filename)
+
+
+def write_link_text(item: PendingEmail, parsed: Extraction, webpage_text: str) -> None:
+    """Write a fetched article to the text input folder with its metadata block."""
+    raw_title: str = parsed["title"] or "No title available"
+    title_for_filename = re.sub(r"[^A-Za-z0-9 ]+", "", raw_title)
+    output_filename = f"{output_folder}/{item['date_stamp']}-{title_for_filename}.txt"
+    metadata_block = "\n".join(
+        [
+            f"META_FROM: {item['from_name']}",
+            f"META_TITLE: {raw_title}",
+            f"META_SOURCE_URL: {item['url']}",
+            "META_SOURCE_KIND: url",
+            "META_INTAKE_TYPE: link",
+        ],
+    )
+    logging.info("Writing metadata block to text input")
+    _ = pathlib.Path(output_filename).write_text(metadata_block + "\n\n" + webpage_text, encoding="utf-8")
+
+
+def mark_seen(mailbox: MailBox, msg: MailMessage) -> None:
+    """Set the IMAP Seen flag so the message is not processed again."""
+    flags = MailMessageFlags.SEEN
+    uid: str = msg.uid or ""
+    _ = mailbox.flag(uid, flags, value=True)  # pyright: ignore[reportUnknownMemberType, reportUnknownVariableType]
+
+
+def error_sender(msg: MailMessage) -> str:
+    """Return the sender address to name in error reports for *msg*.
+
+    Returns:
+        The sender's email address, or "unknown".
+
+    """
+    error_from = msg.from_values
+    return error_from.email if error_from else "unknown"
+
+
+def report_email_error(msg: MailMessage) -> None:
+    """Send a Gotify notification that *msg* could not be processed."""
+    send_gotify_notification(
+        "Email processing error",
+        f"Failed to process email from {error_sender(msg)}: {msg.subject}",
+    )
+
+
+async def fetch_pending(
+    item: PendingEmail,
+    browser_pool: AsyncBrowserPool,
+    youtube_slots: asyncio.Semaphore,
+    fetch_tiers: FetchTierStats,
+) -> tuple[Extraction | None, str | None]:
+    """Fetch one link or YouTube email.
+
+    Links are tried with a plain GET first and go through the scraper and
+    browser only when that extraction scores low.
+
+    Returns:
+        The ``fetch_and_process_html`` result for a link email, or
+        ``(None, None)`` once a YouTube download has finished.
+
+    """
+    if item["kind"] == "youtube":
+        async with youtube_slots:
+            await asyncio.to_thread(download_youtube_audio, item["url"])
+        return None, None
+    logging.info("fetching webpage: %s", item["url"])
+    if "nytimes.com" in item["url"]:
+        # Paywalled: a plain GET only ever sees the teaser
+        scraper_url = nyt_scraper_url
+    else:
+        started = time.monotonic()
+        parsed, webpage_text = await asyncio.to_thread(fetch_via_http, item["url"])
+        fetch_tiers.record("http", hit=webpage_text is not None, seconds=time.monotonic() - started)
+        if webpage_text is not None:
+            return parsed, webpage_text
+        scraper_url = local_scraper_url
+    started = time.monotonic()
+    parsed, webpage_text = await fetch_and_process_html(
+        url=scraper_url,
+        request_body={"url": item["url"]},
+        browser_pool=browser_pool,
+    )
+    fetch_tiers.record("browser", hit=webpage_text is not None, seconds=time.monotonic() - started)
+    return parsed, webpage_text
+
+
+def finish_pending(
+    mailbox: MailBox,
+    item: PendingEmail,
+    parsed: Extraction | None,
+    webpage_text: str | None,
+) -> None:
+    """Write a fetched link's text and flag its email Seen.
+
+    A link that could not be parsed stays unseen so the next run retries it.
+    """
+    if item["kind"] == "link":
+        if webpage_text is None or parsed is None:
+            logging.info(
+                "could not parse webpage, saving for next time: %s",
+                item["url"],
+            )
+            return
+        write_link_text(item, parsed, webpage_text)
+    mark_seen(mailbox, item["msg"])
+
+
+async def process_pending(mailbox: MailBox, pending: list[PendingEmail]) -> None:
+    """Fetch link and YouTube emails concurrently, then finish them in message order.
+
+    Every fetch starts at once (bounded by the browser pool and the YouTube
+    download limit). Results are written and messages flagged Seen in the
+    order the emails arrived, each as soon as it and its predecessors are
+    done, so one slow site delays only the bookkeeping behind it.
+    """
+    async with AsyncBrowserPool(max_pages=link_fetch_concurrency) as browser_pool:
+        youtube_slots = asyncio.Semaphore(youtube_max_concurrent)
+        fetch_tiers = FetchTierStats()
+        tasks = [asyncio.create_task(fetch_pending(item, browser_pool, youtube_slots, fetch_tiers)) for item in pending]
+        for item, task in zip(pending, tasks, strict=True):
+            msg = item["msg"]
+            try:
+                parsed, webpage_text = await task
+                finish_pending(mailbox, item, parsed, webpage_text)
+            except Exception:
+                logging.exception("Error processing email from %s: %s", error_sender(msg), msg.subject)
+                report_email_error(msg)
+        fetch_tiers.log_stats()
+        fetch_tiers.append_log(fetch_stats_dir, "imap")
+        browser_pool.log_stats()
+
+
 def main() -> None:
-    """Fetch unseen emails and route them through the intake pipeline."""
+    """Fetch unseen emails and route them through the intake pipeline.
+
+    Newsletters are written as they are read; link and YouTube emails are
+    collected and then fetched concurrently by ``process_pending``.
+    """
     if not gmail_user or not gmail_password:
         logging.error("Gmail credentials not set")
         return
     with MailBox("imap.gmail.com").login(gmail_user, gmail_password) as mailbox:
         msgs = mailbox.fetch(AND(seen=False), mark_seen=False)  # pyright: ignore[reportUnknownMemberType]
+        pending: list[PendingEmail] = []
         for msg in msgs:
             try:
                 subject_raw = unfold_header_value(msg.subject).replace("Fwd: ", "")
@@ -248,114 +451,48 @@ def main() -> None:
                 from_prefix_for_filename = from_name_for_filename + "- " if from_name_for_filename else ""
                 subject_for_filename = re.sub(r"[^A-Za-z0-9 ]+", "", subject_raw)
                 subject_for_filter_lower = subject_for_filename.lower()
-                if subject_for_filter_lower not in {"link", "youtube"}:
-                    output_filename = (
-                        f"{output_folder}/{date_stamp}-{from_prefix_for_filename}{subject_for_filename}.txt"
-                    )
-                    logging.info("parsing email: %s", output_filename)
-                    email_text_raw = msg.text
-                    has_beehiiv = bool(msg.headers.get("x-beehiiv-ids"))
-                    source_kind = "beehiiv" if has_beehiiv else "substack"
-                    all_links = extract_links_from_email(msg)
-                    source_url = find_source_url(all_links, source_kind, subject_raw)
-                    if not source_url:
-                        source_kind = "unknown"
-                        send_gotify_notification(
-                            "Unknown email source",
-                            f"No source link found for {from_email} ({subject_raw}).",
-                        )
-                    metadata_block = "\n".join(
-                        [
-                            f"META_FROM: {from_name_raw}",
-                            f"META_TITLE: {subject_raw}",
-                            f"META_SOURCE_URL: {source_url}",
-                            f"META_SOURCE_KIND: {source_kind}",
-                            f"META_SOURCE_NAME: {from_name_raw}",
-                            "META_INTAKE_TYPE: email",
-                        ],
+                if subject_for_filter_lower in {"link", "youtube"}:
+                    pending.append(
+                        {
+                            "msg": msg,
+                            "kind": subject_for_filter_lower,
+                            "url": re.sub(r"[^\S]+", "", msg.text),
+                            "date_stamp": date_stamp,
+                            "from_name": from_name_raw,
+                        },
                     )
-                    logging.info("Writing raw metadata and text to text input")
-                    _ = pathlib.Path(output_filename).write_text(
-                        metadata_block + "\n\n" + email_text_raw, encoding="utf-8"
-                    )
-                elif subject_for_filter_lower == "youtube":
-                    email_text_raw = msg.text
-                    youtube_url = re.sub(r"[^\S]+", "", email_text_raw)
-                    logging.info("fetching youtube audio: %s", youtube_url)
-                    ydl_opts: _Params = {
-                        "format": "bestaudio[protocol!=m3u8][protocol!=m3u8_native]/bestaudio/best",
-                        "extractor_args": {"youtube": {"player_client": ["android"]}},
-                        "fragment_retries": 10,
-                        "retries": 5,
-                        "postprocessors": [
-                            {
-                                "key": "FFmpegExtractAudio",
-                                "preferredcodec": "mp3",
-                                "preferredquality": "192",
-                            },
-                        ],
-                        "outtmpl": "../dropcaster-docker/audio/%(uploader)s- %(title)s.%(ext)s",
-                    }
-                    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                        info = ydl.extract_info(youtube_url, download=True)
-                        base_filename: str = str(ydl.prepare_filename(info))
-                        mp3_filename = str(pathlib.Path(base_filename).with_suffix(".mp3"))
-                        info_dict: dict[str, object] = dict(info) if info else {}
-                        video_title: str = str(info_dict.get("title") or "YouTube Video")
-                        video_url: str = str(info_dict.get("webpage_url") or youtube_url)
-                        video_description: str = str(info_dict.get("description") or "")
-                        summary = generate_summary(video_description, video_title)
-                        description_body = summary or "Summary unavailable."
-                        description = f'{video_title}<br/><br/>{description_body}<br/><br/>Source: <a href="{video_url}">{video_url}</a>'
-                        if pathlib.Path(mp3_filename).exists():
-                            apply_id3_tags(
-                                mp3_filename, title=video_title, description=description, source_url=video_url, v1=1
-                            )
-                        else:
-                            logging.error("Expected MP3 not found: %s", mp3_filename)
-                else:
-                    email_text_raw = msg.text
-                    url_text_compact = re.sub(r"[^\S]+", "", email_text_raw)
-                    logging.info("fetching webpage: %s", url_text_compact)
-                    original_url = url_text_compact
-                    scraper_url = nyt_scraper_url if "nytimes.com" in original_url else local_scraper_url
-                    html_content_parsed_for_title, webpage_text = fetch_and_process_html(
-                        url=scraper_url,
-                        request_body={"url": original_url},
-                    )
-                    if webpage_text is None or html_content_parsed_for_title is None:
-                        logging.info(
-                            "could not parse webpage, saving for next time: %s",
-                            original_url,
-                        )
-                        continue
-                    raw_title: str = extract_title(html_content_parsed_for_title) or "No title available"
-                    title_for_filename = re.sub(r"[^A-Za-z0-9 ]+", "", raw_title)
-                    output_filename = f"{output_folder}/{date_stamp}-{title_for_filename}.txt"
-                    metadata_block = "\n".join(
-                        [
-                            f"META_FROM: {from_name_raw}",
-                            f"META_TITLE: {raw_title}",
-                            f"META_SOURCE_URL: {original_url}",
-                            "META_SOURCE_KIND: url",
-                            "META_INTAKE_TYPE: link",
-                        ],
-                    )
-                    logging.info("Writing metadata block to text input")
-                    _ = pathlib.Path(output_filename).write_text(
-                        metadata_block + "\n\n" + webpage_text, encoding="utf-8"
+                    continue
+                output_filename = f"{output_folder}/{date_stamp}-{from_prefix_for_filename}{subject_for_filename}.txt"
+                logging.info("parsing email: %s", output_filename)
+                email_text_raw = msg.text
+                has_beehiiv = bool(msg.headers.get("x-beehiiv-ids"))
+                source_kind = "beehiiv" if has_beehiiv else "substack"
+                all_links = extract_links_from_email(msg)
+                source_url = find_source_url(all_links, source_kind, subject_raw)
+                if not source_url:
+                    source_kind = "unknown"
+                    send_gotify_notification(
+                        "Unknown email source",
+                        f"No source link found for {from_email} ({subject_raw}).",
                     )
-                flags = MailMessageFlags.SEEN
-                uid: str = msg.uid or ""
-                _ = mailbox.flag(uid, flags, value=True)  # pyright: ignore[reportUnknownMemberType, reportUnknownVariableType]
-            except Exception:
-                error_from = msg.from_values
-                from_email_for_error = error_from.email if error_from else "unknown"
-                logging.exception("Error processing email from %s: %s", from_email_for_error, msg.subject)
-                send_gotify_notification(
-                    "Email processing error",
-                    f"Failed to process email from {from_email_for_error}: {msg.subject}",
+                metadata_block = "\n".join(
+                    [
+                        f"META_FROM: {from_name_raw}",
+                        f"META_TITLE: {subject_raw}",
+                        f"META_SOURCE_URL: {source_url}",
+                        f"META_SOURCE_KIND: {source_kind}",
+                        f"META_SOURCE_NAME: {from_name_raw}",
+                        "META_INTAKE_TYPE: email",
+                    ],
                 )
+                logging.info("Writing raw metadata and text to text input")
+                _ = pathlib.Path(output_filename).write_text(metadata_block + "\n\n" + email_text_raw, encoding="utf-8")
+                mark_seen(mailbox, msg)
+            except Exception:
+                logging.exception("Error processing email from %s: %s", error_sender(msg), msg.subject)
+                report_email_error(msg)
+        if pending:
+            asyncio.run(process_pending(mailbox, pending))
 
 
 if __name__ == "__main__":
@@ -30,6 +30,7 @@ from bs4 import BeautifulSoup, NavigableString, Tag
 from google import genai
 from google.cloud import texttospeech
 from google.genai import types
+from podcast_shared import RateLimitedGemini
 from pydub import AudioSegment
 
 logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
@@ -247,7 +248,7 @@ def parse_segments_markers(text: str) -> list[dict[str, str]]:
 
 
 def synthesize_segment(
-    client: genai.Client,
+    client: RateLimitedGemini,
     text: str,
     voice: str,
     style: str,
@@ -261,7 +262,7 @@ def synthesize_segment(
     """
     try:
         logging.info("  [%s] Synthesizing %d chars with voice %s...", label, len(text), voice)
-        response = client.models.generate_content(
+        response = client.generate_content(
             model=GEMINI_MODEL,
             contents=f"{style}\n\n{text}",
             config=types.GenerateContentConfig(
@@ -372,7 +373,7 @@ def main() -> None:
         if not api_key:
             logging.error("GEMINI_API_KEY required for Gemini engine")
             sys.exit(1)
-        gemini_client = genai.Client(api_key=api_key)
+        gemini_client = RateLimitedGemini(genai.Client(api_key=api_key))
     else:
         tts_client = texttospeech.TextToSpeechClient()
 
@@ -418,7 +419,9 @@ def main() -> None:
             if audio_parts:
                 audio_parts.append(pause_between)
             audio_parts.append(audio)
-        time.sleep(0.1 if args.engine == "wavenet" else 0.5)
+        if tts_client is not None:
+            # Gemini calls are paced by RateLimitedGemini; Cloud TTS still needs a gap.
+            time.sleep(0.1 if args.engine == "wavenet" else 0.5)
 
     if not audio_parts:
         logging.error("No audio segments produced")
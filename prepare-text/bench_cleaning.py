@@ -0,0 +1,567 @@
+"""Benchmark and golden-output check for prepare_text.py's filter and cleaning steps.
+
+Runs process_file's own filter and cleaning steps (filter_and_clean, as a dry
+run) over a corpus of raw files without writing, archiving or deleting
+anything: deterministic synthetic beehiiv, substack and rss shaped files, plus
+the newest files in text-input-raw-archive/ when it exists. Reports time per
+step, throughput in MB/s and peak traced memory, and compares every cleaned
+output and its stats against the golden copies in bench-golden/. LLM checks are
+never called; filters that need one are treated as not matching.
+
+Usage:
+  cd prepare-text
+  uv run python3 bench_cleaning.py --update-golden   # before a change: record outputs
+  uv run python3 bench_cleaning.py                   # after it: timings plus golden diff
+"""
+
+from __future__ import annotations
+
+import argparse
+import difflib
+import json
+import logging
+import operator
+import pathlib
+import random
+import statistics
+import time
+import tracemalloc
+from typing import TYPE_CHECKING, TypedDict
+
+from podcast_shared import split_metadata
+
+from prepare_text import (
+    CONFIG_FILE,
+    RAW_ARCHIVE_DIR,
+    compile_rule_program,
+    filter_and_clean,
+    load_config,
+    match_filters,
+    new_file_stats,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Sequence
+
+    from prepare_text import PipelineConfig
+
+GOLDEN_DIR = "bench-golden"
+GOLDEN_MANIFEST = "manifest.json"
+DEFAULT_SYNTHETIC = 20  # files per synthetic shape
+DEFAULT_ARCHIVE = 200  # newest archived raw files
+DEFAULT_REPEAT = 5
+DEFAULT_SEED = 1
+DEFAULT_DIFF_LINES = 20
+DEFAULT_TOP = 15  # slowest cleaning steps and rules shown
+# Synthetic corpus shape: relative block frequencies and per-file or per-paragraph rates
+BEEHIIV_BLOCK_WEIGHTS = {"heading": 2, "list": 2, "emphasis": 2, "link": 3, "paragraph": 11}
+SUBSTACK_BLOCK_WEIGHTS = {"references": 1, "at": 1, "rule": 1, "link": 3, "paragraph": 14}
+LONG_FILE_RATE = 0.05
+RSS_WHITESPACE_RATE = 0.2
+RSS_LINK_RATE = 0.1
+RSS_CRLF_RATE = 0.2
+# "other" is the rest of filter_and_clean: header/footer, size check and bookkeeping
+STEPS = ("parse", "filters", "general_cleaning", "text_removals", "text_replacements", "other")
+# Golden fields compared besides the text itself
+GOLDEN_FIELDS = ("outcome", "filters_matched", "general_cleaning", "text_removals", "text_replacements")
+WORDS = (
+    "the", "of", "and", "to", "in", "a", "is", "that", "for", "it", "with", "as", "was", "on", "be", "by",
+    "this", "week", "market", "policy", "rates", "inflation", "election", "court", "ruling", "report",
+    "analysis", "readers", "newsletter", "data", "growth", "senate", "budget", "energy", "climate", "AI",
+    "model", "chips", "supply", "2024", "percent", "billion", "officials", "said", "according", "new",
+)  # fmt: skip
+
+
+class CorpusFile(TypedDict):
+    """A raw input file and the corpus group it belongs to."""
+
+    name: str
+    group: str  # synthetic shape, or "archive"
+    raw: str
+
+
+class BenchResult(TypedDict):
+    """Outcome, output text and stats of one file, as process_file would record them."""
+
+    outcome: str
+    text: str
+    filters_matched: list[str]
+    llm_checks_skipped: int
+    general_cleaning: dict[str, dict[str, int | bool]]
+    text_removals: dict[str, dict[str, int]]
+    text_replacements: dict[str, dict[str, int]]
+    timings_ns: dict[str, dict[str, int]]  # cleaning step or rule reason -> ns, by part of the pipeline
+
+
+# ---------------------------------------------------------------------------
+# Synthetic corpus
+# ---------------------------------------------------------------------------
+
+
+def _sentence(rng: random.Random) -> str:
+    words = " ".join(rng.choice(WORDS) for _ in range(rng.randint(6, 28)))
+    return words[0].upper() + words[1:] + rng.choice((".", ".", ".", "?", ":", ""))
+
+
+def _paragraph(rng: random.Random) -> str:
+    return " ".join(_sentence(rng) for _ in range(rng.randint(1, 6)))
+
+
+def _url(rng: random.Random) -> str:
+    host = rng.choice(("example.com", "www.example.org", "news.example.net"))
+    return f"https://{host}/p/{rng.choice(WORDS).lower()}-{rng.randint(1, 9999)}?utm_source=email&r=1a2b"
+
+
+def _paragraph_count(rng: random.Random) -> int:
+    # Mostly newsletter-sized, occasionally long enough to hit CHARACTER_LIMIT
+    return rng.randint(400, 700) if rng.random() < LONG_FILE_RATE else rng.randint(8, 60)
+
+
+def _block_kinds(rng: random.Random, weights: dict[str, int]) -> list[str]:
+    return rng.choices(list(weights), list(weights.values()), k=_paragraph_count(rng))
+
+
+def synthetic_beehiiv(rng: random.Random) -> tuple[dict[str, str], str]:
+    """Build a Markdown body with headings, lists, links and underscore emphasis.
+
+    Returns:
+        A (metadata, content) tuple.
+
+    """
+    blocks = [f"# {_sentence(rng)}"]
+    for kind in _block_kinds(rng, BEEHIIV_BLOCK_WEIGHTS):
+        if kind == "heading":
+            blocks.append(f"## {_sentence(rng)}")
+        elif kind == "list":
+            blocks.append("\n".join(f"- {_sentence(rng)}" for _ in range(rng.randint(2, 5))))
+        elif kind == "emphasis":
+            blocks.append(f"__{_sentence(rng)}__ {_paragraph(rng)}")
+        elif kind == "link":
+            blocks.append(f"{_paragraph(rng)} [{rng.choice(WORDS)}]({_url(rng)}) _{rng.choice(WORDS)}_")
+        else:
+            blocks.append(_paragraph(rng))
+    metadata = {
+        "from": "Synthetic Beehiiv",
+        "title": _sentence(rng),
+        "source_url": _url(rng),
+        "source_kind": "beehiiv",
+        "source_name": "Synthetic Beehiiv",
+        "intake_type": "email",
+    }
+    return metadata, "\n\n".join(blocks)
+
+
+def synthetic_substack(rng: random.Random) -> tuple[dict[str, str], str]:
+    """Build a Substack email body with the web-view line, references, lone @ lines and footer.
+
+    Returns:
+        A (metadata, content) tuple.
+
+    """
+    blocks = [f"View this post on the web at \n\n{_url(rng)}"]
+    for kind in _block_kinds(rng, SUBSTACK_BLOCK_WEIGHTS):
+        if kind == "references":
+            blocks.append("Substacks referenced above:\n" + "\n".join("@" for _ in range(rng.randint(1, 4))))
+        elif kind == "at":
+            blocks.append("@")
+        elif kind == "rule":
+            blocks.append("---")
+        elif kind == "link":
+            blocks.append(f"{_paragraph(rng)} ({_url(rng)}) [t]he {_sentence(rng)}")
+        else:
+            blocks.append(_paragraph(rng))
+    blocks.append(f"Unsubscribe {_url(rng)}")
+    metadata = {
+        "from": "Synthetic Substack",
+        "title": _sentence(rng),
+        "source_url": _url(rng),
+        "source_kind": "substack",
+        "source_name": "Synthetic Substack",
+        "intake_type": "email",
+    }
+    return metadata, "\n\n".join(blocks)
+
+
+def synthetic_rss(rng: random.Random) -> tuple[dict[str, str], str]:
+    """Build extracted article text with irregular whitespace and, sometimes, CRLF line endings.
+
+    Returns:
+        A (metadata, content) tuple.
+
+    """
+    blocks: list[str] = []
+    for _ in range(_paragraph_count(rng)):
+        paragraph = _paragraph(rng)
+        if rng.random() < RSS_WHITESPACE_RATE:
+            paragraph = paragraph.replace(" ", rng.choice(("  ", "\t", "\u00a0")), rng.randint(1, 5))
+        if rng.random() < RSS_LINK_RATE:
+            paragraph += f" {_url(rng)} () []"
+        blocks.append(paragraph)
+    newline = "\r\n" if rng.random() < RSS_CRLF_RATE else "\n"
+    metadata = {
+        "from": "Synthetic Feed",
+        "title": _sentence(rng),
+        "source_url": _url(rng),
+        "source_kind": "rss",
+        "intake_type": "rss",
+    }
+    return metadata, (newline * 2).join(blocks)
+
+
+SYNTHETIC_GENERATORS: dict[str, Callable[[random.Random], tuple[dict[str, str], str]]] = {
+    "beehiiv": synthetic_beehiiv,
+    "substack": synthetic_substack,
+    "rss": synthetic_rss,
+}
+
+
+def build_corpus(synthetic: int, archive: int, seed: int) -> list[CorpusFile]:
+    """Generate the synthetic files and read the newest archived raw files.
+
+    Returns:
+        The corpus, synthetic files first.
+
+    """
+    corpus: list[CorpusFile] = []
+    for kind, generate in SYNTHETIC_GENERATORS.items():
+        for idx in range(synthetic):
+            # Seeded per file, so changing --synthetic leaves the other files unchanged
+            metadata, content = generate(random.Random(f"{seed}-{kind}-{idx}"))
+            meta_block = "\n".join(f"META_{key.upper()}: {value}" for key, value in metadata.items())
+            raw = f"{meta_block}\n\n{content}"
+            corpus.append({"name": f"synthetic-{kind}-{idx:03d}.txt", "group": kind, "raw": raw})
+
+    archive_dir = pathlib.Path(RAW_ARCHIVE_DIR)
+    if archive > 0 and archive_dir.is_dir():
+        # Raw filenames start with their timestamp
+        paths = sorted(archive_dir.glob("*.txt"), reverse=True)[:archive]
+        corpus.extend(
+            {"name": path.name, "group": "archive", "raw": path.read_text(encoding="utf-8")} for path in paths
+        )
+    return corpus
+
+
+# ---------------------------------------------------------------------------
+# Running the pipeline
+# ---------------------------------------------------------------------------
+
+
+def run_file(name: str, raw: str, config: PipelineConfig, timings: dict[str, int]) -> BenchResult:
+    """Run process_file's parse, filter and cleaning steps on one raw file, adding each step's time to *timings*.
+
+    The steps are process_file's own filter_and_clean, run dry; only the
+    writes, archiving and deletion are left out.
+
+    Returns:
+        What process_file would write and record for the file.
+
+    """
+    started = time.monotonic_ns()
+    metadata, content_raw = split_metadata(raw)
+    parsed = time.monotonic_ns()
+    file_stats = new_file_stats(name, metadata, content_raw)
+    text, _ = filter_and_clean(name, metadata, content_raw, config, file_stats, dry_run=True)
+    finished = time.monotonic_ns()
+
+    detail = file_stats["timings_ns"]
+    step_times = {
+        "filters": detail["filter_match"] + sum(detail["filters"].values()),
+        "general_cleaning": sum(detail["general_cleaning"].values()),
+        "text_removals": sum(detail["text_removals"].values()),
+        "text_replacements": sum(detail["text_replacements"].values()),
+    }
+    step_times["other"] = finished - parsed - sum(step_times.values())
+    step_times["parse"] = parsed - started
+    for step, elapsed in step_times.items():
+        timings[step] += elapsed
+
+    # Filters up to the one that stopped evaluation were checked; their LLM checks were skipped
+    filters = config.get("filters") or []
+    checked = len(file_stats["filters_checked"])
+    candidates = match_filters(config["program"]["filters"], metadata)
+    return {
+        "outcome": file_stats["outcome"] or "",
+        "text": text,
+        "filters_matched": file_stats["filters_matched"],
+        "llm_checks_skipped": sum("llm_check" in filters[idx] for idx in candidates if idx < checked),
+        "general_cleaning": file_stats["general_cleaning"],
+        "text_removals": file_stats["text_removals"],
+        "text_replacements": file_stats["text_replacements"],
+        "timings_ns": {
+            "general_cleaning": detail["general_cleaning"],
+            "text_removals": detail["text_removals"],
+            "text_replacements": detail["text_replacements"],
+        },
+    }
+
+
+def benchmark(
+    corpus: list[CorpusFile],
+    config: PipelineConfig,
+    repeat: int,
+) -> tuple[dict[str, BenchResult], dict[str, int], dict[str, int], dict[str, int]]:
+    """Run the corpus *repeat* times, keeping the fastest time per step, per file and per rule.
+
+    Returns:
+        Results by file name, and best nanoseconds per step, per file and per "part/step or rule".
+
+    """
+    results: dict[str, BenchResult] = {}
+    best_steps: dict[str, int] = {}
+    best_files: dict[str, int] = {}
+    best_rules: dict[str, int] = {}
+    for _ in range(repeat):
+        timings = dict.fromkeys(STEPS, 0)
+        rule_timings: dict[str, int] = {}
+        for corpus_file in corpus:
+            before = sum(timings.values())
+            result = run_file(corpus_file["name"], corpus_file["raw"], config, timings)
+            elapsed = sum(timings.values()) - before
+            best_files[corpus_file["name"]] = min(best_files.get(corpus_file["name"], elapsed), elapsed)
+            results[corpus_file["name"]] = result
+            for part, part_timings in result["timings_ns"].items():
+                for name, rule_elapsed in part_timings.items():
+                    key = f"{part}/{name}"
+                    rule_timings[key] = rule_timings.get(key, 0) + rule_elapsed
+        for step, elapsed in timings.items():
+            best_steps[step] = min(best_steps.get(step, elapsed), elapsed)
+        for key, elapsed in rule_timings.items():
+            best_rules[key] = min(best_rules.get(key, elapsed), elapsed)
+    return results, best_steps, best_files, best_rules
+
+
+def measure_peak_memory(corpus: list[CorpusFile], config: PipelineConfig) -> dict[str, int]:
+    """Trace allocations while running each file once.
+
+    Returns:
+        Peak traced bytes per file name.
+
+    """
+    peaks: dict[str, int] = {}
+    timings = dict.fromkeys(STEPS, 0)
+    tracemalloc.start()
+    try:
+        for corpus_file in corpus:
+            tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+            _ = run_file(corpus_file["name"], corpus_file["raw"], config, timings)
+            peaks[corpus_file["name"]] = tracemalloc.get_traced_memory()[1] - baseline
+    finally:
+        tracemalloc.stop()
+    return peaks
+
+
+# ---------------------------------------------------------------------------
+# Reporting
+# ---------------------------------------------------------------------------
+
+
+def print_table(headers: Sequence[str], rows: Sequence[Sequence[object]]) -> None:
+    """Print rows as a left-aligned plain-text table."""
+    cells = [[str(header) for header in headers], *([str(value) for value in row] for row in rows)]
+    widths = [max(len(row[col]) for row in cells) for col in range(len(headers))]
+    lines = ["  ".join(value.ljust(width) for value, width in zip(row, widths, strict=True)).rstrip() for row in cells]
+    lines.insert(1, "  ".join("-" * width for width in widths))
+    print("\n".join(lines))
+
+
+def _mb_per_second(size: int, nanoseconds: int) -> str:
+    return f"{size / 1e6 / (nanoseconds / 1e9):.1f}" if nanoseconds else "-"
+
+
+def report(
+    corpus: list[CorpusFile],
+    best_steps: dict[str, int],
+    best_files: dict[str, int],
+    best_rules: dict[str, int],
+    peaks: dict[str, int],
+    top: int,
+) -> None:
+    """Print time and throughput per step, the slowest cleaning steps and rules, per-group figures, and peak memory."""
+    sizes = {corpus_file["name"]: len(corpus_file["raw"].encode("utf-8")) for corpus_file in corpus}
+    total_size = sum(sizes.values())
+    total_ns = sum(best_steps.values())
+
+    print(f"{len(corpus)} files, {total_size / 1e6:.2f} MB\n")
+    step_rows = [
+        (
+            step,
+            f"{elapsed / 1e6:.2f}",
+            f"{100 * elapsed / total_ns:.1f}" if total_ns else "-",
+            _mb_per_second(total_size, elapsed),
+        )
+        for step, elapsed in best_steps.items()
+    ]
+    step_rows.append(("total", f"{total_ns / 1e6:.2f}", "100.0", _mb_per_second(total_size, total_ns)))
+    print_table(("step", "best ms", "%", "MB/s"), step_rows)
+
+    slowest = sorted(best_rules.items(), key=operator.itemgetter(1), reverse=True)[:top]
+    print()
+    rule_rows = [(key, f"{elapsed / 1e6:.2f}", _mb_per_second(total_size, elapsed)) for key, elapsed in slowest]
+    print_table(("cleaning step or rule", "best ms", "MB/s"), rule_rows)
+
+    group_rows: list[tuple[str, int, str, str, str, str]] = []
+    for group in dict.fromkeys(corpus_file["group"] for corpus_file in corpus):
+        names = [corpus_file["name"] for corpus_file in corpus if corpus_file["group"] == group]
+        group_size = sum(sizes[name] for name in names)
+        group_ns = sum(best_files[name] for name in names)
+        group_peak = max(peaks[name] for name in names)
+        group_rows.append(
+            (
+                group,
+                len(names),
+                f"{group_size / 1e6:.2f}",
+                f"{group_ns / 1e6:.2f}",
+                _mb_per_second(group_size, group_ns),
+                f"{group_peak / 1024:.0f}",
+            ),
+        )
+    print()
+    print_table(("group", "files", "MB", "best ms", "MB/s", "peak KiB"), group_rows)
+
+    worst = max(peaks, key=peaks.__getitem__)
+    print(
+        f"\npeak traced memory: median {statistics.median(peaks.values()) / 1024:.0f} KiB, "
+        f"max {peaks[worst] / 1024:.0f} KiB ({worst}, {sizes[worst] / 1024:.0f} KiB input)",
+    )
+
+
+# ---------------------------------------------------------------------------
+# Golden outputs
+# ---------------------------------------------------------------------------
+
+
+def update_golden(results: dict[str, BenchResult], golden_dir: pathlib.Path) -> None:
+    """Record the current outputs as the golden copies."""
+    golden_dir.mkdir(parents=True, exist_ok=True)
+    manifest_path = golden_dir / GOLDEN_MANIFEST
+    if manifest_path.exists():
+        previous: dict[str, dict[str, object]] = json.loads(manifest_path.read_text(encoding="utf-8"))
+        for name in previous.keys() - results.keys():
+            (golden_dir / name).unlink(missing_ok=True)
+
+    manifest: dict[str, dict[str, object]] = {}
+    for name, result in results.items():
+        _ = (golden_dir / name).write_text(result["text"], encoding="utf-8")
+        manifest[name] = {field: result[field] for field in GOLDEN_FIELDS}
+    _ = manifest_path.write_text(json.dumps(manifest, indent=2, sort_keys=True), encoding="utf-8")
+    logging.info("Recorded %d golden outputs in %s", len(results), golden_dir)
+
+
+def compare_golden(results: dict[str, BenchResult], golden_dir: pathlib.Path, diff_lines: int) -> int:
+    """Print differences between the current outputs and the golden copies.
+
+    Returns:
+        The number of files whose output or stats differ.
+
+    """
+    manifest_path = golden_dir / GOLDEN_MANIFEST
+    if not manifest_path.exists():
+        logging.warning("No golden outputs in %s; run with --update-golden first", golden_dir)
+        return 0
+    manifest: dict[str, dict[str, object]] = json.loads(manifest_path.read_text(encoding="utf-8"))
+
+    changed = 0
+    for name, result in results.items():
+        if name not in manifest:
+            logging.info("No golden output for %s", name)
+            continue
+        expected = manifest[name]
+        differences: list[str] = []
+        for field in GOLDEN_FIELDS:
+            before = json.dumps(expected.get(field), sort_keys=True)
+            after = json.dumps(result[field], sort_keys=True)
+            if before != after:
+                differences.append(f"  {field}: {before} -> {after}")
+        expected_text = (golden_dir / name).read_text(encoding="utf-8")
+        diff = list(
+            difflib.unified_diff(
+                expected_text.splitlines(),
+                result["text"].splitlines(),
+                f"golden/{name}",
+                f"current/{name}",
+                n=1,
+                lineterm="",
+            ),
+        )
+        if not differences and not diff and expected_text == result["text"]:
+            continue
+        changed += 1
+        print(f"\nCHANGED {name}")
+        for line in differences:
+            print(line)
+        if not diff and expected_text != result["text"]:
+            diff = ["  (line endings or trailing newline differ)"]
+        for line in diff[:diff_lines]:
+            print(line)
+        if len(diff) > diff_lines:
+            print(f"  ... {len(diff) - diff_lines} more diff lines")
+
+    missing = manifest.keys() - results.keys()
+    if missing:
+        logging.info("%d golden outputs have no file in this corpus", len(missing))
+    logging.info("Golden comparison: %d of %d files changed", changed, len(results))
+    return changed
+
+
+def main() -> None:
+    """Parse command-line options, run the benchmark, and check or update golden outputs.
+
+    Raises:
+        SystemExit: With status 1 when any output differs from its golden copy.
+
+    """
+    arg_parser = argparse.ArgumentParser(description="Benchmark prepare_text cleaning and diff against golden outputs")
+    _ = arg_parser.add_argument("--config", default=CONFIG_FILE, help=f"Pipeline config (default: {CONFIG_FILE})")
+    _ = arg_parser.add_argument(
+        "--synthetic",
+        type=int,
+        default=DEFAULT_SYNTHETIC,
+        help=f"Synthetic files per shape (default: {DEFAULT_SYNTHETIC})",
+    )
+    _ = arg_parser.add_argument(
+        "--archive",
+        type=int,
+        default=DEFAULT_ARCHIVE,
+        help=f"Newest files to take from {RAW_ARCHIVE_DIR}/ (default: {DEFAULT_ARCHIVE})",
+    )
+    _ = arg_parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="Timed runs; the best is kept")
+    _ = arg_parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="Synthetic corpus seed")
+    _ = arg_parser.add_argument("--golden-dir", default=GOLDEN_DIR, help=f"Golden outputs (default: {GOLDEN_DIR})")
+    _ = arg_parser.add_argument("--update-golden", action="store_true", help="Record outputs as the new golden copies")
+    _ = arg_parser.add_argument("--top", type=int, default=DEFAULT_TOP, help="Slowest steps and rules shown")
+    _ = arg_parser.add_argument("--diff-lines", type=int, default=DEFAULT_DIFF_LINES, help="Diff lines shown per file")
+    args = arg_parser.parse_args()
+    synthetic: int = args.synthetic  # pyright: ignore[reportAny]
+    archive: int = args.archive  # pyright: ignore[reportAny]
+    repeat: int = args.repeat  # pyright: ignore[reportAny]
+    if synthetic < 0 or archive < 0:
+        arg_parser.error("--synthetic and --archive must be at least 0")
+    if repeat < 1:
+        arg_parser.error("--repeat must be at least 1")
+
+    # split_metadata logs every header it parses
+    logging.getLogger("podcast_shared").setLevel(logging.WARNING)
+    config = load_config(args.config)  # pyright: ignore[reportAny]
+    if "program" not in config:
+        config["program"] = compile_rule_program(config)
+    corpus = build_corpus(synthetic, archive, args.seed)  # pyright: ignore[reportAny]
+    if not corpus:
+        arg_parser.error("corpus is empty")
+
+    results, best_steps, best_files, best_rules = benchmark(corpus, config, repeat)
+    peaks = measure_peak_memory(corpus, config)
+    report(corpus, best_steps, best_files, best_rules, peaks, args.top)  # pyright: ignore[reportAny]
+    skipped = sum(result["llm_checks_skipped"] for result in results.values())
+    if skipped:
+        logging.info("Skipped %d LLM checks (treated as not matching)", skipped)
+
+    golden_dir = pathlib.Path(args.golden_dir)  # pyright: ignore[reportAny]
+    if args.update_golden:  # pyright: ignore[reportAny]
+        update_golden(results, golden_dir)
+    elif compare_golden(results, golden_dir, args.diff_lines):  # pyright: ignore[reportAny]
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
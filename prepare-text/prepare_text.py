@@ -6,21 +6,35 @@ from filters.yaml, and writes cleaned output to text-input-cleaned/ for TTS.
 
 from __future__ import annotations
 
+import argparse
+import hashlib
 import json
 import logging
 import pathlib
 import re
 import shutil
+import signal
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import contextmanager
 from datetime import UTC, datetime, timedelta
 from typing import TYPE_CHECKING, Literal, TypedDict
 
 if TYPE_CHECKING:
-    from collections.abc import Mapping
+    from collections.abc import Collection, Generator, Iterable, Iterator, Mapping
 
 import markdown
 import yaml
 from bs4 import BeautifulSoup
-from podcast_shared import get_gemini_client, send_gotify_notification, split_metadata
+from podcast_shared import (
+    DiskCache,
+    get_gemini,
+    log_gemini_stats,
+    send_gotify_notification,
+    share_gemini_limits,
+    split_metadata,
+)
 
 logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
 
@@ -31,9 +45,22 @@ CLEANED_ARCHIVE_DIR = "text-input-cleaned-archive"
 FILTERED_DIR = "text-input-filtered"
 STATS_DIR = "stats"
 CONFIG_FILE = "filters.yaml"
+# The validated config and its load-time checks are cached next to it, keyed by a hash of its contents.
+CONFIG_CACHE_SUFFIX = ".validated.json"
+# Bump when validation or the cached checks change; forces every config to be revalidated.
+CONFIG_CACHE_VERSION = 1
 CHARACTER_LIMIT = 150000
 STATS_RETENTION_DAYS = 365
 LLM_MODEL = "gemini-3.1-flash-lite-preview"
+DEFAULT_WORKERS = 1
+# Steps slower than this are logged as they happen; timings are always in the stats record.
+SLOW_STEP_SECONDS = 1.0
+SLOW_LLM_CHECK_SECONDS = 10.0
+# A text removal/replacement rule running longer than this on one file is skipped for that file.
+RULE_TIME_BUDGET_SECONDS = 5.0
+# Successful llm_check verdicts, keyed by (prompt template, title, content, model).
+LLM_VERDICT_DIR = "llm-verdicts"
+LLM_VERDICT_MAX_AGE_SECONDS = STATS_RETENTION_DAYS * 24 * 60 * 60
 
 
 # ---------------------------------------------------------------------------
@@ -46,6 +73,20 @@ VALID_MATCH_FIELDS = frozenset(
 VALID_MATCH_OPERATORS = frozenset({"contains", "not_contains"})
 VALID_ACTIONS = frozenset({"skip", "notify"})
 VALID_FLAGS = frozenset({"ignorecase", "multiline", "dotall"})
+# Patterns made only of ordinary characters and escaped punctuation match literally.
+LITERAL_PATTERN_RE = re.compile(r"(?:[^\\.^$*+?{}\[\]|()]|\\[^\w])*")
+# Regex scaling probe: each pattern is timed on inputs of PATTERN_PROBE_CHARS and PATTERN_PROBE_GROWTH
+# times that; time growing more than PATTERN_SUPERLINEAR_RATIO times faster than the input is flagged.
+PATTERN_PROBE_CHARS = 2000
+PATTERN_PROBE_GROWTH = 8
+PATTERN_SUPERLINEAR_RATIO = 3.0
+PATTERN_PROBE_MIN_SECONDS = 0.005  # larger-input times below this are noise, never flagged
+PATTERN_PROBE_BUDGET_SECONDS = 1.0
+PATTERN_PROBE_UNITS = ("the quick brown fox jumps over the lazy dog ", "Read more.\n", " ")
+PATTERN_PROBE_END = "\x00"
+PATTERN_PROBE_STRIP_RE = re.compile(r"[()\[\]{}?*+|^$]")
+VALID_LLM_SAMPLE_MODES = frozenset({"head", "head_tail"})
+LLM_SAMPLE_SEPARATOR = "\n\n[...]\n\n"
 CLEANING_STEPS = (
     "beehiiv_plaintext_conversion",
     "beehiiv_emphasis_removal",
@@ -75,9 +116,17 @@ class NotifyConfig(TypedDict):
     title: str
 
 
+class LlmSample(TypedDict):
+    """How much of the content an llm_check sends to the model."""
+
+    mode: str  # "head" | "head_tail"
+    chars: int
+
+
 class _FilterRuleOptional(TypedDict, total=False):
     action: str  # "skip" | "notify"
     llm_check: str
+    llm_sample: LlmSample
     notify: NotifyConfig
 
 
@@ -133,6 +182,44 @@ class GeneralCleaningConfig(TypedDict, total=False):
     overrides: list[CleaningOverride]
 
 
+class CompiledRule(TypedDict):
+    """A text removal or replacement with its pattern compiled."""
+
+    pattern: re.Pattern[str]
+    replacement: str
+    reason: str
+
+
+class RuleGroup(TypedDict):
+    """Consecutive rules applied in order, skipped entirely when ``gate`` finds nothing."""
+
+    gate: re.Pattern[str] | None
+    rules: list[CompiledRule]
+
+
+class FilterIndex(TypedDict):
+    """Filter match blocks prepared for per-file matching.
+
+    Targets are lowercased once. Each rule with a ``contains`` condition is
+    bucketed under its longest such target, so a file only has its conditions
+    checked for rules whose bucket target occurs in the metadata.
+    """
+
+    reasons: list[str]
+    fields: list[str]  # metadata fields referenced by any rule
+    conditions: list[list[tuple[str, str, str]]]  # per rule: (field, operator, lowercased target)
+    buckets: dict[str, dict[str, list[int]]]  # field -> lowercased target -> rule indices
+    unkeyed: list[int]  # rules with only not_contains conditions; always checked
+
+
+class RuleProgram(TypedDict):
+    """Compiled filters, text_removals and text_replacements, built once by load_config."""
+
+    filters: FilterIndex
+    text_removals: list[RuleGroup]
+    text_replacements: list[RuleGroup]
+
+
 class PipelineConfig(TypedDict, total=False):
     """Root config structure from filters.yaml."""
 
@@ -140,12 +227,42 @@ class PipelineConfig(TypedDict, total=False):
     general_cleaning: GeneralCleaningConfig
     text_removals: list[TextRemoval]
     text_replacements: list[TextReplacement]
+    program: RuleProgram  # added by load_config after validation, never read from YAML
+
+
+class ConfigChecks(TypedDict):
+    """Config-wide problems found at load time, cached with the validated config."""
+
+    ordering_errors: list[str]  # from validate_rule_ordering
+    pattern_warnings: list[str]  # from check_pattern_scaling
+
+
+class ConfigCache(TypedDict):
+    """On-disk form of a validated config; the compiled program is rebuilt on load."""
+
+    key: str
+    config: PipelineConfig
+    checks: ConfigChecks
+
+
+class FileTimings(TypedDict):
+    """Monotonic nanoseconds spent in each part of processing one file."""
+
+    filter_match: int  # matching metadata against every filter's match block
+    filters: dict[str, int]  # reason -> evaluating a rule whose match block passed, LLM check included
+    llm_checks: dict[str, int]  # reason -> llm_check call, cache lookup included
+    general_cleaning: dict[str, int]  # step -> ns; the fused line-local steps appear as "clean_lines"
+    text_removals: dict[str, int]  # reason -> ns
+    text_replacements: dict[str, int]  # reason -> ns
 
 
 class FileStats(TypedDict):
     """Per-file processing statistics."""
 
     file: str
+    source: str  # META_SOURCE_NAME, falling back to META_FROM
+    source_kind: str
+    intake_type: str
     raw_archive: str | None
     cleaned_archive: str | None
     filtered_archive: str | None
@@ -157,6 +274,7 @@ class FileStats(TypedDict):
     outcome: Literal["filtered", "filtered_empty", "filtered_too_big", "cleaned"] | None
     chars_before: int
     chars_after: int | None
+    timings_ns: FileTimings
 
 
 def parse_flags(flags_raw: str | list[str] | None) -> int:
@@ -210,12 +328,41 @@ def validate_match_block(match_block: Mapping[str, Mapping[str, str]], context:
                 raise ValueError(msg)
 
 
+def validate_llm_sample(filt: FilterRule, context: str) -> None:
+    """Validate a filter's llm_sample block.
+
+    Raises:
+        ValueError: If the block is malformed or the filter has no llm_check.
+        TypeError: If the block is not a dict.
+
+    """
+    if "llm_check" not in filt:
+        msg = f"{context}: 'llm_sample' requires 'llm_check'"
+        raise ValueError(msg)
+    sample = filt["llm_sample"]
+    if not isinstance(sample, dict):
+        msg = f"{context}: 'llm_sample' must be a dict with 'mode' and 'chars'"
+        raise TypeError(msg)
+    for key in sample:
+        if key not in {"mode", "chars"}:
+            msg = f"{context}: unknown llm_sample key {key!r}"
+            raise ValueError(msg)
+    mode = sample.get("mode")
+    if mode not in VALID_LLM_SAMPLE_MODES:
+        msg = f"{context}: invalid llm_sample mode {mode!r} (valid: {', '.join(sorted(VALID_LLM_SAMPLE_MODES))})"
+        raise ValueError(msg)
+    chars = sample.get("chars")
+    if not isinstance(chars, int) or isinstance(chars, bool) or chars <= 0:
+        msg = f"{context}: llm_sample 'chars' must be a positive integer"
+        raise ValueError(msg)
+
+
 def validate_config(config: PipelineConfig) -> None:
     """Validate the full filters.yaml configuration structure.
 
     Raises:
         ValueError: If the config contains invalid keys, filters, or patterns.
-        TypeError: If a cleaning override match block is not a dict.
+        TypeError: If a cleaning override match block or llm_sample block is not a dict.
 
     """
     valid_top_keys = frozenset(
@@ -254,6 +401,8 @@ def validate_config(config: PipelineConfig) -> None:
         if "llm_check" in filt and not filt["llm_check"]:
             msg = f"{ctx}: 'llm_check' must be a non-empty string"
             raise ValueError(msg)
+        if "llm_sample" in filt:
+            validate_llm_sample(filt, ctx)
 
     # Validate general_cleaning
     gc = config.get("general_cleaning") or GeneralCleaningConfig()
@@ -358,6 +507,194 @@ def _match_is_subset(subset: Mapping[str, Mapping[str, str]], superset: Mapping[
     return True
 
 
+# ---------------------------------------------------------------------------
+# Regex time budgets
+# ---------------------------------------------------------------------------
+
+
+@contextmanager
+def time_budget(seconds: float) -> Generator[None]:
+    """Interrupt the block with TimeoutError once it has run for *seconds*.
+
+    Uses SIGALRM, which the regex engine checks while matching, so a runaway
+    pattern is stopped mid-match. Outside the main thread, or where
+    setitimer is unavailable, the block runs without a budget.
+    """
+    if not hasattr(signal, "setitimer") or threading.current_thread() is not threading.main_thread():
+        yield
+        return
+
+    def on_alarm(_signum: int, _frame: object) -> None:
+        msg = f"exceeded {seconds}s time budget"
+        raise TimeoutError(msg)
+
+    previous = signal.signal(signal.SIGALRM, on_alarm)
+    _ = signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        _ = signal.setitimer(signal.ITIMER_REAL, 0)
+        _ = signal.signal(signal.SIGALRM, previous)
+
+
+def _probe_units(pattern: str) -> list[str]:
+    # Prose, short lines, whitespace, and the pattern's own text with metacharacters dropped, which
+    # produces many near-misses for patterns built from literals around wildcards.
+    literal = PATTERN_PROBE_STRIP_RE.sub("", re.sub(r"\\(.)", r"\1", pattern))
+    return [*PATTERN_PROBE_UNITS, literal] if literal else list(PATTERN_PROBE_UNITS)
+
+
+def _time_subn(pattern: re.Pattern[str], text: str) -> float:
+    with time_budget(PATTERN_PROBE_BUDGET_SECONDS):
+        started = time.perf_counter()
+        _ = pattern.subn("", text)
+        return time.perf_counter() - started
+
+
+def probe_pattern_scaling(pattern: re.Pattern[str]) -> str | None:
+    """Time *pattern* on small and large repetitive inputs to detect super-linear matching.
+
+    Returns:
+        A description of the problem, or None if the pattern scaled linearly on every input.
+
+    """
+    for unit in _probe_units(pattern.pattern):
+        small = (unit * (PATTERN_PROBE_CHARS // len(unit) + 1))[:PATTERN_PROBE_CHARS]
+        # A final character nothing expects makes nested quantifiers fail, and backtrack, at every start
+        large = small * PATTERN_PROBE_GROWTH + PATTERN_PROBE_END
+        small += PATTERN_PROBE_END
+        probe = small
+        try:
+            small_seconds = min(_time_subn(pattern, small) for _ in range(3))
+            probe = large
+            large_seconds = _time_subn(pattern, large)
+        except TimeoutError:
+            return f"over {PATTERN_PROBE_BUDGET_SECONDS}s on {len(probe)} chars of repeated {unit!r}"
+        if (
+            large_seconds >= PATTERN_PROBE_MIN_SECONDS
+            and large_seconds > small_seconds * PATTERN_PROBE_GROWTH * PATTERN_SUPERLINEAR_RATIO
+        ):
+            growth = large_seconds / small_seconds if small_seconds else float("inf")
+            return f"time grew {growth:.0f}x for {PATTERN_PROBE_GROWTH}x more input of repeated {unit!r}"
+    return None
+
+
+def check_pattern_scaling(config: PipelineConfig) -> list[str]:
+    """Flag text removal and replacement patterns whose matching time grows super-linearly.
+
+    Returns:
+        List of warning messages (empty if every pattern scaled linearly).
+
+    """
+    warnings: list[str] = []
+    rules: list[tuple[str, list[TextRemoval] | list[TextReplacement]]] = [
+        ("text_removals", config.get("text_removals") or []),
+        ("text_replacements", config.get("text_replacements") or []),
+    ]
+    for kind, kind_rules in rules:
+        for idx, rule in enumerate(kind_rules):
+            problem = probe_pattern_scaling(re.compile(rule["pattern"], parse_flags(rule.get("flags"))))
+            if problem:
+                warnings.append(f"{kind}[{idx}] (reason: {rule['reason']!r}): {problem}")
+    return warnings
+
+
+# ---------------------------------------------------------------------------
+# Rule compilation
+# ---------------------------------------------------------------------------
+
+
+def _is_literal_pattern(pattern: str) -> bool:
+    return LITERAL_PATTERN_RE.fullmatch(pattern) is not None
+
+
+def compile_rule_groups(rules: list[TextRemoval] | list[TextReplacement]) -> list[RuleGroup]:
+    """Compile removal/replacement rules, gating runs of literal patterns.
+
+    Consecutive literal patterns with the same flags share a gate: one
+    alternation (without capture groups, so the regex engine keeps its
+    literal-prefix scan) that is searched before the run. Text it does not
+    match is left unchanged by every rule in the run, so the run is skipped
+    without scanning once per rule. Rules are still applied one at a time, in
+    declaration order, whenever the gate matches.
+
+    Returns:
+        Rule groups in declaration order.
+
+    """
+    groups: list[RuleGroup] = []
+    run: list[CompiledRule] = []
+    run_flags: int | None = None
+
+    def flush_run() -> None:
+        if len(run) > 1:
+            gate = re.compile("|".join(rule["pattern"].pattern for rule in run), run_flags or 0)
+            groups.append({"gate": gate, "rules": list(run)})
+        elif run:
+            groups.append({"gate": None, "rules": list(run)})
+        run.clear()
+
+    for rule in rules:
+        flags = parse_flags(rule.get("flags"))
+        compiled: CompiledRule = {
+            "pattern": re.compile(rule["pattern"], flags),
+            "replacement": rule.get("replacement", ""),
+            "reason": rule["reason"],
+        }
+        if not _is_literal_pattern(rule["pattern"]):
+            flush_run()
+            groups.append({"gate": None, "rules": [compiled]})
+            continue
+        if flags != run_flags:
+            flush_run()
+            run_flags = flags
+        run.append(compiled)
+    flush_run()
+    return groups
+
+
+def build_filter_index(filters: list[FilterRule]) -> FilterIndex:
+    """Index filter match blocks by field and lowercased target.
+
+    Returns:
+        The filter index.
+
+    """
+    index: FilterIndex = {"reasons": [], "fields": [], "conditions": [], "buckets": {}, "unkeyed": []}
+    fields: set[str] = set()
+    for idx, filt in enumerate(filters):
+        conditions = [
+            (field, op, target.lower())
+            for field, operators in filt["match"].items()
+            for op, target in operators.items()
+        ]
+        index["reasons"].append(filt["reason"])
+        index["conditions"].append(conditions)
+        fields.update(field for field, _, _ in conditions)
+        keys = [(field, target) for field, op, target in conditions if op == "contains"]
+        if keys:
+            field, target = max(keys, key=lambda key: len(key[1]))
+            index["buckets"].setdefault(field, {}).setdefault(target, []).append(idx)
+        else:
+            index["unkeyed"].append(idx)
+    index["fields"] = sorted(fields)
+    return index
+
+
+def compile_rule_program(config: PipelineConfig) -> RuleProgram:
+    """Compile the config's filters, text_removals and text_replacements.
+
+    Returns:
+        The compiled rule program.
+
+    """
+    return {
+        "filters": build_filter_index(config.get("filters") or []),
+        "text_removals": compile_rule_groups(config.get("text_removals") or []),
+        "text_replacements": compile_rule_groups(config.get("text_replacements") or []),
+    }
+
+
 # ---------------------------------------------------------------------------
 # Match evaluation
 # ---------------------------------------------------------------------------
@@ -381,18 +718,88 @@ def evaluate_match(match_block: Mapping[str, Mapping[str, str]], metadata: dict[
     return True
 
 
-def evaluate_llm_check(prompt_template: str, metadata: dict[str, str], content: str) -> bool:
+def sample_llm_content(content: str, sample: LlmSample | None) -> str:
+    """Cut content down to the filter's llm_sample budget.
+
+    ``head`` keeps the first ``chars`` characters; ``head_tail`` keeps half the
+    budget from each end. Content within the budget is returned unchanged.
+
+    Returns:
+        The text to send with the llm_check prompt.
+
+    """
+    if sample is None or len(content) <= sample["chars"]:
+        return content
+    chars = sample["chars"]
+    if sample["mode"] == "head":
+        return content[:chars]
+    head_chars = chars - chars // 2
+    tail_chars = chars // 2
+    return content[:head_chars] + LLM_SAMPLE_SEPARATOR + (content[-tail_chars:] if tail_chars else "")
+
+
+def open_verdict_cache() -> DiskCache:
+    """Return the on-disk cache of LLM filter verdicts.
+
+    Returns:
+        The verdict cache.
+
+    """
+    return DiskCache(
+        LLM_VERDICT_DIR,
+        name="LLM verdict",
+        suffix=".json",
+        max_age_seconds=LLM_VERDICT_MAX_AGE_SECONDS,
+    )
+
+
+def match_filters(index: FilterIndex, metadata: dict[str, str]) -> list[int]:
+    """Find the filters whose match block passes, with the same semantics as evaluate_match.
+
+    Returns:
+        Indices of matching filters, in config order.
+
+    """
+    values = {field: metadata.get(field, "").lower() for field in index["fields"]}
+    candidates = set(index["unkeyed"])
+    for field, targets in index["buckets"].items():
+        value = values[field]
+        for target, rule_indices in targets.items():
+            if target in value:
+                candidates.update(rule_indices)
+    return [
+        idx
+        for idx in sorted(candidates)
+        if all((target in values[field]) == (op == "contains") for field, op, target in index["conditions"][idx])
+    ]
+
+
+def evaluate_llm_check(
+    prompt_template: str,
+    metadata: dict[str, str],
+    content: str,
+    cache: DiskCache | None = None,
+) -> bool:
     """Run a Gemini LLM check and return whether the content matches.
 
+    Verdicts are looked up in and saved to *cache* when given; failed checks
+    are never cached, so they are retried on the next run.
+
     Returns:
         True if the LLM confirms the check, False on failure or negative result.
 
     """
     title = metadata.get("title", "")
+    cache_key = DiskCache.make_key(prompt_template, title, content, LLM_MODEL) if cache is not None else ""
+    if cache is not None:
+        cached = cache.get(cache_key)
+        if cached is not None:
+            logging.info("Using cached LLM check verdict")
+            cached_verdict: dict[str, bool] = json.loads(cached)  # pyright: ignore[reportAny]
+            return bool(cached_verdict.get("result"))
     full_prompt = f"{prompt_template}\n\nTitle: {title}\n\nContent:\n{content}"
     try:
-        client = get_gemini_client()
-        response = client.models.generate_content(  # pyright: ignore[reportUnknownMemberType]
+        response = get_gemini().generate_content(
             model=LLM_MODEL,
             contents=full_prompt,
             config={
@@ -408,16 +815,224 @@ def evaluate_llm_check(prompt_template: str, metadata: dict[str, str], content:
             logging.warning("Gemini returned no text for LLM check")
             return False
         parsed: dict[str, bool] = json.loads(response.text)  # pyright: ignore[reportAny]
-        return bool(parsed.get("result"))
+        verdict = bool(parsed.get("result"))
     except Exception:
         logging.exception("LLM check failed")
         return False
+    if cache is not None:
+        cache.put(cache_key, json.dumps({"result": verdict}).encode("utf-8"))
+    return verdict
 
 
 # ---------------------------------------------------------------------------
 # General cleaning functions
 # ---------------------------------------------------------------------------
 
+URL_RE = re.compile(
+    r"https?:\/\/(www\.)?[-a-zA-Z0-9@:%._\+~#=]{1,256}\.[a-z]{2,5}\b([-a-zA-Z0-9@:%_\+.~#?&//=]*)",
+)
+LEGAL_BRACKET_RE = re.compile(r"\[([a-zA-Z])\]")
+TRIPLE_DASH_RE = re.compile(r"---+")
+HORIZONTAL_WHITESPACE_RE = re.compile(r"[^\S\r\n]+")
+UNSUBSCRIBE_RE = re.compile(r"(\r\n|\r|\n){2}Unsubscribe")
+VIEW_ONLINE_RE = re.compile(r"View this post on the web at (\r\n|\r|\n){2}")
+SUBSTACK_REFS_RE = re.compile(r"(?im)^\s*substacks referenced above:.*\r?\n(?:\s*@\s*\r?\n)*")
+STANDALONE_AT_RE = re.compile(r"(?m)^\s*@\s*$\r?\n?")
+END_OF_LINE_RE = re.compile(r"(\w)\s*(\r\n|\r|\n)")
+BEEHIIV_DOUBLE_EMPHASIS_RE = re.compile(r"__([^_]+)__")
+BEEHIIV_EMPHASIS_RE = re.compile(r"_([^_]+)_")
+# Line-oriented forms of the trailing cleaning steps (see clean_lines).
+LINE_STEPS = CLEANING_STEPS[CLEANING_STEPS.index("whitespace_collapse") :]
+UNSUBSCRIBE_PREFIX = "Unsubscribe"
+VIEW_ONLINE_SUFFIX = "View this post on the web at "
+SUBSTACK_REFS_LINE_RE = re.compile(r"\s*substacks referenced above:", re.IGNORECASE)
+
+
+def _is_blank(line: str) -> bool:
+    return not line or line.isspace()
+
+
+def _is_standalone_at(line: str) -> bool:
+    return line.strip() == "@"
+
+
+def _join_unsubscribe(lines: Iterable[str], counts: dict[str, int]) -> Iterator[str]:
+    # "\n\nUnsubscribe" -> "": a line, a blank line, and a line starting "Unsubscribe" become one line.
+    held: list[str] = []
+    for line in lines:
+        if len(held) > 1:
+            if line.startswith(UNSUBSCRIBE_PREFIX):
+                held = [held[0] + line[len(UNSUBSCRIBE_PREFIX) :]]
+                counts["unsubscribe_removal"] += 1
+                continue
+            yield held[0]
+            held = [held[1]]
+        if len(held) == 1 and not line:
+            held.append(line)
+            continue
+        yield from held
+        held = [line]
+    yield from held
+
+
+def _join_view_online(lines: Iterable[str], counts: dict[str, int]) -> Iterator[str]:
+    # "View this post on the web at \n\n" -> "": the marker line absorbs the line after the blank one.
+    held: list[str] = []
+    # Offset in held[0] where the next match may start; earlier text was produced by a previous match.
+    floor = 0
+    for line in lines:
+        if len(held) > 1:
+            prefix = held[0][: -len(VIEW_ONLINE_SUFFIX)]
+            held = [prefix + line]
+            floor = len(prefix)
+            counts["view_online_removal"] += 1
+            continue
+        if (
+            len(held) == 1
+            and not line
+            and held[0].endswith(VIEW_ONLINE_SUFFIX)
+            and len(held[0]) - len(VIEW_ONLINE_SUFFIX) >= floor
+        ):
+            held.append(line)
+            continue
+        yield from held
+        held = [line]
+        floor = 0
+    yield from held
+
+
+def _drop_substack_refs(lines: Iterable[str], counts: dict[str, int]) -> Iterator[str]:
+    # A "Substacks referenced above:" line, the blank lines before it, and the "@" lines after it.
+    blanks: list[str] = []
+    marker: str | None = None
+    at_line: str | None = None
+    in_refs = False
+    after_at = False
+    for line in lines:
+        # A pending marker or "@" line is only consumed once a newline is known to follow it
+        if marker is not None:
+            counts["substack_refs_removal"] += 1
+            blanks = []
+            marker = None
+            in_refs = True
+            after_at = False
+        elif at_line is not None:
+            blanks = []
+            at_line = None
+            after_at = True
+        if in_refs:
+            if _is_blank(line):
+                blanks.append(line)
+                continue
+            if _is_standalone_at(line):
+                at_line = line
+                continue
+            in_refs = False
+            if after_at:
+                blanks = []
+        if _is_blank(line):
+            blanks.append(line)
+        elif SUBSTACK_REFS_LINE_RE.match(line):
+            marker = line
+        else:
+            yield from blanks
+            blanks = []
+            yield line
+    if in_refs and after_at:
+        # Blank lines after the last "@" are consumed, except an unterminated final one
+        blanks = [] if at_line is not None else blanks[-1:]
+    yield from blanks
+    if marker is not None:
+        yield marker
+    if at_line is not None:
+        yield at_line
+
+
+def _drop_standalone_at(lines: Iterable[str], counts: dict[str, int]) -> Iterator[str]:
+    # A lone "@" line together with the blank lines before it and the terminated blank lines after it.
+    blanks: list[str] = []
+    after_at = False
+    for line in lines:
+        if _is_blank(line):
+            if not after_at:
+                blanks.append(line)
+            continue
+        if _is_standalone_at(line):
+            counts["standalone_at_removal"] += 1
+            blanks = []
+            after_at = True
+            continue
+        yield from blanks
+        blanks = []
+        after_at = False
+        yield line
+    if after_at:
+        # The match runs to the end of the text, leaving only the preceding newline
+        yield ""
+    else:
+        yield from blanks
+
+
+def _punctuate_line_ends(lines: Iterable[str]) -> Iterator[str]:
+    # A line ending in a word character gets a period; following blank lines fold into its newline.
+    held: str | None = None
+    blanks: list[str] = []
+    for line in lines:
+        if held is not None:
+            if _is_blank(line):
+                blanks.append(line)
+                continue
+            yield held.rstrip() + "."
+            held = None
+            blanks = []
+        stripped = line.rstrip()
+        if stripped and (stripped[-1].isalnum() or stripped[-1] == "_"):
+            held = line
+        else:
+            yield line
+    if held is not None:
+        if blanks:
+            yield held.rstrip() + "."
+            yield blanks[-1]
+        else:
+            yield held
+
+
+def clean_lines(text: str, steps: Collection[str], stats: dict[str, dict[str, int | bool]]) -> str:
+    """Apply the enabled line-local cleaning steps in one streaming pass.
+
+    Produces the same text and stats as running the corresponding regex steps one after another, without
+    building an intermediate copy of the text per step. Text containing carriage returns is not supported.
+
+    Returns:
+        The cleaned text.
+
+    """
+    counts = dict.fromkeys(LINE_STEPS, 0)
+    lines: Iterable[str] = text.split("\n")
+    if "whitespace_collapse" in steps:
+        lines = (HORIZONTAL_WHITESPACE_RE.sub(" ", line) for line in lines)
+    if "unsubscribe_removal" in steps and UNSUBSCRIBE_PREFIX in text:
+        lines = _join_unsubscribe(lines, counts)
+    if "view_online_removal" in steps:
+        lines = _join_view_online(lines, counts)
+    if "substack_refs_removal" in steps:
+        lines = _drop_substack_refs(lines, counts)
+    if "standalone_at_removal" in steps and "@" in text:
+        lines = _drop_standalone_at(lines, counts)
+    if "end_of_line_punctuation" in steps:
+        lines = _punctuate_line_ends(lines)
+    result = "\n".join(lines)
+
+    for key in LINE_STEPS:
+        if key not in steps:
+            continue
+        if key in {"whitespace_collapse", "end_of_line_punctuation"}:
+            stats[key] = {"applied": True}
+        elif counts[key] > 0:
+            stats[key] = {"matches": counts[key]}
+    return result
+
 
 def clean_beehiiv_to_plaintext(text: str) -> str:
     """Convert Beehiiv markdown content to plain text via HTML.
@@ -438,8 +1053,8 @@ def clean_beehiiv_emphasis(text: str) -> str:
         Text with underscored emphasis removed.
 
     """
-    without_double = re.sub(r"__([^_]+)__", r"\1", text)
-    return re.sub(r"_([^_]+)_", r"\1", without_double)
+    without_double = BEEHIIV_DOUBLE_EMPHASIS_RE.sub(r"\1", text)
+    return BEEHIIV_EMPHASIS_RE.sub(r"\1", without_double)
 
 
 def apply_general_cleaning(
@@ -447,9 +1062,13 @@ def apply_general_cleaning(
     metadata: dict[str, str],
     config: PipelineConfig,
     stats: dict[str, dict[str, int | bool]],
+    timings: dict[str, int] | None = None,
 ) -> str:
     """Apply all built-in cleaning steps (URL removal, whitespace, etc.).
 
+    Records monotonic nanoseconds per step in *timings* when given; the fused line-local steps are timed
+    together as "clean_lines".
+
     Returns:
         The cleaned text.
 
@@ -457,11 +1076,17 @@ def apply_general_cleaning(
     gc_config = config.get("general_cleaning") or GeneralCleaningConfig()
     overrides: list[CleaningOverride] = gc_config.get("overrides") or []
 
+    # Overrides that apply to this file, evaluated once rather than per step
+    matching_overrides = [
+        override
+        for override in overrides
+        if isinstance(match_val := override.get("match"), dict) and evaluate_match(match_val, metadata)  # pyright: ignore[reportUnknownArgumentType]
+    ]
+
     def is_enabled(key: str) -> bool:
         # Check per-source overrides first
-        for override in overrides:
-            match_val = override.get("match")
-            if isinstance(match_val, dict) and evaluate_match(match_val, metadata) and key in override:  # pyright: ignore[reportUnknownArgumentType]
+        for override in matching_overrides:
+            if key in override:
                 return bool(override[key])
         # Then global config
         if key in gc_config:
@@ -469,103 +1094,97 @@ def apply_general_cleaning(
         # All cleaning steps are enabled by default
         return True
 
-    def count_and_sub(pattern: str, replacement: str, text: str, key: str, flags: int = 0) -> str:
-        matches = len(re.findall(pattern, text, flags=flags))
+    def count_and_sub(pattern: re.Pattern[str], replacement: str, text: str, key: str) -> str:
+        result, matches = pattern.subn(replacement, text)
         if matches > 0:
             stats[key] = {"matches": matches}
-        return re.sub(pattern, replacement, text, flags=flags)
+        return result
+
+    @contextmanager
+    def timed(key: str) -> Generator[None]:
+        started = time.monotonic_ns()
+        try:
+            yield
+        finally:
+            if timings is not None:
+                timings[key] = time.monotonic_ns() - started
 
     result: str = text
 
     # Beehiiv plaintext conversion (must be first — changes text representation)
     if is_enabled("beehiiv_plaintext_conversion") and metadata.get("source_kind") == "beehiiv":
-        result = clean_beehiiv_to_plaintext(result)
-        stats["beehiiv_plaintext_conversion"] = {"applied": True}
+        with timed("beehiiv_plaintext_conversion"):
+            result = clean_beehiiv_to_plaintext(result)
+            stats["beehiiv_plaintext_conversion"] = {"applied": True}
 
     # Beehiiv emphasis removal (right after plaintext conversion)
     if is_enabled("beehiiv_emphasis_removal") and metadata.get("source_kind") == "beehiiv":
-        before_emphasis = result
-        result = clean_beehiiv_emphasis(result)
-        if result != before_emphasis:
-            stats["beehiiv_emphasis_removal"] = {"applied": True}
+        with timed("beehiiv_emphasis_removal"):
+            before_emphasis = result
+            result = clean_beehiiv_emphasis(result)
+            if result != before_emphasis:
+                stats["beehiiv_emphasis_removal"] = {"applied": True}
 
     # URL removal
     if is_enabled("url_removal"):
-        result = count_and_sub(
-            r"https?:\/\/(www\.)?[-a-zA-Z0-9@:%._\+~#=]{1,256}\.[a-z]{2,5}\b([-a-zA-Z0-9@:%_\+.~#?&//=]*)",
-            "",
-            result,
-            "url_removal",
-        )
+        with timed("url_removal"):
+            result = count_and_sub(URL_RE, "", result, "url_removal")
 
     # Legal bracket unwrap [t]he -> the
     if is_enabled("legal_bracket_unwrap"):
-        result = count_and_sub(
-            r"\[([a-zA-Z])\]",
-            r"\1",
-            result,
-            "legal_bracket_unwrap",
-        )
+        with timed("legal_bracket_unwrap"):
+            result = count_and_sub(LEGAL_BRACKET_RE, r"\1", result, "legal_bracket_unwrap")
 
     # Triple dash removal
     if is_enabled("triple_dash_removal"):
-        result = count_and_sub(r"---+", "", result, "triple_dash_removal")
+        with timed("triple_dash_removal"):
+            result = count_and_sub(TRIPLE_DASH_RE, "", result, "triple_dash_removal")
 
     # Empty bracket removal
     if is_enabled("empty_bracket_removal"):
-        before_brackets = result
-        result = re.sub(r"\[\]", "", result)
-        result = re.sub(r"\(\)", "", result)
-        result = result.replace("<>", "")
-        bracket_diff = len(before_brackets) - len(result)
-        if bracket_diff > 0:
-            stats["empty_bracket_removal"] = {"chars_removed": bracket_diff}
+        with timed("empty_bracket_removal"):
+            before_brackets = result
+            result = result.replace("[]", "").replace("()", "").replace("<>", "")
+            bracket_diff = len(before_brackets) - len(result)
+            if bracket_diff > 0:
+                stats["empty_bracket_removal"] = {"chars_removed": bracket_diff}
+
+    # The remaining steps are line-local; run them fused unless carriage returns need the regex forms
+    if "\r" not in result:
+        with timed("clean_lines"):
+            return clean_lines(result, {key for key in LINE_STEPS if is_enabled(key)}, stats)
 
     # Whitespace collapse
     if is_enabled("whitespace_collapse"):
-        result = re.sub(r"[^\S\r\n]+", " ", result)
-        stats["whitespace_collapse"] = {"applied": True}
+        with timed("whitespace_collapse"):
+            result = HORIZONTAL_WHITESPACE_RE.sub(" ", result)
+            stats["whitespace_collapse"] = {"applied": True}
 
     # Unsubscribe removal
     if is_enabled("unsubscribe_removal"):
-        result = count_and_sub(
-            r"(\r\n|\r|\n){2}Unsubscribe",
-            "",
-            result,
-            "unsubscribe_removal",
-        )
+        with timed("unsubscribe_removal"):
+            result = count_and_sub(UNSUBSCRIBE_RE, "", result, "unsubscribe_removal")
 
     # View online removal
     if is_enabled("view_online_removal"):
-        result = count_and_sub(
-            r"View this post on the web at (\r\n|\r|\n){2}",
-            "",
-            result,
-            "view_online_removal",
-        )
+        with timed("view_online_removal"):
+            result = count_and_sub(VIEW_ONLINE_RE, "", result, "view_online_removal")
 
     # Substack refs removal
     if is_enabled("substack_refs_removal"):
-        result = count_and_sub(
-            r"(?im)^\s*substacks referenced above:.*\r?\n(?:\s*@\s*\r?\n)*",
-            "",
-            result,
-            "substack_refs_removal",
-        )
+        with timed("substack_refs_removal"):
+            result = count_and_sub(SUBSTACK_REFS_RE, "", result, "substack_refs_removal")
 
     # Standalone @ removal
     if is_enabled("standalone_at_removal"):
-        result = count_and_sub(
-            r"(?m)^\s*@\s*$\r?\n?",
-            "",
-            result,
-            "standalone_at_removal",
-        )
+        with timed("standalone_at_removal"):
+            result = count_and_sub(STANDALONE_AT_RE, "", result, "standalone_at_removal")
 
     # End-of-line punctuation (must be last)
     if is_enabled("end_of_line_punctuation"):
-        result = re.sub(r"(\w)\s*(\r\n|\r|\n)", r"\1.\2", result)
-        stats["end_of_line_punctuation"] = {"applied": True}
+        with timed("end_of_line_punctuation"):
+            result = END_OF_LINE_RE.sub(r"\1.\2", result)
+            stats["end_of_line_punctuation"] = {"applied": True}
 
     return result
 
@@ -575,43 +1194,81 @@ def apply_general_cleaning(
 # ---------------------------------------------------------------------------
 
 
-def apply_text_removals(text: str, config: PipelineConfig, stats: dict[str, dict[str, int]]) -> str:
-    """Apply YAML-configured regex removals to text content.
+def apply_rule_groups(
+    text: str,
+    groups: list[RuleGroup],
+    stats: dict[str, dict[str, int]],
+    timings: dict[str, int] | None = None,
+) -> str:
+    """Apply compiled rule groups in order, recording match counts by reason.
+
+    Each rule gets RULE_TIME_BUDGET_SECONDS per text; a rule that runs over is left out for this text and
+    recorded as {"timed_out": 1}. Records monotonic nanoseconds per reason in *timings* when given. A group's
+    gate is checked once on behalf of all its rules, so its cost is shared evenly between them.
 
     Returns:
-        Text with matched patterns removed.
+        The transformed text.
 
     """
     result: str = text
-    for removal in config.get("text_removals") or []:
-        pattern = removal["pattern"]
-        flags = parse_flags(removal.get("flags"))
-        reason = removal["reason"]
-        matches = len(re.findall(pattern, result, flags=flags))
-        if matches > 0:
-            result = re.sub(pattern, "", result, flags=flags)
-            stats[reason] = {"matches": matches}
+    for group in groups:
+        started = time.monotonic_ns()
+        gate_passed = group["gate"] is None or group["gate"].search(result) is not None
+        gate_share = (time.monotonic_ns() - started) // len(group["rules"])
+        for rule in group["rules"]:
+            started = time.monotonic_ns()
+            if gate_passed:
+                try:
+                    with time_budget(RULE_TIME_BUDGET_SECONDS):
+                        replaced, matches = rule["pattern"].subn(rule["replacement"], result)
+                except TimeoutError:
+                    # A runaway pattern is skipped for this text rather than stalling the whole run
+                    logging.warning(
+                        "Rule %r exceeded its %gs budget; skipped",
+                        rule["reason"],
+                        RULE_TIME_BUDGET_SECONDS,
+                    )
+                    stats[rule["reason"]] = {"timed_out": 1}
+                else:
+                    result = replaced
+                    if matches > 0:
+                        stats[rule["reason"]] = {"matches": matches}
+            if timings is not None:
+                elapsed = gate_share + time.monotonic_ns() - started
+                timings[rule["reason"]] = timings.get(rule["reason"], 0) + elapsed
     return result
 
 
-def apply_text_replacements(text: str, config: PipelineConfig, stats: dict[str, dict[str, int]]) -> str:
+def apply_text_removals(
+    text: str,
+    config: PipelineConfig,
+    stats: dict[str, dict[str, int]],
+    timings: dict[str, int] | None = None,
+) -> str:
+    """Apply YAML-configured regex removals to text content.
+
+    Returns:
+        Text with matched patterns removed.
+
+    """
+    program = config.get("program") or compile_rule_program(config)
+    return apply_rule_groups(text, program["text_removals"], stats, timings)
+
+
+def apply_text_replacements(
+    text: str,
+    config: PipelineConfig,
+    stats: dict[str, dict[str, int]],
+    timings: dict[str, int] | None = None,
+) -> str:
     """Apply YAML-configured regex replacements to text content.
 
     Returns:
         Text with matched patterns replaced.
 
     """
-    result: str = text
-    for repl in config.get("text_replacements") or []:
-        pattern = repl["pattern"]
-        replacement = repl["replacement"]
-        flags = parse_flags(repl.get("flags"))
-        reason = repl["reason"]
-        matches = len(re.findall(pattern, result, flags=flags))
-        if matches > 0:
-            result = re.sub(pattern, replacement, result, flags=flags)
-            stats[reason] = {"matches": matches}
-    return result
+    program = config.get("program") or compile_rule_program(config)
+    return apply_rule_groups(text, program["text_replacements"], stats, timings)
 
 
 # ---------------------------------------------------------------------------
@@ -619,30 +1276,99 @@ def apply_text_replacements(text: str, config: PipelineConfig, stats: dict[str,
 # ---------------------------------------------------------------------------
 
 
-def load_today_stats() -> dict[str, FileStats]:
-    """Load today's stats JSON file, or return an empty dict.
+# Each finished file appends one line to stats/YYYY-MM-DD.jsonl, so a run's
+# stats survive a crash and writing them costs O(1) per file. Logs from
+# earlier days are compacted into stats/YYYY-MM-DD.json at the next run.
+
+
+def today_stats_day() -> str:
+    """Return today's stats day key (UTC).
 
     Returns:
-        The stats dict for today.
+        The date as ``YYYY-MM-DD``.
 
     """
-    today = datetime.now(tz=UTC).strftime("%Y-%m-%d")
-    stats_path = pathlib.Path(STATS_DIR) / f"{today}.json"
-    if stats_path.exists():
-        result: dict[str, FileStats] = json.loads(stats_path.read_text(encoding="utf-8"))  # pyright: ignore[reportAny]
-        return result
-    return {}
+    return datetime.now(tz=UTC).strftime("%Y-%m-%d")
 
 
-def save_stats(stats: dict[str, FileStats]) -> None:
-    """Write the stats dict to today's JSON file."""
-    today = datetime.now(tz=UTC).strftime("%Y-%m-%d")
-    stats_path = pathlib.Path(STATS_DIR) / f"{today}.json"
+def append_stats(stats: dict[str, FileStats]) -> None:
+    """Append stats entries to today's JSON Lines log, one line per entry."""
+    if not stats:
+        return
+    log_path = pathlib.Path(STATS_DIR) / f"{today_stats_day()}.jsonl"
+    log_path.parent.mkdir(parents=True, exist_ok=True)
+    lines = "".join(
+        json.dumps({"timestamp": timestamp, "stats": file_stats}, ensure_ascii=False) + "\n"
+        for timestamp, file_stats in stats.items()
+    )
+    with log_path.open("a", encoding="utf-8") as log_file:
+        _ = log_file.write(lines)
+
+
+def read_stats_log(log_path: pathlib.Path) -> dict[str, FileStats]:
+    """Read a JSON Lines stats log, skipping a line truncated by a crash.
+
+    Returns:
+        The stats entries keyed by timestamp.
+
+    """
+    result: dict[str, FileStats] = {}
+    with log_path.open(encoding="utf-8") as log_file:
+        for line_number, line in enumerate(log_file, start=1):
+            if not line.strip():
+                continue
+            try:
+                record: dict[str, object] = json.loads(line)  # pyright: ignore[reportAny]
+            except json.JSONDecodeError:
+                logging.warning("Skipping unreadable line %d in %s", line_number, log_path.name)
+                continue
+            result[str(record["timestamp"])] = record["stats"]  # pyright: ignore[reportArgumentType]
+    return result
+
+
+def load_day_stats(day: str) -> dict[str, FileStats]:
+    """Load one day's stats from its compacted JSON file and any uncompacted log.
+
+    Returns:
+        The day's stats entries keyed by timestamp.
+
+    """
+    stats_dir = pathlib.Path(STATS_DIR)
+    json_path = stats_dir / f"{day}.json"
+    log_path = stats_dir / f"{day}.jsonl"
+    result: dict[str, FileStats] = {}
+    if json_path.exists():
+        result = json.loads(json_path.read_text(encoding="utf-8"))  # pyright: ignore[reportAny]
+    if log_path.exists():
+        result.update(read_stats_log(log_path))
+    return result
+
+
+def save_stats(day: str, stats: dict[str, FileStats]) -> None:
+    """Write a day's stats dict to its JSON file atomically."""
+    stats_path = pathlib.Path(STATS_DIR) / f"{day}.json"
     stats_path.parent.mkdir(parents=True, exist_ok=True)
-    _ = stats_path.write_text(
+    tmp_path = stats_path.with_name(f".{stats_path.name}.tmp")
+    _ = tmp_path.write_text(
         json.dumps(stats, indent=2, ensure_ascii=False) + "\n",
         encoding="utf-8",
     )
+    _ = tmp_path.replace(stats_path)
+
+
+def compact_stats() -> None:
+    """Fold the JSON Lines logs of past days into their daily JSON files."""
+    stats_dir = pathlib.Path(STATS_DIR)
+    if not stats_dir.exists():
+        return
+    today = today_stats_day()
+    for log_path in sorted(stats_dir.glob("*.jsonl")):
+        day = log_path.stem
+        if day >= today:
+            continue
+        save_stats(day, load_day_stats(day))
+        log_path.unlink()
+        logging.info("Compacted stats log: %s", log_path.name)
 
 
 def rotate_stats() -> None:
@@ -651,7 +1377,7 @@ def rotate_stats() -> None:
     stats_path = pathlib.Path(STATS_DIR)
     if not stats_path.exists():
         return
-    for stats_file in stats_path.glob("*.json"):
+    for stats_file in (*stats_path.glob("*.json"), *stats_path.glob("*.jsonl")):
         try:
             file_date = datetime.strptime(stats_file.stem, "%Y-%m-%d").replace(tzinfo=UTC)
             if file_date < cutoff:
@@ -682,42 +1408,124 @@ def write_metadata_and_content(
     )
 
 
+def add_header_and_footer(text: str, metadata: dict[str, str]) -> str:
+    """Announce the author and title before and after the cleaned text.
+
+    Returns:
+        The text with header and footer, or unchanged if neither is known.
+
+    """
+    from_name = metadata.get("from", "").strip()
+    title = metadata.get("title", "").strip()
+    if not from_name and not title:
+        return text
+    announcement = (f"{from_name}.\n" if from_name else "") + (f"{title}.\n" if title else "")
+    return (announcement + "\n" + text).rstrip() + "\n\n" + announcement
+
+
 # ---------------------------------------------------------------------------
 # Main processing
 # ---------------------------------------------------------------------------
 
 
-def load_config() -> PipelineConfig:
+def read_config_cache(cache_path: pathlib.Path, key: str) -> ConfigCache | None:
+    """Read a cached validated config if it was built from the same config contents.
+
+    Returns:
+        The cache entry, or None if missing, unreadable, or stale.
+
+    """
+    try:
+        cached: ConfigCache = json.loads(cache_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(cached, dict) or cached.get("key") != key:  # pyright: ignore[reportUnnecessaryIsInstance]
+        return None
+    return cached
+
+
+def write_config_cache(cache_path: pathlib.Path, entry: ConfigCache) -> None:
+    """Write a validated config cache entry atomically, skipping configs JSON cannot represent."""
+    try:
+        serialized = json.dumps(entry, ensure_ascii=False)
+    except (TypeError, ValueError) as exc:
+        logging.warning("Not caching validated config: %s", exc)
+        return
+    tmp_path = cache_path.with_name(f".{cache_path.name}.tmp")
+    try:
+        _ = tmp_path.write_text(serialized, encoding="utf-8")
+        _ = tmp_path.replace(cache_path)
+    except OSError as exc:
+        logging.warning("Could not write %s: %s", cache_path, exc)
+
+
+def load_config_with_checks(config_file: str = CONFIG_FILE) -> tuple[PipelineConfig, ConfigChecks]:
+    """Load and validate filters.yaml and run its rule-ordering and regex-scaling checks.
+
+    The validated config and check results are cached next to the file. An
+    unchanged config skips YAML parsing, validation and the checks; only its
+    rule program is recompiled.
+
+    Returns:
+        The validated config (empty if the file is absent) and its checks.
+
+    """
+    config_path = pathlib.Path(config_file)
+    if not config_path.exists():
+        logging.info("No %s found; using defaults (no filters, no removals)", config_file)
+        return {}, {"ordering_errors": [], "pattern_warnings": []}
+    raw = config_path.read_bytes()
+    key = hashlib.sha256(f"v{CONFIG_CACHE_VERSION}\0".encode() + raw).hexdigest()
+    cache_path = config_path.with_name(config_path.name + CONFIG_CACHE_SUFFIX)
+
+    config: PipelineConfig
+    checks: ConfigChecks
+    cached = read_config_cache(cache_path, key)
+    if cached is not None:
+        config = cached["config"]
+        checks = cached["checks"]
+    else:
+        logging.info("Validating %s", config_file)
+        config = yaml.safe_load(raw.decode("utf-8")) or {}
+        validate_config(config)
+        checks = {
+            "ordering_errors": validate_rule_ordering(config.get("filters") or []),
+            "pattern_warnings": check_pattern_scaling(config),
+        }
+        write_config_cache(cache_path, {"key": key, "config": config, "checks": checks})
+    config["program"] = compile_rule_program(config)
+    return config, checks
+
+
+def load_config(config_file: str = CONFIG_FILE) -> PipelineConfig:
     """Load and validate filters.yaml, returning an empty dict if absent.
 
     Returns:
         The parsed and validated config dict.
 
     """
-    config_path = pathlib.Path(CONFIG_FILE)
-    if not config_path.exists():
-        logging.info("No filters.yaml found; using defaults (no filters, no removals)")
-        return {}
-    raw = config_path.read_text(encoding="utf-8")
-    config: PipelineConfig = yaml.safe_load(raw) or {}
-    validate_config(config)
-    return config
+    return load_config_with_checks(config_file)[0]
 
 
-def process_file(filepath: pathlib.Path, config: PipelineConfig, all_stats: dict[str, FileStats]) -> None:
-    """Filter, clean, and write a single raw text file."""
-    filename = filepath.name
-    logging.info("Processing: %s", filename)
+def warn_slow_steps(filename: str, kind: str, timings: Mapping[str, int], threshold_seconds: float) -> None:
+    """Log a warning for every timed step of *kind* that took at least *threshold_seconds*."""
+    for step, elapsed in timings.items():
+        if elapsed >= threshold_seconds * 1e9:
+            logging.warning("Slow %s in %s: %s took %.2fs", kind, filename, step, elapsed / 1e9)
 
-    # Read and parse
-    raw_text = filepath.read_text(encoding="utf-8")
-    metadata: dict[str, str]
-    metadata, content_raw = split_metadata(raw_text)
-    timestamp = datetime.now(tz=UTC).isoformat(timespec="microseconds")
 
-    # Initialize stats entry
-    file_stats: FileStats = {
+def new_file_stats(filename: str, metadata: dict[str, str], content_raw: str) -> FileStats:
+    """Start the stats entry for one file, before any step has run.
+
+    Returns:
+        The stats entry, with no outcome yet.
+
+    """
+    return {
         "file": filename,
+        "source": metadata.get("source_name") or metadata.get("from", ""),
+        "source_kind": metadata.get("source_kind", ""),
+        "intake_type": metadata.get("intake_type", ""),
         "raw_archive": None,
         "cleaned_archive": None,
         "filtered_archive": None,
@@ -729,71 +1537,102 @@ def process_file(filepath: pathlib.Path, config: PipelineConfig, all_stats: dict
         "outcome": None,
         "chars_before": len(content_raw),
         "chars_after": None,
+        "timings_ns": {
+            "filter_match": 0,
+            "filters": {},
+            "llm_checks": {},
+            "general_cleaning": {},
+            "text_removals": {},
+            "text_replacements": {},
+        },
     }
 
+
+def filter_and_clean(
+    filename: str,
+    metadata: dict[str, str],
+    content_raw: str,
+    config: PipelineConfig,
+    file_stats: FileStats,
+    verdict_cache: DiskCache | None = None,
+    *,
+    dry_run: bool = False,
+) -> tuple[str, str]:
+    """Run the filters and cleaning steps on one file's content, recording them in *file_stats*.
+
+    Sets the outcome and ``chars_after`` but writes no files. A dry run sends
+    no notifications and treats filters that need an LLM check as not
+    matching.
+
+    Returns:
+        The text to write, and the filtered reason (empty when the outcome is "cleaned").
+
+    """
+    timings = file_stats["timings_ns"]
+
     # --- Run filters ---
     filters = config.get("filters") or []
+    program = config.get("program") or compile_rule_program(config)
     skip_file: bool = False
     filter_reason: str = ""
+    checked_count = len(filters)
+
+    started = time.monotonic_ns()
+    candidates = match_filters(program["filters"], metadata)
+    timings["filter_match"] = time.monotonic_ns() - started
 
-    for filt in filters:
+    for idx in candidates:
+        filt = filters[idx]
         reason = filt["reason"]
         action = filt.get("action", "skip")
-
-        if not evaluate_match(filt["match"], metadata):
-            file_stats["filters_checked"].append(reason)
-            continue
-
-        # Match block passed — check LLM if needed
-        if "llm_check" in filt:
-            llm_result = evaluate_llm_check(
-                filt["llm_check"],
-                metadata,
-                content_raw,
-            )
-            if not llm_result:
-                file_stats["filters_checked"].append(reason)
+        filter_started = time.monotonic_ns()
+        try:
+            # Match block passed — check LLM if needed
+            if "llm_check" in filt:
+                if dry_run:
+                    continue
+                llm_started = time.monotonic_ns()
+                llm_result = evaluate_llm_check(
+                    filt["llm_check"],
+                    metadata,
+                    sample_llm_content(content_raw, filt.get("llm_sample")),
+                    verdict_cache,
+                )
+                timings["llm_checks"][reason] = time.monotonic_ns() - llm_started
+                if not llm_result:
+                    continue
+
+            # Filter matched
+            file_stats["filters_matched"].append(reason)
+
+            if action == "notify" and "notify" in filt:
+                notify_config = filt["notify"]
+                if not dry_run:
+                    send_gotify_notification(
+                        title=notify_config["title"],
+                        message=f"{filename}\n\n{metadata.get('title', '')}",
+                        priority=notify_config["priority"],
+                    )
                 continue
 
-        # Filter matched
-        file_stats["filters_checked"].append(reason)
-        file_stats["filters_matched"].append(reason)
+            # Remaining case is skip (notify already handled above)
+            skip_file = True
+            filter_reason = reason
+            checked_count = idx + 1
+            break
+        finally:
+            timings["filters"][reason] = time.monotonic_ns() - filter_started
 
-        if action == "notify" and "notify" in filt:
-            notify_config = filt["notify"]
-            send_gotify_notification(
-                title=notify_config["title"],
-                message=f"{filename}\n\n{metadata.get('title', '')}",
-                priority=notify_config["priority"],
-            )
-            continue
+    warn_slow_steps(filename, "filter", timings["filters"], SLOW_STEP_SECONDS)
+    warn_slow_steps(filename, "LLM check", timings["llm_checks"], SLOW_LLM_CHECK_SECONDS)
 
-        # Remaining case is skip (notify already handled above)
-        skip_file = True
-        filter_reason = reason
-        break
+    # Every rule up to and including the one that stopped evaluation was checked
+    file_stats["filters_checked"] = program["filters"]["reasons"][:checked_count]
 
     if skip_file:
-        # Write to filtered dir with reason
-        filtered_metadata = {**metadata, "filtered_reason": filter_reason}
-        filtered_path = pathlib.Path(FILTERED_DIR) / filename
-        write_metadata_and_content(filtered_path, filtered_metadata, content_raw)
-
-        # Archive raw
-        raw_archive_path = pathlib.Path(RAW_ARCHIVE_DIR) / filename
-        raw_archive_path.parent.mkdir(parents=True, exist_ok=True)
-        _ = shutil.copy2(str(filepath), str(raw_archive_path))
-
-        file_stats["filtered_archive"] = str(filtered_path)
-        file_stats["raw_archive"] = str(raw_archive_path)
         file_stats["outcome"] = "filtered"
         file_stats["chars_after"] = len(content_raw)
-        all_stats[timestamp] = file_stats
-
-        # Delete raw input
-        filepath.unlink()
-        logging.info("Filtered: %s (reason: %s)", filename, filter_reason)
-        return
+        return content_raw, filter_reason
 
     # --- Apply cleaning ---
     gc_stats: dict[str, dict[str, int | bool]] = {}
@@ -802,83 +1641,99 @@ def process_file(filepath: pathlib.Path, config: PipelineConfig, all_stats: dict
         metadata,
         config,
         gc_stats,
+        timings["general_cleaning"],
     )
     file_stats["general_cleaning"] = gc_stats
 
     # YAML text removals
     removal_stats: dict[str, dict[str, int]] = {}
-    cleaned_text = apply_text_removals(cleaned_text, config, removal_stats)
+    cleaned_text = apply_text_removals(cleaned_text, config, removal_stats, timings["text_removals"])
     file_stats["text_removals"] = removal_stats
 
     # YAML text replacements
     replacement_stats: dict[str, dict[str, int]] = {}
-    cleaned_text = apply_text_replacements(cleaned_text, config, replacement_stats)
+    cleaned_text = apply_text_replacements(cleaned_text, config, replacement_stats, timings["text_replacements"])
     file_stats["text_replacements"] = replacement_stats
 
+    warn_slow_steps(filename, "cleaning", timings["general_cleaning"], SLOW_STEP_SECONDS)
+    warn_slow_steps(filename, "text removal", timings["text_removals"], SLOW_STEP_SECONDS)
+    warn_slow_steps(filename, "text replacement", timings["text_replacements"], SLOW_STEP_SECONDS)
+
     # Check empty (before adding header/footer, which would mask empty content)
     if not cleaned_text.strip():
-        empty_reason = "Content empty after cleaning"
-        filtered_metadata_empty = {**metadata, "filtered_reason": empty_reason}
-        filtered_path_empty = pathlib.Path(FILTERED_DIR) / filename
-        write_metadata_and_content(filtered_path_empty, filtered_metadata_empty, "")
-
-        raw_archive_path_empty = pathlib.Path(RAW_ARCHIVE_DIR) / filename
-        raw_archive_path_empty.parent.mkdir(parents=True, exist_ok=True)
-        _ = shutil.copy2(str(filepath), str(raw_archive_path_empty))
-
-        file_stats["filtered_archive"] = str(filtered_path_empty)
-        file_stats["raw_archive"] = str(raw_archive_path_empty)
         file_stats["outcome"] = "filtered_empty"
         file_stats["chars_after"] = 0
-        all_stats[timestamp] = file_stats
-
-        filepath.unlink()
-        logging.info("Filtered (empty after cleaning): %s", filename)
-        send_gotify_notification(
-            "Skipping empty text-to-speech content",
-            f"{filename}: empty after cleaning.",
-        )
-        return
+        return "", "Content empty after cleaning"
 
     # Prepend and append author + title
-    from_name = metadata.get("from", "").strip()
-    title = metadata.get("title", "").strip()
-    header = (f"{from_name}.\n" if from_name else "") + (f"{title}.\n" if title else "")
-    footer = "\n\n" + (f"{from_name}.\n" if from_name else "") + (f"{title}.\n" if title else "")
-    if header:
-        cleaned_text = header + "\n" + cleaned_text
-    if from_name or title:
-        cleaned_text = cleaned_text.rstrip() + footer
+    cleaned_text = add_header_and_footer(cleaned_text, metadata)
+    file_stats["chars_after"] = len(cleaned_text)
 
     # Check too-big
     if len(cleaned_text) >= CHARACTER_LIMIT:
-        toobig_reason = f"Content too large: {len(cleaned_text)} chars (limit: {CHARACTER_LIMIT})"
-        filtered_metadata_big = {**metadata, "filtered_reason": toobig_reason}
-        filtered_path_big = pathlib.Path(FILTERED_DIR) / filename
-        write_metadata_and_content(filtered_path_big, filtered_metadata_big, cleaned_text)
+        file_stats["outcome"] = "filtered_too_big"
+        return cleaned_text, f"Content too large: {len(cleaned_text)} chars (limit: {CHARACTER_LIMIT})"
 
-        raw_archive_path_big = pathlib.Path(RAW_ARCHIVE_DIR) / filename
-        raw_archive_path_big.parent.mkdir(parents=True, exist_ok=True)
-        _ = shutil.copy2(str(filepath), str(raw_archive_path_big))
+    file_stats["outcome"] = "cleaned"
+    return cleaned_text, ""
 
-        file_stats["filtered_archive"] = str(filtered_path_big)
-        file_stats["raw_archive"] = str(raw_archive_path_big)
-        file_stats["outcome"] = "filtered_too_big"
-        file_stats["chars_after"] = len(cleaned_text)
+
+def process_file(
+    filepath: pathlib.Path,
+    config: PipelineConfig,
+    all_stats: dict[str, FileStats],
+    verdict_cache: DiskCache | None = None,
+) -> None:
+    """Filter, clean, and write a single raw text file."""
+    filename = filepath.name
+    logging.info("Processing: %s", filename)
+
+    # Read and parse
+    raw_text = filepath.read_text(encoding="utf-8")
+    metadata: dict[str, str]
+    metadata, content_raw = split_metadata(raw_text)
+    timestamp = datetime.now(tz=UTC).isoformat(timespec="microseconds")
+
+    file_stats = new_file_stats(filename, metadata, content_raw)
+    text, filter_reason = filter_and_clean(filename, metadata, content_raw, config, file_stats, verdict_cache)
+
+    if file_stats["outcome"] != "cleaned":
+        # Write to filtered dir with reason
+        filtered_metadata = {**metadata, "filtered_reason": filter_reason}
+        filtered_path = pathlib.Path(FILTERED_DIR) / filename
+        write_metadata_and_content(filtered_path, filtered_metadata, text)
+
+        # Archive raw
+        raw_archive_path = pathlib.Path(RAW_ARCHIVE_DIR) / filename
+        raw_archive_path.parent.mkdir(parents=True, exist_ok=True)
+        _ = shutil.copy2(str(filepath), str(raw_archive_path))
+
+        file_stats["filtered_archive"] = str(filtered_path)
+        file_stats["raw_archive"] = str(raw_archive_path)
         all_stats[timestamp] = file_stats
 
+        # Delete raw input
         filepath.unlink()
-        logging.info("Filtered (too big): %s (%d chars)", filename, len(cleaned_text))
-        send_gotify_notification(
-            "Skipping large text-to-speech content",
-            f"{filename}: {len(cleaned_text)} chars exceeds {CHARACTER_LIMIT} limit.",
-        )
+        if file_stats["outcome"] == "filtered_empty":
+            logging.info("Filtered (empty after cleaning): %s", filename)
+            send_gotify_notification(
+                "Skipping empty text-to-speech content",
+                f"{filename}: empty after cleaning.",
+            )
+        elif file_stats["outcome"] == "filtered_too_big":
+            logging.info("Filtered (too big): %s (%d chars)", filename, len(text))
+            send_gotify_notification(
+                "Skipping large text-to-speech content",
+                f"{filename}: {len(text)} chars exceeds {CHARACTER_LIMIT} limit.",
+            )
+        else:
+            logging.info("Filtered: %s (reason: %s)", filename, filter_reason)
         return
 
     # --- Write outputs ---
     # Write cleaned output
     cleaned_path = pathlib.Path(CLEANED_OUTPUT_DIR) / filename
-    write_metadata_and_content(cleaned_path, metadata, cleaned_text)
+    write_metadata_and_content(cleaned_path, metadata, text)
 
     # Archive raw
     raw_archive_final = pathlib.Path(RAW_ARCHIVE_DIR) / filename
@@ -892,8 +1747,6 @@ def process_file(filepath: pathlib.Path, config: PipelineConfig, all_stats: dict
 
     file_stats["raw_archive"] = str(raw_archive_final)
     file_stats["cleaned_archive"] = str(cleaned_archive)
-    file_stats["outcome"] = "cleaned"
-    file_stats["chars_after"] = len(cleaned_text)
     all_stats[timestamp] = file_stats
 
     # Delete raw input (last step — only after all writes succeeded)
@@ -902,25 +1755,63 @@ def process_file(filepath: pathlib.Path, config: PipelineConfig, all_stats: dict
         "Cleaned: %s (%d -> %d chars)",
         filename,
         len(content_raw),
-        len(cleaned_text),
+        len(text),
     )
 
 
-def process_files() -> None:
-    """Process all raw text files: filter, clean, and output for TTS."""
+# Set once per pool worker by _init_worker.
+_worker_config: PipelineConfig = {}
+_worker_verdict_cache: DiskCache | None = None
+
+
+def _init_worker(config: PipelineConfig, workers: int) -> None:
+    """Set up a pool worker: keep its copy of the config and open its verdict cache.
+
+    Runs once per worker process, so the rule program is unpickled (and its
+    patterns compiled) once per worker rather than once per file, and the
+    worker's Gemini client gets 1/*workers* of the rate and concurrency limits.
+    """
+    global _worker_config, _worker_verdict_cache  # noqa: PLW0603
+    _worker_config = config
+    _worker_verdict_cache = open_verdict_cache()
+    share_gemini_limits(workers)
+
+
+def _process_file_in_worker(filepath: pathlib.Path) -> dict[str, FileStats]:
+    """Run process_file in a pool worker and hand its stats back to the parent.
+
+    Returns:
+        The stats entries recorded for the file.
+
+    """
+    file_stats: dict[str, FileStats] = {}
+    process_file(filepath, _worker_config, file_stats, _worker_verdict_cache)
+    return file_stats
+
+
+def process_files(workers: int = DEFAULT_WORKERS) -> None:
+    """Process all raw text files: filter, clean, and output for TTS.
+
+    Each file's stats are appended to today's stats log as soon as it
+    finishes. With *workers* > 1, files are processed in a pool of worker
+    processes that split the Gemini limits between them; each file's
+    write/archive/delete sequence still runs in one worker, and only this
+    process writes the stats log.
+    """
     # Ensure directories exist
     for dir_path in (RAW_INPUT_DIR, RAW_ARCHIVE_DIR, CLEANED_OUTPUT_DIR, CLEANED_ARCHIVE_DIR, FILTERED_DIR, STATS_DIR):
         pathlib.Path(dir_path).mkdir(parents=True, exist_ok=True)
 
-    # Rotate old stats
+    # Rotate old stats, then fold earlier days' logs into their daily JSON
     rotate_stats()
+    compact_stats()
 
-    # Load config
-    config = load_config()
+    # Load config (validation and checks are cached while filters.yaml is unchanged)
+    config, checks = load_config_with_checks()
 
     # Validate rule ordering
     filters = config.get("filters") or []
-    ordering_errors = validate_rule_ordering(filters)
+    ordering_errors = checks["ordering_errors"]
     shadowed_matches: list[dict[str, dict[str, str]]] = []
 
     if ordering_errors:
@@ -938,11 +1829,16 @@ def process_files() -> None:
             idx = int(idx_str)
             shadowed_matches.append(filters[idx]["match"])
 
-    # Load today's stats (append to existing if re-run)
-    all_stats = load_today_stats()
+    # Patterns that backtrack badly are still run, under a per-rule time budget
+    for warning in checks["pattern_warnings"]:
+        logging.warning("Super-linear regex: %s", warning)
+
+    verdict_cache = open_verdict_cache()
+    verdict_cache.evict()
 
     # Process files
     txt_files = sorted(pathlib.Path(RAW_INPUT_DIR).glob("*.txt"))
+    pending: list[pathlib.Path] = []
     for txt_file in txt_files:
         # Check if this file matches a shadowed skip rule
         if shadowed_matches:
@@ -955,15 +1851,46 @@ def process_files() -> None:
                     txt_file.name,
                 )
                 continue
+        pending.append(txt_file)
+
+    if workers > 1 and len(pending) > 1:
+        logging.info("Processing %d files with %d worker processes", len(pending), workers)
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(config, workers)) as executor:
+            futures = {executor.submit(_process_file_in_worker, txt_file): txt_file for txt_file in pending}
+            for future in as_completed(futures):
+                try:
+                    append_stats(future.result())
+                except Exception:
+                    logging.exception("Error processing %s — leaving in raw for retry", futures[future].name)
+    else:
+        for txt_file in pending:
+            try:
+                file_stats: dict[str, FileStats] = {}
+                process_file(txt_file, config, file_stats, verdict_cache)
+                append_stats(file_stats)
+            except Exception:
+                logging.exception("Error processing %s — leaving in raw for retry", txt_file.name)
+                continue
 
-        try:
-            process_file(txt_file, config, all_stats)
-        except Exception:
-            logging.exception("Error processing %s — leaving in raw for retry", txt_file.name)
-            continue
+    verdict_cache.log_stats()
+    log_gemini_stats()
 
-    save_stats(all_stats)
+
+def main() -> None:
+    """Parse command-line options and process all raw text files."""
+    arg_parser = argparse.ArgumentParser(description="Filter and clean raw text files for TTS")
+    arg_parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_WORKERS,
+        help=f"Number of worker processes (default: {DEFAULT_WORKERS})",
+    )
+    args = arg_parser.parse_args()
+    workers: int = args.workers  # pyright: ignore[reportAny]
+    if workers < 1:
+        arg_parser.error("--workers must be at least 1")
+    process_files(workers=workers)
 
 
 if __name__ == "__main__":
-    process_files()
+    main()
@@ -0,0 +1,353 @@
+"""Queryable warehouse over prepare_text.py's daily stats.
+
+Loads stats/YYYY-MM-DD.json and .jsonl files into a SQLite database, keeps
+per-day rollups, and answers common questions from the rollups. Only days
+whose stats files changed since the last load are re-read, so a query never
+re-parses the whole retention window. Days rotated out of stats/ stay in the
+warehouse.
+
+Usage:
+  cd prepare-text
+  uv run python3 stats_warehouse.py top-rules --days 30
+  uv run python3 stats_warehouse.py sources --days 90
+  uv run python3 stats_warehouse.py filters --weeks 12
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import pathlib
+import re
+import sqlite3
+import sys
+from datetime import UTC, datetime, timedelta
+from typing import TYPE_CHECKING
+
+from prepare_text import STATS_DIR, load_day_stats
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from prepare_text import FileStats
+
+logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+
+WAREHOUSE_PATH = f"{STATS_DIR}/warehouse.sqlite3"
+# Bump when the schema or the way rows are derived changes; forces a full reload.
+WAREHOUSE_VERSION = 1
+DAY_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+# Stats written before records carried their source: "YYYYMMDD-HHMMSS-<source>- <title>.txt"
+FILENAME_SOURCE_RE = re.compile(r"^\d{8}-\d{6}-(.+?)- ")
+RULE_KINDS = ("text_removals", "text_replacements", "general_cleaning")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS loaded_days (
+    day TEXT PRIMARY KEY,
+    signature TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS files (
+    timestamp TEXT PRIMARY KEY,
+    day TEXT NOT NULL,
+    file TEXT NOT NULL,
+    source TEXT NOT NULL,
+    source_kind TEXT NOT NULL,
+    intake_type TEXT NOT NULL,
+    outcome TEXT,
+    chars_before INTEGER NOT NULL,
+    chars_after INTEGER
+);
+CREATE INDEX IF NOT EXISTS files_day ON files (day);
+CREATE TABLE IF NOT EXISTS rule_matches (
+    timestamp TEXT NOT NULL,
+    day TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    rule TEXT NOT NULL,
+    matches INTEGER NOT NULL,
+    PRIMARY KEY (timestamp, kind, rule)
+);
+CREATE INDEX IF NOT EXISTS rule_matches_day ON rule_matches (day);
+CREATE TABLE IF NOT EXISTS filter_checks (
+    timestamp TEXT NOT NULL,
+    day TEXT NOT NULL,
+    reason TEXT NOT NULL,
+    matched INTEGER NOT NULL,
+    PRIMARY KEY (timestamp, reason)
+);
+CREATE INDEX IF NOT EXISTS filter_checks_day ON filter_checks (day);
+CREATE TABLE IF NOT EXISTS daily_rules (
+    day TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    rule TEXT NOT NULL,
+    files INTEGER NOT NULL,
+    matches INTEGER NOT NULL,
+    PRIMARY KEY (day, kind, rule)
+);
+CREATE TABLE IF NOT EXISTS daily_sources (
+    day TEXT NOT NULL,
+    source TEXT NOT NULL,
+    files INTEGER NOT NULL,
+    cleaned INTEGER NOT NULL,
+    chars_before INTEGER NOT NULL,
+    chars_after INTEGER NOT NULL,
+    PRIMARY KEY (day, source)
+);
+CREATE TABLE IF NOT EXISTS daily_filters (
+    day TEXT NOT NULL,
+    reason TEXT NOT NULL,
+    checked INTEGER NOT NULL,
+    matched INTEGER NOT NULL,
+    PRIMARY KEY (day, reason)
+);
+"""
+
+DETAIL_TABLES = ("files", "rule_matches", "filter_checks", "daily_rules", "daily_sources", "daily_filters")
+# One per DETAIL_TABLES entry, clearing a day before it is reloaded.
+DELETE_DAY_STATEMENTS = (
+    "DELETE FROM files WHERE day = ?",
+    "DELETE FROM rule_matches WHERE day = ?",
+    "DELETE FROM filter_checks WHERE day = ?",
+    "DELETE FROM daily_rules WHERE day = ?",
+    "DELETE FROM daily_sources WHERE day = ?",
+    "DELETE FROM daily_filters WHERE day = ?",
+)
+
+
+# ---------------------------------------------------------------------------
+# Loading
+# ---------------------------------------------------------------------------
+
+
+def open_warehouse(path: str = WAREHOUSE_PATH) -> sqlite3.Connection:
+    """Open the warehouse, creating or resetting the schema as needed.
+
+    Returns:
+        An open connection.
+
+    """
+    pathlib.Path(path).parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path)
+    version: int = conn.execute("PRAGMA user_version").fetchone()[0]  # pyright: ignore[reportAny]
+    if version != WAREHOUSE_VERSION:
+        if version:
+            logging.info("Warehouse schema changed (v%d -> v%d); rebuilding", version, WAREHOUSE_VERSION)
+        for table in ("loaded_days", *DETAIL_TABLES):
+            _ = conn.execute(f"DROP TABLE IF EXISTS {table}")
+        _ = conn.execute(f"PRAGMA user_version = {WAREHOUSE_VERSION}")
+    _ = conn.executescript(SCHEMA)
+    return conn
+
+
+def day_signature(day: str) -> str:
+    """Fingerprint a day's stats files by size and mtime.
+
+    Returns:
+        A string that changes whenever either file for the day changes.
+
+    """
+    parts: list[str] = []
+    for suffix in (".json", ".jsonl"):
+        path = pathlib.Path(STATS_DIR) / f"{day}{suffix}"
+        if path.exists():
+            stat = path.stat()
+            parts.append(f"{suffix}:{stat.st_size}:{stat.st_mtime_ns}")
+    return ";".join(parts)
+
+
+def record_source(file_stats: FileStats) -> str:
+    """Return a stats record's source, parsing the filename for older records.
+
+    Returns:
+        The source name, or an empty string if unknown.
+
+    """
+    source = file_stats.get("source")
+    if source:
+        return source
+    filename_match = FILENAME_SOURCE_RE.match(file_stats["file"])
+    return filename_match.group(1).strip() if filename_match else ""
+
+
+def load_day(conn: sqlite3.Connection, day: str, signature: str) -> None:
+    """Replace one day's rows with its current stats and rebuild its rollups."""
+    stats = load_day_stats(day)
+    for statement in DELETE_DAY_STATEMENTS:
+        _ = conn.execute(statement, (day,))
+    for timestamp, file_stats in stats.items():
+        _ = conn.execute(
+            "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                timestamp,
+                day,
+                file_stats["file"],
+                record_source(file_stats),
+                file_stats.get("source_kind", ""),
+                file_stats.get("intake_type", ""),
+                file_stats["outcome"],
+                file_stats["chars_before"],
+                file_stats["chars_after"],
+            ),
+        )
+        for kind in RULE_KINDS:
+            rule_stats: dict[str, dict[str, int | bool]] = file_stats[kind]  # pyright: ignore[reportAssignmentType]
+            _ = conn.executemany(
+                "INSERT OR REPLACE INTO rule_matches VALUES (?, ?, ?, ?, ?)",
+                [
+                    (timestamp, day, kind, rule, int(counts["matches"]))
+                    for rule, counts in rule_stats.items()
+                    if "matches" in counts
+                ],
+            )
+        matched = set(file_stats["filters_matched"])
+        _ = conn.executemany(
+            "INSERT OR REPLACE INTO filter_checks VALUES (?, ?, ?, ?)",
+            [(timestamp, day, reason, reason in matched) for reason in file_stats["filters_checked"]],
+        )
+    _ = conn.execute(
+        """
+        INSERT INTO daily_rules
+        SELECT day, kind, rule, COUNT(*), SUM(matches) FROM rule_matches WHERE day = ? GROUP BY kind, rule
+        """,
+        (day,),
+    )
+    _ = conn.execute(
+        """
+        INSERT INTO daily_sources
+        SELECT day, source, COUNT(*), SUM(outcome = 'cleaned'),
+               SUM(CASE WHEN outcome = 'cleaned' THEN chars_before ELSE 0 END),
+               SUM(CASE WHEN outcome = 'cleaned' THEN chars_after ELSE 0 END)
+        FROM files WHERE day = ? GROUP BY source
+        """,
+        (day,),
+    )
+    _ = conn.execute(
+        """
+        INSERT INTO daily_filters
+        SELECT day, reason, COUNT(*), SUM(matched) FROM filter_checks WHERE day = ? GROUP BY reason
+        """,
+        (day,),
+    )
+    _ = conn.execute("INSERT OR REPLACE INTO loaded_days VALUES (?, ?)", (day, signature))
+
+
+def refresh(conn: sqlite3.Connection) -> None:
+    """Load every stats day that is new or changed since the last refresh."""
+    stats_dir = pathlib.Path(STATS_DIR)
+    days = sorted(
+        {path.stem for path in (*stats_dir.glob("*.json"), *stats_dir.glob("*.jsonl")) if DAY_RE.match(path.stem)},
+    )
+    loaded: dict[str, str] = dict(conn.execute("SELECT day, signature FROM loaded_days").fetchall())
+    changed = 0
+    for day in days:
+        signature = day_signature(day)
+        if loaded.get(day) == signature:
+            continue
+        with conn:
+            load_day(conn, day, signature)
+        changed += 1
+    if changed:
+        logging.info("Loaded %d changed stats day(s) into the warehouse", changed)
+
+
+# ---------------------------------------------------------------------------
+# Queries
+# ---------------------------------------------------------------------------
+
+
+def since_day(days: int) -> str:
+    """Return the first day included in a window of *days* days ending today.
+
+    Returns:
+        The date as ``YYYY-MM-DD``.
+
+    """
+    return (datetime.now(tz=UTC) - timedelta(days=days - 1)).strftime("%Y-%m-%d")
+
+
+def print_table(headers: Sequence[str], rows: Sequence[Sequence[object]]) -> None:
+    """Print rows as a left-aligned plain-text table."""
+    cells = [[str(header) for header in headers], *([str(value) for value in row] for row in rows)]
+    widths = [max(len(row[col]) for row in cells) for col in range(len(headers))]
+    lines = ["  ".join(value.ljust(width) for value, width in zip(row, widths, strict=True)).rstrip() for row in cells]
+    lines.insert(1, "  ".join("-" * width for width in widths))
+    _ = sys.stdout.write("\n".join(lines) + "\n")
+
+
+def top_rules(conn: sqlite3.Connection, days: int, kind: str | None, limit: int) -> None:
+    """Print the rules with the most matches over the last *days* days."""
+    rows: list[tuple[str, str, int, int]] = conn.execute(
+        """
+        SELECT kind, rule, SUM(files), SUM(matches) FROM daily_rules
+        WHERE day >= ? AND (? IS NULL OR kind = ?)
+        GROUP BY kind, rule ORDER BY SUM(matches) DESC, rule LIMIT ?
+        """,
+        (since_day(days), kind, kind, limit),
+    ).fetchall()
+    print_table(("kind", "rule", "files", "matches"), rows)
+
+
+def sources(conn: sqlite3.Connection, days: int) -> None:
+    """Print per-source volume and cleaning shrinkage over the last *days* days."""
+    rows: list[tuple[str, int, int, int, int]] = conn.execute(
+        """
+        SELECT source, SUM(files), SUM(cleaned), SUM(chars_before), SUM(chars_after) FROM daily_sources
+        WHERE day >= ? GROUP BY source ORDER BY SUM(chars_before) DESC
+        """,
+        (since_day(days),),
+    ).fetchall()
+    print_table(
+        ("source", "files", "cleaned", "chars_before", "chars_after", "kept"),
+        [
+            (source or "(unknown)", files, cleaned, before, after, f"{after / before:.1%}" if before else "-")
+            for source, files, cleaned, before, after in rows
+        ],
+    )
+
+
+def filter_rates(conn: sqlite3.Connection, weeks: int) -> None:
+    """Print each filter's weekly hit rate over the last *weeks* weeks."""
+    rows: list[tuple[str, str, int, int]] = conn.execute(
+        """
+        SELECT strftime('%Y-W%W', day) AS week, reason, SUM(checked), SUM(matched) FROM daily_filters
+        WHERE day >= ? GROUP BY week, reason ORDER BY week DESC, SUM(matched) DESC
+        """,
+        (since_day(weeks * 7),),
+    ).fetchall()
+    print_table(
+        ("week", "filter", "checked", "matched", "rate"),
+        [(week, reason, checked, matched, f"{matched / checked:.1%}") for week, reason, checked, matched in rows],
+    )
+
+
+def main() -> None:
+    """Parse command-line options, refresh the warehouse, and run a query."""
+    arg_parser = argparse.ArgumentParser(description="Query prepare_text stats")
+    arg_parser.add_argument("--db", default=WAREHOUSE_PATH, help=f"Warehouse path (default: {WAREHOUSE_PATH})")
+    subparsers = arg_parser.add_subparsers(dest="command", required=True)
+    _ = subparsers.add_parser("refresh", help="Load new or changed stats days and exit")
+    rules_parser = subparsers.add_parser("top-rules", help="Removal/replacement/cleaning rules by matches")
+    _ = rules_parser.add_argument("--days", type=int, default=30)
+    _ = rules_parser.add_argument("--kind", choices=RULE_KINDS)
+    _ = rules_parser.add_argument("--limit", type=int, default=20)
+    sources_parser = subparsers.add_parser("sources", help="chars_before vs chars_after by source")
+    _ = sources_parser.add_argument("--days", type=int, default=30)
+    filters_parser = subparsers.add_parser("filters", help="Filter hit rates per week")
+    _ = filters_parser.add_argument("--weeks", type=int, default=12)
+    args = arg_parser.parse_args()
+
+    conn = open_warehouse(args.db)  # pyright: ignore[reportAny]
+    try:
+        refresh(conn)
+        command: str = args.command  # pyright: ignore[reportAny]
+        if command == "top-rules":
+            top_rules(conn, args.days, args.kind, args.limit)  # pyright: ignore[reportAny]
+        elif command == "sources":
+            sources(conn, args.days)  # pyright: ignore[reportAny]
+        elif command == "filters":
+            filter_rates(conn, args.weeks)  # pyright: ignore[reportAny]
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
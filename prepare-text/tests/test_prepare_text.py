@@ -0,0 +1,191 @@
+"""Tests for prepare_text."""
+
+import pathlib
+import random
+import re
+import shutil
+
+import pytest
+
+from prepare_text import (
+    CLEANED_ARCHIVE_DIR,
+    CLEANED_OUTPUT_DIR,
+    CONFIG_FILE,
+    END_OF_LINE_RE,
+    FILTERED_DIR,
+    HORIZONTAL_WHITESPACE_RE,
+    LINE_STEPS,
+    RAW_ARCHIVE_DIR,
+    RAW_INPUT_DIR,
+    STANDALONE_AT_RE,
+    SUBSTACK_REFS_RE,
+    UNSUBSCRIBE_RE,
+    VALID_MATCH_FIELDS,
+    VIEW_ONLINE_RE,
+    FilterRule,
+    build_filter_index,
+    clean_lines,
+    evaluate_match,
+    load_config,
+    match_filters,
+    process_files,
+)
+
+EXAMPLE_CONFIG = pathlib.Path(__file__).parent.parent / "filters.example.yaml"
+
+# ---------------------------------------------------------------------------
+# Filter index
+# ---------------------------------------------------------------------------
+
+FILTER_WORDS = ("daily", "Daily Brief", "brief", "podcast", "feed", "example", "x", "Weekly Roundup", "")
+
+
+def _random_filter(rng: random.Random, idx: int) -> FilterRule:
+    fields = rng.sample(sorted(VALID_MATCH_FIELDS), rng.randint(1, 3))
+    match = {
+        field: {op: rng.choice(FILTER_WORDS) for op in rng.sample(["contains", "not_contains"], rng.randint(1, 2))}
+        for field in fields
+    }
+    return {"match": match, "reason": f"rule {idx}"}
+
+
+def _random_metadata(rng: random.Random) -> dict[str, str]:
+    fields = rng.sample(sorted(VALID_MATCH_FIELDS), rng.randint(0, len(VALID_MATCH_FIELDS)))
+    return {field: " ".join(rng.choices(FILTER_WORDS, k=rng.randint(0, 3))).swapcase() for field in fields}
+
+
+@pytest.mark.parametrize("seed", range(200))
+def test_match_filters_agrees_with_evaluate_match(seed: int) -> None:
+    """The indexed lookup finds exactly the filters a scan with evaluate_match finds."""
+    rng = random.Random(seed)
+    filters = [_random_filter(rng, idx) for idx in range(rng.randint(0, 30))]
+    index = build_filter_index(filters)
+    for _ in range(50):
+        metadata = _random_metadata(rng)
+        expected = [idx for idx, filt in enumerate(filters) if evaluate_match(filt["match"], metadata)]
+        assert match_filters(index, metadata) == expected
+
+
+def test_match_filters_on_example_config(tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """The example config's filters match in config order."""
+    _ = shutil.copy(EXAMPLE_CONFIG, tmp_path / CONFIG_FILE)
+    monkeypatch.chdir(tmp_path)
+    filters = load_config()["filters"]
+    index = build_filter_index(filters)
+    metadata = {"from": "Example Author", "title": "Something else", "source_url": "https://example-podcast-feed/1"}
+    expected = [idx for idx, filt in enumerate(filters) if evaluate_match(filt["match"], metadata)]
+    assert expected
+    assert match_filters(index, metadata) == expected
+
+
+# ---------------------------------------------------------------------------
+# Fused line cleaning
+# ---------------------------------------------------------------------------
+
+LINE_TOKENS = (
+    "word",
+    "end.",
+    "x_",
+    "@",
+    " @ ",
+    "Unsubscribe",
+    "View this post on the web at ",
+    "Substacks referenced above:",
+    "  substacks REFERENCED above: a, b",
+    " ",
+    "  ",
+    "\t",
+    "\u00a0",
+    "\x0b",
+    "\n",
+    "\n",
+    "\n\n",
+)
+
+
+def regex_line_steps(text: str, steps: set[str], stats: dict[str, dict[str, int | bool]]) -> str:
+    """Apply the line-local steps one regex at a time, as apply_general_cleaning did before clean_lines.
+
+    Returns:
+        The cleaned text.
+
+    """
+
+    def count_and_sub(pattern: re.Pattern[str], replacement: str, text: str, key: str) -> str:
+        result, matches = pattern.subn(replacement, text)
+        if matches > 0:
+            stats[key] = {"matches": matches}
+        return result
+
+    if "whitespace_collapse" in steps:
+        text = HORIZONTAL_WHITESPACE_RE.sub(" ", text)
+        stats["whitespace_collapse"] = {"applied": True}
+    if "unsubscribe_removal" in steps:
+        text = count_and_sub(UNSUBSCRIBE_RE, "", text, "unsubscribe_removal")
+    if "view_online_removal" in steps:
+        text = count_and_sub(VIEW_ONLINE_RE, "", text, "view_online_removal")
+    if "substack_refs_removal" in steps:
+        text = count_and_sub(SUBSTACK_REFS_RE, "", text, "substack_refs_removal")
+    if "standalone_at_removal" in steps:
+        text = count_and_sub(STANDALONE_AT_RE, "", text, "standalone_at_removal")
+    if "end_of_line_punctuation" in steps:
+        text = END_OF_LINE_RE.sub(r"\1.\2", text)
+        stats["end_of_line_punctuation"] = {"applied": True}
+    return text
+
+
+@pytest.mark.parametrize("seed", range(100))
+def test_clean_lines_agrees_with_regex_steps(seed: int) -> None:
+    """The fused pass produces the same text and stats as the per-step regexes."""
+    rng = random.Random(seed)
+    for _ in range(200):
+        text = "".join(rng.choices(LINE_TOKENS, k=rng.randint(0, 40)))
+        steps = {step for step in LINE_STEPS if rng.random() < 0.8}
+        expected_stats: dict[str, dict[str, int | bool]] = {}
+        expected = regex_line_steps(text, steps, expected_stats)
+        stats: dict[str, dict[str, int | bool]] = {}
+        assert clean_lines(text, steps, stats) == expected, (text, sorted(steps))
+        assert stats == expected_stats, (text, sorted(steps))
+
+
+# ---------------------------------------------------------------------------
+# Worker pool
+# ---------------------------------------------------------------------------
+
+OUTPUT_DIRS = (RAW_ARCHIVE_DIR, CLEANED_OUTPUT_DIR, CLEANED_ARCHIVE_DIR, FILTERED_DIR)
+
+
+def _write_raw_inputs(raw_dir: pathlib.Path) -> None:
+    raw_dir.mkdir(parents=True)
+    body = (
+        "Facebook\nTwitter\nLinkedIn\nThe council met on Tuesday\n"
+        "Advertisement\nVisit https://example.com/story for more  details\n"
+        "Worchestershire sauce was served [a]\n\nUnsubscribe\n"
+    )
+    for idx in range(12):
+        author = "Example Author" if idx % 4 == 0 else f"Writer {idx}"
+        text = f"META_FROM: {author}\nMETA_TITLE: Issue {idx}\n\n{body * (idx + 1)}"
+        _ = (raw_dir / f"2024010{idx % 9}-12000{idx % 10}-{author}- Issue {idx}.txt").write_text(text, encoding="utf-8")
+
+
+def _run_pipeline(run_dir: pathlib.Path, monkeypatch: pytest.MonkeyPatch, workers: int) -> dict[str, bytes]:
+    _write_raw_inputs(run_dir / RAW_INPUT_DIR)
+    _ = shutil.copy(EXAMPLE_CONFIG, run_dir / CONFIG_FILE)
+    monkeypatch.chdir(run_dir)
+    process_files(workers=workers)
+    assert not list((run_dir / RAW_INPUT_DIR).iterdir())
+    return {
+        str(path.relative_to(run_dir)): path.read_bytes()
+        for output_dir in OUTPUT_DIRS
+        for path in sorted((run_dir / output_dir).rglob("*"))
+        if path.is_file()
+    }
+
+
+def test_worker_pool_output_matches_serial_run(tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """--workers 2 writes byte-identical cleaned, filtered and archived files to --workers 1."""
+    serial = _run_pipeline(tmp_path / "serial", monkeypatch, workers=1)
+    pooled = _run_pipeline(tmp_path / "pooled", monkeypatch, workers=2)
+    assert any(name.startswith(FILTERED_DIR) for name in serial)
+    assert any(name.startswith(CLEANED_OUTPUT_DIR) for name in serial)
+    assert pooled == serial
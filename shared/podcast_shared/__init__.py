@@ -1,11 +1,20 @@
 # ruff: noqa: RUF067
 """Shared utilities for the podcast-transcribe pipeline."""
 
+import asyncio
+import contextlib
+import hashlib
 import logging
+import operator
 import os
+import pathlib
+import threading
+import time
 
 import requests
 from google import genai
+from google.genai import errors as genai_errors
+from google.genai import types
 from mutagen.id3 import ID3
 from mutagen.id3._frames import TIT2, TT3, WXXX  # noqa: PLC2701
 from mutagen.id3._util import ID3NoHeaderError  # noqa: PLC2701
@@ -13,8 +22,82 @@ from mutagen.id3._util import ID3NoHeaderError  # noqa: PLC2701
 logger = logging.getLogger(__name__)
 
 SUMMARY_MODEL = "gemini-3.1-flash-lite-preview"
+# Bump whenever the summary prompt changes so cached summaries are regenerated.
+SUMMARY_PROMPT_VERSION = "1"
+SUMMARY_CACHE_SUBDIR = "summaries"
+SUMMARY_CACHE_MAX_AGE_SECONDS = 60 * 60 * 24 * 90
+
+STALE_TEMP_FILE_SECONDS = 3600
+
+# Limits applied to every generate_content call made through RateLimitedGemini.
+GEMINI_REQUESTS_PER_MINUTE = 60
+GEMINI_MAX_CONCURRENT = 4
+GEMINI_MAX_ATTEMPTS = 5
+GEMINI_RETRY_BASE_SECONDS = 2.0
 
 _gemini_client: genai.Client | None = None
+_gemini_client_lock = threading.Lock()
+_gemini: "RateLimitedGemini | None" = None
+_gemini_lock = threading.Lock()
+_gemini_processes = 1
+_summary_cache: "DiskCache | None" = None
+_summary_cache_lock = threading.Lock()
+
+
+# ---------------------------------------------------------------------------
+# Rate limiting
+# ---------------------------------------------------------------------------
+
+
+class RateLimiter:
+    """Thread-safe token bucket allowing ``rate`` acquisitions per second.
+
+    Up to ``burst`` acquisitions go through immediately after an idle period.
+    Callers reserve their slot under the lock and sleep outside it, so waiting
+    threads are served in arrival order.
+    """
+
+    def __init__(self, rate: float, burst: float = 1.0) -> None:
+        """Start with a full bucket.
+
+        Raises:
+            ValueError: If *rate* is not positive or *burst* is below 1.
+
+        """
+        if rate <= 0 or burst < 1:
+            msg = f"Invalid rate limit: rate={rate}, burst={burst}"
+            raise ValueError(msg)
+        self.rate: float = rate
+        self.burst: float = burst
+        self._tokens: float = burst
+        self._updated: float = time.monotonic()
+        self._lock: threading.Lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take one token, going into debt if the bucket is empty.
+
+        Returns:
+            Seconds the caller must wait before proceeding.
+
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return max(0.0, -self._tokens / self.rate)
+
+    def acquire(self) -> float:
+        """Block until a token is available.
+
+        Returns:
+            Seconds spent waiting.
+
+        """
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
 
 
 # ---------------------------------------------------------------------------
@@ -31,10 +114,372 @@ def get_gemini_client() -> genai.Client:
     """
     global _gemini_client  # noqa: PLW0603
     if _gemini_client is None:
-        _gemini_client = genai.Client(api_key=os.environ["GEMINI_API_KEY"])
+        with _gemini_client_lock:
+            if _gemini_client is None:
+                _gemini_client = genai.Client(api_key=os.environ["GEMINI_API_KEY"])
     return _gemini_client
 
 
+def get_gemini() -> "RateLimitedGemini":
+    """Return the rate-limited wrapper around the singleton Gemini client.
+
+    Returns:
+        The shared RateLimitedGemini instance.
+
+    """
+    global _gemini  # noqa: PLW0603
+    if _gemini is None:
+        with _gemini_lock:
+            if _gemini is None:
+                _gemini = RateLimitedGemini(
+                    get_gemini_client(),
+                    requests_per_minute=GEMINI_REQUESTS_PER_MINUTE / _gemini_processes,
+                    max_concurrent=max(1, GEMINI_MAX_CONCURRENT // _gemini_processes),
+                )
+    return _gemini
+
+
+def share_gemini_limits(processes: int) -> None:
+    """Give this process its share of the Gemini limits when *processes* processes call Gemini at once.
+
+    Every process builds its own RateLimitedGemini, so a pool of N workers
+    would otherwise send N times the configured rate. Call in each worker
+    before its first Gemini request; a wrapper inherited from the parent is
+    dropped. Each process keeps at least one in-flight slot.
+    """
+    global _gemini, _gemini_processes  # noqa: PLW0603
+    with _gemini_lock:
+        _gemini = None
+        _gemini_processes = processes
+
+
+def log_gemini_stats() -> None:
+    """Log the shared wrapper's counters, if anything in this process has used it.
+
+    Never creates the client, so runs that made no Gemini calls need no API key.
+    """
+    if _gemini is not None:
+        _gemini.log_stats()
+
+
+def _is_retryable_gemini_error(exc: Exception) -> bool:
+    return isinstance(exc, genai_errors.APIError) and (exc.code == 429 or exc.code >= 500)
+
+
+class RateLimitedGemini:
+    """``generate_content`` with a shared rate limit, concurrency cap and retries.
+
+    Sync calls (from any thread) and async calls (via ``client.aio``) draw from
+    the same token bucket and the same pool of in-flight slots, so one instance
+    can be shared by every caller in a process. 429 and 5xx responses are
+    retried with exponential backoff. Request, latency and token counters are
+    kept for ``log_stats``.
+    """
+
+    def __init__(
+        self,
+        client: genai.Client,
+        *,
+        requests_per_minute: float = GEMINI_REQUESTS_PER_MINUTE,
+        max_concurrent: int = GEMINI_MAX_CONCURRENT,
+        max_attempts: int = GEMINI_MAX_ATTEMPTS,
+        retry_base_seconds: float = GEMINI_RETRY_BASE_SECONDS,
+    ) -> None:
+        """Wrap *client* with the given limits."""
+        self.client: genai.Client = client
+        self.max_attempts: int = max_attempts
+        self.retry_base_seconds: float = retry_base_seconds
+        self._limiter: RateLimiter = RateLimiter(requests_per_minute / 60, burst=max_concurrent)
+        self._slots: threading.BoundedSemaphore = threading.BoundedSemaphore(max_concurrent)
+        self._lock: threading.Lock = threading.Lock()
+        self.requests: int = 0
+        self.retries: int = 0
+        self.failures: int = 0
+        self.latency_seconds: float = 0.0
+        self.prompt_tokens: int = 0
+        self.output_tokens: int = 0
+
+    def _record(self, elapsed: float, response: types.GenerateContentResponse | None) -> None:
+        with self._lock:
+            self.requests += 1
+            self.latency_seconds += elapsed
+            if response is None:
+                self.failures += 1
+            elif response.usage_metadata is not None:
+                self.prompt_tokens += response.usage_metadata.prompt_token_count or 0
+                self.output_tokens += response.usage_metadata.candidates_token_count or 0
+
+    def _retry_delay(self, attempt: int, exc: Exception, model: str) -> float | None:
+        """Return the backoff before retrying *exc*, or None if it should propagate.
+
+        Returns:
+            Seconds to wait, or None.
+
+        """
+        if attempt >= self.max_attempts or not _is_retryable_gemini_error(exc):
+            return None
+        delay = self.retry_base_seconds * 2 ** (attempt - 1)
+        with self._lock:
+            self.retries += 1
+        logger.warning(
+            "Gemini %s request failed (attempt %d/%d): %s; retrying in %.0fs",
+            model,
+            attempt,
+            self.max_attempts,
+            exc,
+            delay,
+        )
+        return delay
+
+    def generate_content(
+        self,
+        *,
+        model: str,
+        contents: types.ContentListUnionDict,
+        config: types.GenerateContentConfigOrDict | None = None,
+    ) -> types.GenerateContentResponse:
+        """Call ``client.models.generate_content`` under the shared limits.
+
+        Returns:
+            The Gemini response.
+
+        """
+        attempt = 1
+        while True:
+            with self._slots:
+                _ = self._limiter.acquire()
+                started = time.monotonic()
+                try:
+                    response = self.client.models.generate_content(  # pyright: ignore[reportUnknownMemberType]
+                        model=model,
+                        contents=contents,
+                        config=config,
+                    )
+                except Exception as exc:
+                    self._record(time.monotonic() - started, None)
+                    delay = self._retry_delay(attempt, exc, model)
+                    if delay is None:
+                        raise
+                else:
+                    self._record(time.monotonic() - started, response)
+                    return response
+            time.sleep(delay)
+            attempt += 1
+
+    async def _aacquire_slot(self) -> None:
+        """Wait for an in-flight slot in a worker thread so the event loop keeps running.
+
+        Raises:
+            asyncio.CancelledError: If the caller is cancelled while waiting.
+
+        """
+        acquiring = asyncio.ensure_future(asyncio.to_thread(self._slots.acquire))
+        try:
+            _ = await asyncio.shield(acquiring)
+        except asyncio.CancelledError:
+            # The worker thread still takes the slot; hand it back once it has.
+            acquiring.add_done_callback(lambda _: self._slots.release())
+            raise
+
+    async def agenerate_content(
+        self,
+        *,
+        model: str,
+        contents: types.ContentListUnionDict,
+        config: types.GenerateContentConfigOrDict | None = None,
+    ) -> types.GenerateContentResponse:
+        """Async ``generate_content`` via ``client.aio``, under the shared limits.
+
+        Returns:
+            The Gemini response.
+
+        """
+        attempt = 1
+        while True:
+            await self._aacquire_slot()
+            try:
+                await asyncio.sleep(self._limiter.reserve())
+                started = time.monotonic()
+                try:
+                    response = await self.client.aio.models.generate_content(  # pyright: ignore[reportUnknownMemberType]
+                        model=model,
+                        contents=contents,
+                        config=config,
+                    )
+                except Exception as exc:
+                    self._record(time.monotonic() - started, None)
+                    delay = self._retry_delay(attempt, exc, model)
+                    if delay is None:
+                        raise
+                else:
+                    self._record(time.monotonic() - started, response)
+                    return response
+            finally:
+                self._slots.release()
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    def log_stats(self) -> None:
+        """Log request, retry, latency and token counters accumulated so far."""
+        with self._lock:
+            requests_made, retries, failures = self.requests, self.retries, self.failures
+            latency, prompt_tokens, output_tokens = self.latency_seconds, self.prompt_tokens, self.output_tokens
+        if not requests_made:
+            return
+        logger.info(
+            "Gemini: %d requests (%d retried, %d failed), %.1fs total latency (%.2fs avg), "
+            "%d prompt tokens, %d output tokens",
+            requests_made,
+            retries,
+            failures,
+            latency,
+            latency / requests_made,
+            prompt_tokens,
+            output_tokens,
+        )
+
+
+# ---------------------------------------------------------------------------
+# Disk cache
+# ---------------------------------------------------------------------------
+
+
+class DiskCache:
+    """Content-addressed on-disk cache of byte blobs.
+
+    Each entry is a file named by the SHA-256 of its key parts. An entry's age
+    is its file mtime, which hits refresh when ``refresh_on_hit`` is set, so
+    size-based eviction drops the least recently used entries first. Safe to
+    share between threads; writes are atomic so concurrent processes never see
+    a partial entry.
+    """
+
+    def __init__(
+        self,
+        directory: str | pathlib.Path,
+        *,
+        name: str,
+        suffix: str = "",
+        max_age_seconds: float | None = None,
+        max_bytes: int | None = None,
+        refresh_on_hit: bool = True,
+    ) -> None:
+        """Configure the cache; the directory is created on first write."""
+        self.directory: pathlib.Path = pathlib.Path(directory)
+        self.name: str = name
+        self.suffix: str = suffix
+        self.max_age_seconds: float | None = max_age_seconds
+        self.max_bytes: int | None = max_bytes
+        self.refresh_on_hit: bool = refresh_on_hit
+        self.hits: int = 0
+        self.misses: int = 0
+        self._lock: threading.Lock = threading.Lock()
+
+    @staticmethod
+    def make_key(*parts: str) -> str:
+        """Hash key parts into a cache key (length-prefixed, so parts cannot run together).
+
+        Returns:
+            The hex SHA-256 digest.
+
+        """
+        digest = hashlib.sha256()
+        for part in parts:
+            encoded = part.encode("utf-8")
+            digest.update(len(encoded).to_bytes(8, "big"))
+            digest.update(encoded)
+        return digest.hexdigest()
+
+    def path_for(self, key: str) -> pathlib.Path:
+        """Return the file path that holds *key*'s entry.
+
+        Returns:
+            The entry path (which may not exist).
+
+        """
+        return self.directory / f"{key}{self.suffix}"
+
+    def _is_expired(self, mtime: float, now: float) -> bool:
+        return self.max_age_seconds is not None and now - mtime > self.max_age_seconds
+
+    def _read_fresh(self, path: pathlib.Path) -> bytes | None:
+        try:
+            if self._is_expired(path.stat().st_mtime, time.time()):
+                path.unlink(missing_ok=True)
+                return None
+            return path.read_bytes()
+        except FileNotFoundError:
+            return None
+
+    def get(self, key: str) -> bytes | None:
+        """Return the cached bytes for *key*, or None on a miss or expired entry.
+
+        Returns:
+            The cached bytes, or None.
+
+        """
+        path = self.path_for(key)
+        data = self._read_fresh(path)
+        if data is not None and self.refresh_on_hit:
+            with contextlib.suppress(FileNotFoundError):
+                os.utime(path)
+        with self._lock:
+            if data is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return data
+
+    def put(self, key: str, data: bytes) -> None:
+        """Store *data* under *key*, replacing any existing entry atomically."""
+        path = self.path_for(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        _ = tmp_path.write_bytes(data)
+        _ = tmp_path.replace(path)
+
+    def evict(self) -> None:
+        """Delete expired entries, then the oldest entries until under ``max_bytes``."""
+        if not self.directory.exists():
+            return
+        now = time.time()
+        entries: list[tuple[float, int, pathlib.Path]] = []
+        removed = 0
+        for path in self.directory.iterdir():
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            if path.name.startswith("."):
+                # Leftover temp file from a writer that died mid-put.
+                if path.name.endswith(".tmp") and now - stat.st_mtime > STALE_TEMP_FILE_SECONDS:
+                    path.unlink(missing_ok=True)
+                continue
+            if not path.name.endswith(self.suffix):
+                continue
+            if self._is_expired(stat.st_mtime, now):
+                path.unlink(missing_ok=True)
+                removed += 1
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        if self.max_bytes is not None:
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries, key=operator.itemgetter(0)):
+                if total <= self.max_bytes:
+                    break
+                path.unlink(missing_ok=True)
+                total -= size
+                removed += 1
+        if removed:
+            logger.info("%s cache: evicted %d entries", self.name, removed)
+
+    def log_stats(self) -> None:
+        """Log the hit/miss counters accumulated so far."""
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        logger.info("%s cache: %d hits, %d misses", self.name, hits, misses)
+
+
 # ---------------------------------------------------------------------------
 # Gotify notifications
 # ---------------------------------------------------------------------------
@@ -101,9 +546,48 @@ def split_metadata(raw_text: str) -> tuple[dict[str, str], str]:
 # ---------------------------------------------------------------------------
 
 
+def cache_root() -> pathlib.Path:
+    """Return the pipeline's cache directory under ``$XDG_CACHE_HOME`` (default ``~/.cache``).
+
+    Returns:
+        The cache root path (which may not exist yet).
+
+    """
+    xdg_cache_home = os.environ.get("XDG_CACHE_HOME") or pathlib.Path.home() / ".cache"
+    return pathlib.Path(xdg_cache_home) / "podcast-transcribe"
+
+
+def get_summary_cache() -> DiskCache:
+    """Return the persistent summary cache, evicting expired entries on first use.
+
+    Entries expire a fixed time after they were written; hits do not extend them.
+
+    Returns:
+        The shared summary cache.
+
+    """
+    global _summary_cache  # noqa: PLW0603
+    if _summary_cache is None:
+        with _summary_cache_lock:
+            if _summary_cache is None:
+                cache = DiskCache(
+                    cache_root() / SUMMARY_CACHE_SUBDIR,
+                    name="Summary",
+                    suffix=".txt",
+                    max_age_seconds=SUMMARY_CACHE_MAX_AGE_SECONDS,
+                    refresh_on_hit=False,
+                )
+                cache.evict()
+                _summary_cache = cache
+    return _summary_cache
+
+
 def generate_summary(text: str, title: str) -> str:
     """Generate a 2-3 sentence article summary via Gemini.
 
+    Summaries are cached on disk by prompt content, model and prompt version,
+    so re-running an article costs no LLM call. Failures are not cached.
+
     Returns:
         The summary text, or empty string on failure.
 
@@ -111,25 +595,33 @@ def generate_summary(text: str, title: str) -> str:
     if not text.strip():
         logger.info("Summary skipped: empty content")
         return ""
-    logger.info("Generating summary via Gemini")
     prompt = (
         "Summarize the article in 2-3 sentences. Focus on key points and keep it concise.\n\n"
         f"Title: {title}\n\nArticle:\n{text}"
     )
+    cache = get_summary_cache()
+    cache_key = DiskCache.make_key(prompt, SUMMARY_MODEL, SUMMARY_PROMPT_VERSION)
+    cached = cache.get(cache_key)
+    if cached is not None:
+        logger.info("Using cached summary")
+        return cached.decode("utf-8")
+    logger.info("Generating summary via Gemini")
     try:
-        client = get_gemini_client()
-        response = client.models.generate_content(  # pyright: ignore[reportUnknownMemberType]
-            model=SUMMARY_MODEL,
-            contents=prompt,
-        )
+        response = get_gemini().generate_content(model=SUMMARY_MODEL, contents=prompt)
         if response.text is None:
             logger.warning("Gemini returned no text for summary")
             return ""
         logger.info("Summary generated")
-        return response.text.strip()
+        summary = response.text.strip()
     except Exception:
         logger.exception("Summary generation failed")
         return ""
+    if summary:
+        try:
+            cache.put(cache_key, summary.encode("utf-8"))
+        except OSError:
+            logger.warning("Could not write summary cache entry", exc_info=True)
+    return summary
 
 
 # ---------------------------------------------------------------------------
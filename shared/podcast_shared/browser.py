@@ -0,0 +1,501 @@
+"""Headless Chromium shared across the fetches of one run.
+
+Launching Chromium costs seconds of CPU and hundreds of MB, so the intake
+scripts launch it at most once per run and give every URL its own short-lived
+browser context. BrowserPool wraps Playwright's sync API and AsyncBrowserPool
+its async API. Requires the ``browser`` extra (Playwright).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager, contextmanager
+from typing import TYPE_CHECKING, Self, TypedDict
+from urllib.parse import urlsplit
+
+from playwright.async_api import async_playwright
+from playwright.sync_api import Error as PlaywrightError
+from playwright.sync_api import sync_playwright
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncGenerator, Generator
+    from types import TracebackType
+
+    from playwright.async_api import Browser as AsyncBrowser
+    from playwright.async_api import BrowserContext as AsyncBrowserContext
+    from playwright.async_api import Page as AsyncPage
+    from playwright.async_api import Playwright as AsyncPlaywright
+    from playwright.async_api import Route as AsyncRoute
+    from playwright.sync_api import Browser, BrowserContext, Page, Playwright, Route
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_PAGES = 4
+# 1 gives every URL a fresh, isolated context (no shared cookies, cache or storage).
+DEFAULT_PAGES_PER_CONTEXT = 1
+
+# A page counts as loaded once its DOM has gone this long without a mutation.
+DOM_QUIET_MS = 1500
+# Pages that never stop mutating (tickers, carousels, live blogs) are read after this long.
+DOM_SETTLE_MAX_MS = 5000
+
+# Resolves once the document has gone quietMs without a DOM mutation, or after maxMs regardless.
+_DOM_QUIET_JS = """
+([quietMs, maxMs]) => new Promise((resolve) => {
+    const done = () => { observer.disconnect(); resolve(); };
+    const observer = new MutationObserver(() => {
+        clearTimeout(timer);
+        timer = setTimeout(done, quietMs);
+    });
+    let timer = setTimeout(done, quietMs);
+    setTimeout(done, maxMs);
+    observer.observe(document.documentElement, { childList: true, subtree: true, characterData: true });
+})
+"""
+
+
+# ---------------------------------------------------------------------------
+# Request interception
+# ---------------------------------------------------------------------------
+
+
+class ResourcePolicy(TypedDict):
+    """Which requests a pooled page may make; everything else is aborted.
+
+    Domains match the host itself and any subdomain of it. Allowed domains
+    are exempt from both checks.
+    """
+
+    blocked_types: frozenset[str]
+    blocked_domains: tuple[str, ...]
+    allowed_domains: tuple[str, ...]
+
+
+# trafilatura reads only the rendered HTML, so nothing that merely paints or tracks is fetched.
+# Scripts and XHR stay allowed because the scrapers and many article pages render client-side.
+DEFAULT_RESOURCE_POLICY: ResourcePolicy = {
+    "blocked_types": frozenset({"image", "media", "font", "stylesheet", "texttrack", "manifest", "other"}),
+    "blocked_domains": (
+        "doubleclick.net",
+        "googlesyndication.com",
+        "googletagmanager.com",
+        "google-analytics.com",
+        "adservice.google.com",
+        "amazon-adsystem.com",
+        "adnxs.com",
+        "criteo.com",
+        "taboola.com",
+        "outbrain.com",
+        "scorecardresearch.com",
+        "chartbeat.com",
+        "hotjar.com",
+        "facebook.net",
+        "segment.io",
+    ),
+    "allowed_domains": (),
+}
+
+
+def _host_matches(host: str, domains: tuple[str, ...]) -> bool:
+    return any(host == domain or host.endswith("." + domain) for domain in domains)
+
+
+def should_block(policy: ResourcePolicy, resource_type: str, url: str) -> bool:
+    """Decide whether *policy* aborts a request.
+
+    Returns:
+        True when the request's host is denied, or its resource type is
+        blocked and its host is not explicitly allowed.
+
+    """
+    host = (urlsplit(url).hostname or "").lower()
+    if _host_matches(host, policy["allowed_domains"]):
+        return False
+    return _host_matches(host, policy["blocked_domains"]) or resource_type in policy["blocked_types"]
+
+
+# ---------------------------------------------------------------------------
+# Page loading
+# ---------------------------------------------------------------------------
+
+
+def load_until_stable(page: Page, url: str, timeout_ms: int, quiet_ms: int = DOM_QUIET_MS) -> None:
+    """Navigate to *url* and return once the DOM has stopped changing.
+
+    Waits for DOMContentLoaded and then for *quiet_ms* without a DOM mutation,
+    instead of for network idle, which ads, analytics and long polling can
+    hold off until *timeout_ms*. A DOM that keeps changing is read after at
+    most DOM_SETTLE_MAX_MS.
+    """
+    deadline = time.monotonic() + timeout_ms / 1000
+    _ = page.goto(url, wait_until="domcontentloaded", timeout=timeout_ms)
+    remaining_ms = max(int((deadline - time.monotonic()) * 1000), 0)
+    try:
+        _ = page.evaluate(_DOM_QUIET_JS, [quiet_ms, min(remaining_ms, DOM_SETTLE_MAX_MS)])
+    except PlaywrightError:
+        # A client-side redirect replaced the document mid-wait; wait on the new one
+        logger.debug("Document replaced while waiting for a stable DOM at %s", url, exc_info=True)
+        page.wait_for_load_state("domcontentloaded", timeout=remaining_ms or 1)
+        remaining_ms = max(int((deadline - time.monotonic()) * 1000), 0)
+        _ = page.evaluate(_DOM_QUIET_JS, [quiet_ms, min(remaining_ms, DOM_SETTLE_MAX_MS)])
+
+
+async def aload_until_stable(page: AsyncPage, url: str, timeout_ms: int, quiet_ms: int = DOM_QUIET_MS) -> None:
+    """Async ``load_until_stable`` for pages from AsyncBrowserPool."""
+    deadline = time.monotonic() + timeout_ms / 1000
+    _ = await page.goto(url, wait_until="domcontentloaded", timeout=timeout_ms)
+    remaining_ms = max(int((deadline - time.monotonic()) * 1000), 0)
+    try:
+        _ = await page.evaluate(_DOM_QUIET_JS, [quiet_ms, min(remaining_ms, DOM_SETTLE_MAX_MS)])
+    except PlaywrightError:
+        # A client-side redirect replaced the document mid-wait; wait on the new one
+        logger.debug("Document replaced while waiting for a stable DOM at %s", url, exc_info=True)
+        await page.wait_for_load_state("domcontentloaded", timeout=remaining_ms or 1)
+        remaining_ms = max(int((deadline - time.monotonic()) * 1000), 0)
+        _ = await page.evaluate(_DOM_QUIET_JS, [quiet_ms, min(remaining_ms, DOM_SETTLE_MAX_MS)])
+
+
+# ---------------------------------------------------------------------------
+# Browser pools
+# ---------------------------------------------------------------------------
+
+
+class _PoolAccounting:
+    """Context recycling and usage counters shared by the sync and async pools."""
+
+    def __init__(
+        self,
+        *,
+        max_pages: int,
+        pages_per_context: int,
+        headless: bool,
+        resource_policy: ResourcePolicy | None,
+    ) -> None:
+        self._max_pages: int = max_pages
+        self._pages_per_context: int = pages_per_context
+        self._headless: bool = headless
+        self._resource_policy: ResourcePolicy | None = resource_policy
+        # Pages served by the current context, and the open-page count of every live context
+        self._context_uses: int = 0
+        self._open_pages: dict[object, int] = {}
+        self.launches: int = 0
+        self.contexts: int = 0
+        self.pages: int = 0
+        self.blocked_requests: int = 0
+        self.allowed_requests: int = 0
+
+    def _should_abort(self, resource_type: str, url: str) -> bool:
+        if self._resource_policy is not None and should_block(self._resource_policy, resource_type, url):
+            self.blocked_requests += 1
+            return True
+        self.allowed_requests += 1
+        return False
+
+    def _context_used_up(self) -> bool:
+        return self._context_uses >= self._pages_per_context
+
+    def _context_opened(self, context: object) -> None:
+        self._context_uses = 0
+        self._open_pages[context] = 0
+        self.contexts += 1
+
+    def _context_checked_out(self, context: object) -> None:
+        self._context_uses += 1
+        self._open_pages[context] += 1
+
+    def _context_released(self, context: object, *, current: bool) -> bool:
+        """Record a closed page.
+
+        Returns:
+            True when *context* has no open pages left and will serve no more,
+            so the caller should close it.
+
+        """
+        if context not in self._open_pages:
+            return False  # Belonged to a browser that has since been relaunched
+        self._open_pages[context] -= 1
+        if self._open_pages[context] or (current and not self._context_used_up()):
+            return False
+        del self._open_pages[context]
+        return True
+
+    def log_stats(self) -> None:
+        """Log browser launches, contexts and pages for this run."""
+        logger.info(
+            "Browser pool: %d launches, %d contexts, %d pages (max %d open), %d requests blocked, %d allowed",
+            self.launches,
+            self.contexts,
+            self.pages,
+            self._max_pages,
+            self.blocked_requests,
+            self.allowed_requests,
+        )
+
+
+class BrowserPool(_PoolAccounting):
+    """One headless Chromium per run, handing out pages in recycled contexts.
+
+    The browser is launched on the first page() and closed by close() or on
+    leaving a with block, and relaunched if it crashes. Each context serves at
+    most *pages_per_context* pages and is closed once its last page is done.
+    At most *max_pages* pages are open at once. Requests the *resource_policy*
+    rejects are aborted before they leave the browser.
+
+    Playwright's sync API is bound to the thread that started it, so a pool
+    must be used from a single thread. Use AsyncBrowserPool to fetch several
+    pages concurrently.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_pages: int = DEFAULT_MAX_PAGES,
+        pages_per_context: int = DEFAULT_PAGES_PER_CONTEXT,
+        headless: bool = True,
+        resource_policy: ResourcePolicy | None = DEFAULT_RESOURCE_POLICY,
+    ) -> None:
+        """Configure the pool; nothing is launched until the first page is requested."""
+        super().__init__(
+            max_pages=max_pages,
+            pages_per_context=pages_per_context,
+            headless=headless,
+            resource_policy=resource_policy,
+        )
+        self._open_count: int = 0
+        self._playwright: Playwright | None = None
+        self._browser: Browser | None = None
+        self._context: BrowserContext | None = None
+
+    def __enter__(self) -> Self:
+        """Return the pool; the browser is launched lazily.
+
+        Returns:
+            This pool.
+
+        """
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Close the browser and stop Playwright."""
+        self.close()
+
+    def _ensure_browser(self) -> Browser:
+        if self._browser is not None and self._browser.is_connected():
+            return self._browser
+        if self._browser is not None:
+            logger.warning("Browser disconnected; relaunching")
+            self._context = None
+            self._open_pages.clear()
+        if self._playwright is None:
+            self._playwright = sync_playwright().start()
+        self._browser = self._playwright.chromium.launch(headless=self._headless)
+        self.launches += 1
+        return self._browser
+
+    def _checkout_context(self) -> BrowserContext:
+        browser = self._ensure_browser()
+        if self._context is None or self._context_used_up():
+            self._context = browser.new_context()
+            if self._resource_policy is not None:
+                self._context.route("**/*", self._route)
+            self._context_opened(self._context)
+        self._context_checked_out(self._context)
+        return self._context
+
+    def _route(self, route: Route) -> None:
+        if self._should_abort(route.request.resource_type, route.request.url):
+            route.abort()
+        else:
+            route.continue_()
+
+    def _checkin_context(self, context: BrowserContext) -> None:
+        if not self._context_released(context, current=context is self._context):
+            return
+        if context is self._context:
+            self._context = None
+        try:
+            context.close()
+        except PlaywrightError:
+            logger.debug("Context already closed", exc_info=True)
+
+    @contextmanager
+    def page(self) -> Generator[Page]:
+        """Open a page in a pooled context.
+
+        The pool is used from one thread, so nothing could ever close a page
+        for a caller waiting on a full pool; opening one past *max_pages* is
+        an error instead.
+
+        Yields:
+            A new page, closed on exit.
+
+        Raises:
+            RuntimeError: If *max_pages* pages are already open.
+
+        """
+        if self._open_count >= self._max_pages:
+            msg = f"BrowserPool already has {self._max_pages} open pages; close one before opening another"
+            raise RuntimeError(msg)
+        self._open_count += 1
+        try:
+            context = self._checkout_context()
+            try:
+                page = context.new_page()
+                self.pages += 1
+                try:
+                    yield page
+                finally:
+                    try:
+                        page.close()
+                    except PlaywrightError:
+                        logger.debug("Page already closed", exc_info=True)
+            finally:
+                self._checkin_context(context)
+        finally:
+            self._open_count -= 1
+
+    def close(self) -> None:
+        """Close every context and the browser, and stop Playwright."""
+        self._context = None
+        self._open_pages.clear()
+        if self._browser is not None:
+            try:
+                self._browser.close()
+            except PlaywrightError:
+                logger.debug("Browser already closed", exc_info=True)
+            self._browser = None
+        if self._playwright is not None:
+            self._playwright.stop()
+            self._playwright = None
+
+
+class AsyncBrowserPool(_PoolAccounting):
+    """Async counterpart of BrowserPool for fetching pages concurrently.
+
+    Same launch, recycling and page-cap behaviour; callers waiting for one of
+    the *max_pages* slots yield to the event loop instead of blocking it.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_pages: int = DEFAULT_MAX_PAGES,
+        pages_per_context: int = DEFAULT_PAGES_PER_CONTEXT,
+        headless: bool = True,
+        resource_policy: ResourcePolicy | None = DEFAULT_RESOURCE_POLICY,
+    ) -> None:
+        """Configure the pool; nothing is launched until the first page is requested."""
+        super().__init__(
+            max_pages=max_pages,
+            pages_per_context=pages_per_context,
+            headless=headless,
+            resource_policy=resource_policy,
+        )
+        self._slots: asyncio.Semaphore = asyncio.Semaphore(max_pages)
+        # Serialises launches and context creation between concurrent page() calls
+        self._lock: asyncio.Lock = asyncio.Lock()
+        self._playwright: AsyncPlaywright | None = None
+        self._browser: AsyncBrowser | None = None
+        self._context: AsyncBrowserContext | None = None
+
+    async def __aenter__(self) -> Self:
+        """Return the pool; the browser is launched lazily.
+
+        Returns:
+            This pool.
+
+        """
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Close the browser and stop Playwright."""
+        await self.close()
+
+    async def _ensure_browser(self) -> AsyncBrowser:
+        if self._browser is not None and self._browser.is_connected():
+            return self._browser
+        if self._browser is not None:
+            logger.warning("Browser disconnected; relaunching")
+            self._context = None
+            self._open_pages.clear()
+        if self._playwright is None:
+            self._playwright = await async_playwright().start()
+        self._browser = await self._playwright.chromium.launch(headless=self._headless)
+        self.launches += 1
+        return self._browser
+
+    async def _checkout_context(self) -> AsyncBrowserContext:
+        async with self._lock:
+            browser = await self._ensure_browser()
+            if self._context is None or self._context_used_up():
+                self._context = await browser.new_context()
+                if self._resource_policy is not None:
+                    await self._context.route("**/*", self._route)
+                self._context_opened(self._context)
+            self._context_checked_out(self._context)
+            return self._context
+
+    async def _route(self, route: AsyncRoute) -> None:
+        if self._should_abort(route.request.resource_type, route.request.url):
+            await route.abort()
+        else:
+            await route.continue_()
+
+    async def _checkin_context(self, context: AsyncBrowserContext) -> None:
+        if not self._context_released(context, current=context is self._context):
+            return
+        if context is self._context:
+            self._context = None
+        try:
+            await context.close()
+        except PlaywrightError:
+            logger.debug("Context already closed", exc_info=True)
+
+    @asynccontextmanager
+    async def page(self) -> AsyncGenerator[AsyncPage]:
+        """Open a page in a pooled context, waiting while *max_pages* pages are already open.
+
+        Yields:
+            A new page, closed on exit.
+
+        """
+        async with self._slots:
+            context = await self._checkout_context()
+            try:
+                page = await context.new_page()
+                self.pages += 1
+                try:
+                    yield page
+                finally:
+                    try:
+                        await page.close()
+                    except PlaywrightError:
+                        logger.debug("Page already closed", exc_info=True)
+            finally:
+                await self._checkin_context(context)
+
+    async def close(self) -> None:
+        """Close every context and the browser, and stop Playwright."""
+        self._context = None
+        self._open_pages.clear()
+        if self._browser is not None:
+            try:
+                await self._browser.close()
+            except PlaywrightError:
+                logger.debug("Browser already closed", exc_info=True)
+            self._browser = None
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
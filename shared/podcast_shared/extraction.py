@@ -0,0 +1,55 @@
+"""Single-pass article extraction with trafilatura.
+
+``bare_extraction`` followed by ``extract`` parses and cleans the same HTML
+twice. One ``bare_extraction`` call already yields the metadata and the main
+text, so callers get both from a single parse. Requires the ``extraction``
+extra (trafilatura).
+"""
+
+import unicodedata
+from typing import TypedDict
+
+from trafilatura import bare_extraction
+
+# Document fields holding the extracted content rather than metadata about the page.
+_CONTENT_FIELDS = frozenset({"body", "commentsbody", "text", "raw_text", "comments"})
+
+
+class Extraction(TypedDict):
+    """Title, metadata and main text of one page."""
+
+    title: str
+    text: str
+    metadata: dict[str, object]
+
+
+def extract_article(html: str, *, favor_recall: bool = True, include_comments: bool = False) -> Extraction | None:
+    """Extract an article's title, metadata and text from one parse of *html*.
+
+    The text is what ``trafilatura.extract(html, favor_recall=...,
+    include_comments=...)`` returns for the same settings, NFC-normalized the
+    same way.
+
+    Returns:
+        The extraction, or None when trafilatura finds no document.
+
+    """
+    document: object | None = bare_extraction(
+        html,
+        with_metadata=True,
+        favor_recall=favor_recall,
+        include_comments=include_comments,
+    )
+    if document is None:
+        return None
+    as_dict_fn = getattr(document, "as_dict", None)
+    raw: object = as_dict_fn() if callable(as_dict_fn) else None
+    fields: dict[str, object] = dict(raw) if isinstance(raw, dict) else {}  # pyright: ignore[reportUnknownArgumentType]
+    text = str(fields.get("text") or "")
+    if include_comments:
+        text = f"{text}\n{fields.get('comments') or ''}".strip()
+    return {
+        "title": str(fields.get("title") or ""),
+        "text": unicodedata.normalize("NFC", text),
+        "metadata": {key: value for key, value in fields.items() if key not in _CONTENT_FIELDS},
+    }
@@ -0,0 +1,167 @@
+"""HTTP-first page fetching, with per-tier hit rates and latency.
+
+Most article pages are static, so a plain GET plus trafilatura extracts them in
+milliseconds. Callers try that tier first, score the extraction, and escalate
+to the local scraper behind headless Chromium only when the score is low.
+"""
+
+import functools
+import json
+import logging
+import pathlib
+import re
+import threading
+from datetime import UTC, datetime
+
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+HTTP_TIMEOUT_SECONDS = 20
+HTTP_POOL_SIZE = 8
+HTTP_USER_AGENT = (
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/130.0.0.0 Safari/537.36"
+)
+
+# An extraction scoring below this escalates to the browser tier.
+MIN_EXTRACTION_SCORE = 0.85
+# Body length at which the length component of the score saturates.
+FULL_ARTICLE_CHARS = 1500
+# A missing title costs less than a short body: untitled full-length articles still pass.
+UNTITLED_SCORE_FACTOR = 0.9
+# Markup soft paywalls and registration walls leave on the teaser they serve
+# instead of the article: schema.org's isAccessibleForFree flag, or a wall's class.
+PAYWALL_MARKER_RE = re.compile(
+    r"""["']isAccessibleForFree["']\s*:\s*["']?false"""
+    r"""|class=["'][^"']*\b(?:paywall|regwall|piano-offer|subscriber-only)\b""",
+    re.IGNORECASE,
+)
+
+
+@functools.cache
+def get_http_session() -> requests.Session:
+    """Return the shared keep-alive HTTP session, creating it on first call.
+
+    Returns:
+        A requests session whose connection pool holds HTTP_POOL_SIZE
+        connections per host. Safe to share between threads.
+
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers["User-Agent"] = HTTP_USER_AGENT
+    return session
+
+
+def fetch_html(url: str, timeout: float = HTTP_TIMEOUT_SECONDS) -> str | None:
+    """GET *url* with the shared session.
+
+    Returns:
+        The decoded body of a successful HTML response, or None on a network
+        error, an error status or a non-HTML content type.
+
+    """
+    try:
+        response = get_http_session().get(url, timeout=timeout)
+    except requests.RequestException as exc:
+        logger.info("HTTP fetch of %s failed: %s", url, exc)
+        return None
+    if not response.ok:
+        logger.info("HTTP fetch of %s returned %d", url, response.status_code)
+        return None
+    content_type = response.headers.get("Content-Type", "")
+    if "html" not in content_type:
+        logger.info("HTTP fetch of %s returned %s, not HTML", url, content_type or "no content type")
+        return None
+    try:
+        return response.text
+    except (requests.RequestException, LookupError) as exc:
+        logger.info("HTTP fetch of %s could not be decoded: %s", url, exc)
+        return None
+
+
+def score_extraction(title: str, text: str, required_phrases: tuple[str, ...] = (), html: str = "") -> float:
+    """Score how completely an extraction captured an article, from 0 to 1.
+
+    The score is the body length as a fraction of FULL_ARTICLE_CHARS, scaled
+    by UNTITLED_SCORE_FACTOR when there is no title. The article is taken to
+    be truncated, and scores 0, when none of *required_phrases* appears in
+    *text* or, if no phrases are given, when the page *html* carries paywall
+    markup. Phrases known to end the full article outrank the markup, which
+    some sites keep on pages that do serve the whole text.
+
+    Returns:
+        The score; MIN_EXTRACTION_SCORE and above counts as complete.
+
+    """
+    if required_phrases:
+        if all(phrase not in text for phrase in required_phrases):
+            return 0.0
+    elif PAYWALL_MARKER_RE.search(html):
+        return 0.0
+    length_score = min(len(text.strip()) / FULL_ARTICLE_CHARS, 1.0)
+    return length_score if title.strip() else length_score * UNTITLED_SCORE_FACTOR
+
+
+class FetchTierStats:
+    """Attempts, hits and latency per fetch tier. Safe to share between threads."""
+
+    def __init__(self) -> None:
+        """Start with no attempts recorded."""
+        self._lock: threading.Lock = threading.Lock()
+        # tier -> [attempts, hits, seconds], in the order tiers were first tried
+        self._tiers: dict[str, list[float]] = {}
+
+    def record(self, tier: str, *, hit: bool, seconds: float) -> None:
+        """Record one attempt at *tier* and whether it produced a usable page."""
+        with self._lock:
+            counters = self._tiers.setdefault(tier, [0, 0, 0.0])
+            counters[0] += 1
+            counters[1] += hit
+            counters[2] += seconds
+
+    def _snapshot(self) -> dict[str, tuple[float, ...]]:
+        with self._lock:
+            return {tier: tuple(counters) for tier, counters in self._tiers.items()}
+
+    def append_log(self, directory: str | pathlib.Path, source: str) -> None:
+        """Append this run's counters to today's JSON Lines log in *directory*.
+
+        Each run adds one line with its time, *source* and the attempts, hits
+        and seconds of every tier tried. A failed write is logged, not raised.
+        """
+        tiers = self._snapshot()
+        if not tiers:
+            return
+        now = datetime.now(tz=UTC)
+        record = {
+            "time": now.isoformat(timespec="seconds"),
+            "source": source,
+            "tiers": {
+                tier: {"attempts": int(attempts), "hits": int(hits), "seconds": round(seconds, 3)}
+                for tier, (attempts, hits, seconds) in tiers.items()
+            },
+        }
+        log_path = pathlib.Path(directory) / f"{now.date().isoformat()}.jsonl"
+        try:
+            log_path.parent.mkdir(parents=True, exist_ok=True)
+            with log_path.open("a", encoding="utf-8") as f:
+                _ = f.write(json.dumps(record) + "\n")
+        except OSError as exc:
+            logger.warning("Could not write fetch tier stats to %s: %s", log_path, exc)
+
+    def log_stats(self) -> None:
+        """Log the hit rate and average latency of every tier tried so far."""
+        tiers = self._snapshot()
+        for tier, (attempts, hits, seconds) in tiers.items():
+            logger.info(
+                "Fetch tier %s: %d/%d hits (%.0f%%), %.2fs avg latency",
+                tier,
+                hits,
+                attempts,
+                100 * hits / attempts,
+                seconds / attempts,
+            )
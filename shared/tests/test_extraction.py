@@ -0,0 +1,91 @@
+"""Tests for podcast_shared.extraction."""
+
+import unicodedata
+
+import pytest
+
+trafilatura = pytest.importorskip("trafilatura")
+extraction = pytest.importorskip("podcast_shared.extraction")
+
+PARAGRAPH = (
+    "The city council voted on Tuesday to extend the riverside bike path by four miles, "
+    "connecting the northern neighborhoods to downtown for the first time. "
+)
+
+SAMPLE_PAGE = f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+  <meta charset="utf-8">
+  <title>Council Extends Bike Path | The Riverside Gazette</title>
+  <meta property="og:title" content="Council Extends Riverside Bike Path">
+  <meta property="og:site_name" content="The Riverside Gazette">
+  <meta name="author" content="Jane Reporter">
+  <meta name="description" content="The path will reach downtown by next summer.">
+  <meta property="article:published_time" content="2024-05-14T09:30:00Z">
+  <link rel="canonical" href="https://gazette.example.com/news/bike-path">
+</head>
+<body>
+  <nav><a href="/">Home</a> <a href="/news">News</a> <a href="/sports">Sports</a></nav>
+  <article>
+    <h1>Council Extends Riverside Bike Path</h1>
+    <p class="byline">By Jane Reporter</p>
+    {"".join(f"<p>{PARAGRAPH * 3}Café owners along the route expect more visitors.</p>" for _ in range(8))}
+  </article>
+  <section id="comments">
+    <div class="comment"><p>Finally! I have been waiting years for this to happen downtown.</p></div>
+  </section>
+  <footer><p>Copyright 2024 The Riverside Gazette. All rights reserved.</p></footer>
+</body>
+</html>
+"""
+
+# No head metadata: the title has to come from the page body
+BARE_PAGE = f"""<html><body>
+<div class="post"><h1>Notes From the Bike Path Hearing</h1>
+{"".join(f"<p>{PARAGRAPH * 2}</p><div><span>Related: council budget</span></div>" for _ in range(6))}
+</div></body></html>
+"""
+
+# Document fields holding content rather than metadata
+CONTENT_FIELDS = {"body", "commentsbody", "text", "raw_text", "comments"}
+
+
+def two_pass(html: str, *, include_comments: bool = False) -> tuple[str, dict[str, object], str]:
+    """Extract the way parse_email did before extract_article.
+
+    The title came from a default ``bare_extraction`` and the text from a
+    separate ``extract`` favoring recall.
+
+    Returns:
+        ``(title, metadata, text)``.
+
+    """
+    document = trafilatura.bare_extraction(html, with_metadata=True)
+    fields: dict[str, object] = document.as_dict()
+    metadata = {key: value for key, value in fields.items() if key not in CONTENT_FIELDS}
+    text = trafilatura.extract(html, include_comments=include_comments, favor_recall=True) or ""
+    return str(fields["title"] or ""), metadata, unicodedata.normalize("NFC", text)
+
+
+@pytest.mark.parametrize("include_comments", [False, True])
+@pytest.mark.parametrize(
+    ("html", "expected_title"),
+    [
+        pytest.param(SAMPLE_PAGE, "Council Extends Riverside Bike Path", id="head metadata"),
+        pytest.param(BARE_PAGE, "Notes From the Bike Path Hearing", id="bare page"),
+    ],
+)
+def test_extract_article_matches_two_pass_extraction(html: str, expected_title: str, *, include_comments: bool) -> None:
+    """One parse gives the same title, metadata and text as the two separate passes."""
+    title, metadata, text = two_pass(html, include_comments=include_comments)
+    article = extraction.extract_article(html, include_comments=include_comments)
+    assert article is not None
+    assert article["title"] == title == expected_title
+    assert article["metadata"] == metadata
+    assert article["text"] == text
+    assert PARAGRAPH.strip() in article["text"]
+
+
+def test_extract_article_returns_none_without_a_document() -> None:
+    """Pages trafilatura cannot parse give None rather than an empty extraction."""
+    assert extraction.extract_article("") is None
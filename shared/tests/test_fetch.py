@@ -0,0 +1,65 @@
+"""Tests for podcast_shared.fetch."""
+
+import json
+import pathlib
+
+import pytest
+
+from podcast_shared.fetch import FULL_ARTICLE_CHARS, MIN_EXTRACTION_SCORE, FetchTierStats, score_extraction
+
+ARTICLE = "x" * FULL_ARTICLE_CHARS
+TEASER = "x" * 1180
+PAYWALLED_PAGES = (
+    '<script type="application/ld+json">{"isAccessibleForFree": false}</script>',
+    '<script type="application/ld+json">{"isAccessibleForFree":"False"}</script>',
+    '<div class="article-body paywall">',
+)
+
+
+@pytest.mark.parametrize(
+    ("title", "text", "complete"),
+    [
+        pytest.param("Title", ARTICLE, True, id="full article"),
+        pytest.param("", ARTICLE, True, id="untitled full article"),
+        pytest.param("Title", TEASER, False, id="titled teaser"),
+        pytest.param("Title", "", False, id="empty"),
+    ],
+)
+def test_score_extraction_by_length_and_title(title: str, text: str, *, complete: bool) -> None:
+    """Full-length bodies pass with or without a title; teaser-length bodies escalate."""
+    assert (score_extraction(title, text) >= MIN_EXTRACTION_SCORE) is complete
+
+
+@pytest.mark.parametrize("html", PAYWALLED_PAGES)
+def test_paywall_markup_scores_zero(html: str) -> None:
+    """A page marked as paywalled is a teaser, however long its text."""
+    assert not score_extraction("Title", ARTICLE, html=html)
+
+
+def test_required_phrases_outrank_paywall_markup() -> None:
+    """A page carrying the paywall flag but ending in a known phrase is complete."""
+    html = PAYWALLED_PAGES[0]
+    assert (
+        score_extraction("Title", f"{ARTICLE} About the author.", ("About the author",), html) >= MIN_EXTRACTION_SCORE
+    )
+    assert not score_extraction("Title", ARTICLE, ("About the author",), html)
+
+
+def test_append_log_writes_one_line_per_run(tmp_path: pathlib.Path) -> None:
+    """Each run appends its per-tier attempts, hits and seconds."""
+    stats = FetchTierStats()
+    stats.append_log(tmp_path, "test")
+    assert not list(tmp_path.iterdir())
+    stats.record("http", hit=True, seconds=0.5)
+    stats.record("http", hit=False, seconds=0.25)
+    stats.record("browser", hit=True, seconds=2.0)
+    stats.append_log(tmp_path, "test")
+    stats.append_log(tmp_path, "test")
+    (log_path,) = tmp_path.iterdir()
+    lines = [json.loads(line) for line in log_path.read_text(encoding="utf-8").splitlines()]
+    assert len(lines) == 2
+    assert lines[0]["source"] == "test"
+    assert lines[0]["tiers"] == {
+        "http": {"attempts": 2, "hits": 1, "seconds": 0.75},
+        "browser": {"attempts": 1, "hits": 1, "seconds": 2.0},
+    }
@@ -0,0 +1,219 @@
+"""Tests for podcast_shared."""
+
+import os
+import pathlib
+import time
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, cast
+
+import pytest
+from google.genai import errors as genai_errors
+from google.genai import types
+
+import podcast_shared
+from podcast_shared import GEMINI_MAX_ATTEMPTS, DiskCache, RateLimitedGemini
+
+if TYPE_CHECKING:
+    from google import genai
+
+# ---------------------------------------------------------------------------
+# Disk cache
+# ---------------------------------------------------------------------------
+
+
+def _age(path: pathlib.Path, seconds: float) -> None:
+    mtime = time.time() - seconds
+    os.utime(path, (mtime, mtime))
+
+
+def test_disk_cache_hit_and_miss(tmp_path: pathlib.Path) -> None:
+    """A stored entry is returned and counted as a hit; unknown keys are misses."""
+    cache = DiskCache(tmp_path, name="Test", suffix=".bin")
+    assert cache.get("missing") is None
+    cache.put("key", b"data")
+    assert cache.get("key") == b"data"
+    assert cache.path_for("key") == tmp_path / "key.bin"
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_disk_cache_drops_expired_entries(tmp_path: pathlib.Path) -> None:
+    """An entry older than max_age_seconds is a miss and is removed."""
+    cache = DiskCache(tmp_path, name="Test", max_age_seconds=60)
+    cache.put("key", b"data")
+    _age(cache.path_for("key"), 120)
+    assert cache.get("key") is None
+    assert not cache.path_for("key").exists()
+
+
+def test_make_key_is_stable_and_unambiguous() -> None:
+    """Keys depend only on the parts, and parts cannot run together."""
+    assert DiskCache.make_key("a", "b") == DiskCache.make_key("a", "b")
+    assert DiskCache.make_key("a", "b") != DiskCache.make_key("ab", "")
+    assert DiskCache.make_key("a", "b") != DiskCache.make_key("b", "a")
+    assert DiskCache.make_key("text") == "4813a02e1026a65e88f6bd3c1bf73f25c1b4ea48c2e81b619d4b9ad883d321be"
+
+
+def test_evict_removes_least_recently_used_first(tmp_path: pathlib.Path) -> None:
+    """Eviction drops the oldest entries until under max_bytes, and a hit makes an entry young again."""
+    cache = DiskCache(tmp_path, name="Test", max_bytes=20)
+    for idx, key in enumerate(("first", "second", "third")):
+        cache.put(key, b"x" * 10)
+        _age(cache.path_for(key), 300 - idx * 100)
+    assert cache.get("first") == b"x" * 10
+    cache.evict()
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["first", "third"]
+
+
+def test_hits_do_not_refresh_without_refresh_on_hit(tmp_path: pathlib.Path) -> None:
+    """Without refresh_on_hit, a hit leaves the entry's age alone, so it still expires on time."""
+    cache = DiskCache(tmp_path, name="Test", max_age_seconds=60, refresh_on_hit=False)
+    cache.put("old", b"data")
+    cache.put("new", b"data")
+    _age(cache.path_for("old"), 50)
+    assert cache.get("old") == b"data"
+    assert time.time() - cache.path_for("old").stat().st_mtime >= 50
+    _age(cache.path_for("old"), 120)
+    cache.evict()
+    assert [path.name for path in tmp_path.iterdir()] == ["new"]
+
+
+# ---------------------------------------------------------------------------
+# Rate-limited Gemini
+# ---------------------------------------------------------------------------
+
+
+class FakeModels:
+    """Stands in for ``client.models``, raising queued errors before answering."""
+
+    def __init__(self, errors: list[Exception], text: str = "") -> None:
+        """Raise *errors* in order, then answer with *text*."""
+        self.errors: list[Exception] = errors
+        self.text: str = text
+        self.calls: int = 0
+
+    def generate_content(self, **_: object) -> types.GenerateContentResponse:
+        """Raise the next queued error, or return a canned response.
+
+        Returns:
+            A response with usage metadata.
+
+        """
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return types.GenerateContentResponse(
+            candidates=[types.Candidate(content=types.Content(parts=[types.Part(text=self.text)]))],
+            usage_metadata=types.GenerateContentResponseUsageMetadata(prompt_token_count=3, candidates_token_count=2),
+        )
+
+
+def _gemini(errors: list[Exception], text: str = "") -> tuple[RateLimitedGemini, FakeModels]:
+    models = FakeModels(errors, text)
+    client = cast("genai.Client", SimpleNamespace(models=models))
+    return RateLimitedGemini(client, requests_per_minute=6000, retry_base_seconds=0), models
+
+
+@pytest.mark.parametrize(
+    "error",
+    [
+        pytest.param(genai_errors.ClientError(429, {}), id="429"),
+        pytest.param(genai_errors.ServerError(500, {}), id="500"),
+        pytest.param(genai_errors.ServerError(503, {}), id="503"),
+    ],
+)
+def test_gemini_retries_rate_limits_and_server_errors(error: genai_errors.APIError) -> None:
+    """429 and 5xx responses are retried, and counted, until a call succeeds."""
+    gemini, models = _gemini([error, error])
+    response = gemini.generate_content(model="model", contents="prompt")
+    assert response.usage_metadata is not None
+    assert models.calls == 3
+    assert (gemini.requests, gemini.retries, gemini.failures) == (3, 2, 2)
+    assert (gemini.prompt_tokens, gemini.output_tokens) == (3, 2)
+
+
+@pytest.mark.parametrize("code", [400, 403, 404])
+def test_gemini_does_not_retry_client_errors(code: int) -> None:
+    """Other 4xx responses propagate on the first attempt."""
+    gemini, models = _gemini([genai_errors.ClientError(code, {})])
+    with pytest.raises(genai_errors.ClientError):
+        _ = gemini.generate_content(model="model", contents="prompt")
+    assert models.calls == 1
+    assert (gemini.retries, gemini.failures) == (0, 1)
+
+
+def test_gemini_gives_up_after_max_attempts() -> None:
+    """A persistent 5xx propagates once max_attempts calls have failed."""
+    gemini, models = _gemini([genai_errors.ServerError(503, {}) for _ in range(GEMINI_MAX_ATTEMPTS)])
+    with pytest.raises(genai_errors.ServerError):
+        _ = gemini.generate_content(model="model", contents="prompt")
+    assert models.calls == GEMINI_MAX_ATTEMPTS
+
+
+def test_log_gemini_stats_does_not_create_the_client(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Runs that never called Gemini can log stats without an API key."""
+    monkeypatch.delenv("GEMINI_API_KEY", raising=False)
+    monkeypatch.setattr(podcast_shared, "_gemini", None)
+    podcast_shared.log_gemini_stats()
+    assert podcast_shared._gemini is None  # noqa: SLF001
+
+
+# ---------------------------------------------------------------------------
+# Summary cache
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture
+def summary_models(tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch) -> FakeModels:
+    """Point the summary cache at *tmp_path* and generate_summary at a fake Gemini.
+
+    Returns:
+        The fake ``client.models``, for counting calls.
+
+    """
+    gemini, models = _gemini([], text="  A short summary.  ")
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    monkeypatch.setattr(podcast_shared, "_summary_cache", None)
+    monkeypatch.setattr(podcast_shared, "_gemini", gemini)
+    return models
+
+
+def test_summary_cache_hit_skips_gemini(summary_models: FakeModels, tmp_path: pathlib.Path) -> None:
+    """A repeat summary of the same article is served from the cache directory."""
+    assert podcast_shared.generate_summary("Article text.", "Title") == "A short summary."
+    assert podcast_shared.generate_summary("Article text.", "Title") == "A short summary."
+    assert summary_models.calls == 1
+    entries = list((tmp_path / "podcast-transcribe" / podcast_shared.SUMMARY_CACHE_SUBDIR).iterdir())
+    assert [entry.suffix for entry in entries] == [".txt"]
+
+
+def test_summary_cache_key_covers_prompt_and_version(
+    summary_models: FakeModels, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """A different title, article or prompt version is a different entry."""
+    _ = podcast_shared.generate_summary("Article text.", "Title")
+    _ = podcast_shared.generate_summary("Article text.", "Other title")
+    _ = podcast_shared.generate_summary("Other text.", "Title")
+    assert summary_models.calls == 3
+    monkeypatch.setattr(podcast_shared, "SUMMARY_PROMPT_VERSION", "test")
+    _ = podcast_shared.generate_summary("Article text.", "Title")
+    assert summary_models.calls == 4
+
+
+def test_summary_cache_entries_expire(summary_models: FakeModels) -> None:
+    """Entries expire SUMMARY_CACHE_MAX_AGE_SECONDS after they were written, however often they are hit."""
+    _ = podcast_shared.generate_summary("Article text.", "Title")
+    (entry,) = podcast_shared.get_summary_cache().directory.iterdir()
+    _age(entry, podcast_shared.SUMMARY_CACHE_MAX_AGE_SECONDS - 60)
+    _ = podcast_shared.generate_summary("Article text.", "Title")
+    assert summary_models.calls == 1
+    _age(entry, podcast_shared.SUMMARY_CACHE_MAX_AGE_SECONDS + 60)
+    _ = podcast_shared.generate_summary("Article text.", "Title")
+    assert summary_models.calls == 2
+
+
+def test_failed_summaries_are_not_cached(summary_models: FakeModels) -> None:
+    """A failed call returns an empty summary and the next run tries again."""
+    summary_models.errors.append(genai_errors.ClientError(400, {}))
+    assert not podcast_shared.generate_summary("Article text.", "Title")
+    assert podcast_shared.generate_summary("Article text.", "Title") == "A short summary."
+    assert summary_models.calls == 2
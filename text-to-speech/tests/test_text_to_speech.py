@@ -0,0 +1,341 @@
+"""Tests for text_to_speech."""
+
+import importlib
+import pathlib
+import threading
+import time
+import zlib
+from collections.abc import Callable
+from types import SimpleNamespace
+
+import pytest
+
+import text_to_speech
+from text_to_speech import (
+    LAME_TAG_SIZE,
+    LameTag,
+    SynthesisBudget,
+    build_info_frame,
+    collect_orphaned_segments,
+    concat_mp3,
+    find_chunk_boundaries,
+    job_manifest_path,
+    load_job_manifest,
+    parse_mp3_frame_header,
+    save_job_manifest,
+    split_mp3_frames,
+    start_or_resume_job,
+)
+
+
+def test_module_imports() -> None:
+    """Annotations must not be evaluated at import time."""
+    _ = importlib.reload(text_to_speech)
+
+
+def test_budget_limits_concurrent_requests() -> None:
+    """No more than max_in_flight requests hold a slot at once."""
+    budget = SynthesisBudget(max_in_flight=2, requests_per_minute=60_000)
+    lock = threading.Lock()
+    in_flight = 0
+    peak = 0
+
+    def request() -> None:
+        nonlocal in_flight, peak
+        with budget.slot():
+            with lock:
+                in_flight += 1
+                peak = max(peak, in_flight)
+            time.sleep(0.02)
+            with lock:
+                in_flight -= 1
+
+    threads = [threading.Thread(target=request) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert peak == 2
+    assert budget.requests == 6
+    assert budget.request_seconds >= 6 * 0.02
+
+
+def _fail() -> None:
+    raise RuntimeError
+
+
+def test_budget_counts_failed_requests_and_frees_slot() -> None:
+    """A request that raises still counts and gives its slot back."""
+    budget = SynthesisBudget(max_in_flight=1, requests_per_minute=60_000)
+    with pytest.raises(RuntimeError), budget.slot():
+        _fail()
+
+    with budget.slot():
+        pass
+
+    assert budget.requests == 2
+
+
+# ---------------------------------------------------------------------------
+# Frame-level MP3 concatenation
+# ---------------------------------------------------------------------------
+
+# MPEG-2 Layer III, no CRC, 32 kbps, 24 kHz, mono: the shape of Cloud TTS output.
+MPEG2_HEADER = bytes((0xFF, 0xF3, 0x44, 0xC0))
+MPEG2_FRAME_LENGTH = 96
+# Same, but 22.05 kHz.
+MPEG2_22K_HEADER = bytes((0xFF, 0xF3, 0x40, 0xC0))
+
+
+def _frames(count: int, header: bytes = MPEG2_HEADER, first_fill: int = 0) -> list[bytes]:
+    length = parse_mp3_frame_header(header)["frame_length"]  # pyright: ignore[reportOptionalSubscript]
+    return [header + bytes([first_fill + idx]) * (length - 4) for idx in range(count)]
+
+
+def _lame_tag(delay: int, padding: int) -> LameTag:
+    raw = b"LAME3.100" + bytes(LAME_TAG_SIZE - 9)
+    return {"raw": raw, "quality": 50, "encoder_delay": delay, "encoder_padding": padding}
+
+
+def _segment(frames: list[bytes], lame_tag: LameTag | None = None) -> bytes:
+    header = parse_mp3_frame_header(frames[0])
+    assert header is not None
+    info = build_info_frame(header, frames[0][:4], [memoryview(frame) for frame in frames], lame_tag)
+    return info + b"".join(frames)
+
+
+def _info_counts(stream: bytes) -> tuple[bytes, int, int]:
+    header = parse_mp3_frame_header(stream)
+    assert header is not None
+    offset = header["side_info_end"]
+    tag = stream[offset : offset + 4]
+    frame_count = int.from_bytes(stream[offset + 8 : offset + 12], "big")
+    byte_count = int.from_bytes(stream[offset + 12 : offset + 16], "big")
+    return tag, frame_count, byte_count
+
+
+def test_parse_mp3_frame_header() -> None:
+    """Header fields are decoded, and non-Layer III bytes are rejected."""
+    header = parse_mp3_frame_header(MPEG2_HEADER)
+    assert header is not None
+    assert header["sample_rate"] == 24000
+    assert header["bitrate_kbps"] == 32
+    assert header["mono"]
+    assert header["frame_length"] == MPEG2_FRAME_LENGTH
+    assert header["samples_per_frame"] == 576
+    assert parse_mp3_frame_header(b"ID3\x04") is None
+
+
+def test_split_mp3_frames_strips_tags() -> None:
+    """ID3v2 and ID3v1 tags around the frames are dropped."""
+    frames = _frames(3)
+    id3v2 = b"ID3\x04\x00\x00\x00\x00\x00\x05" + bytes(5)
+    id3v1 = b"TAG" + bytes(125)
+    first, split, lame_tag = split_mp3_frames(id3v2 + b"".join(frames) + id3v1)
+    assert first["sample_rate"] == 24000
+    assert [bytes(frame) for frame in split] == frames
+    assert lame_tag is None
+
+
+def test_split_mp3_frames_drops_info_frame() -> None:
+    """A leading Xing/Info frame is dropped and its LAME tag returned."""
+    frames = _frames(4)
+    _, split, lame_tag = split_mp3_frames(_segment(frames, _lame_tag(576, 300)))
+    assert [bytes(frame) for frame in split] == frames
+    assert lame_tag is not None
+    assert (lame_tag["encoder_delay"], lame_tag["encoder_padding"]) == (576, 300)
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        pytest.param(b"", id="empty"),
+        pytest.param(b"".join(_frames(2)) + b"junk", id="trailing garbage"),
+        pytest.param(b"".join(_frames(2))[:-1], id="truncated"),
+        pytest.param(b"".join(_frames(1) + _frames(1, MPEG2_22K_HEADER)), id="sample rate change"),
+    ],
+)
+def test_split_mp3_frames_rejects_malformed_streams(data: bytes) -> None:
+    """Anything other than a clean run of matching Layer III frames raises."""
+    with pytest.raises(ValueError, match=r"frame|sample rate"):
+        _ = split_mp3_frames(data)
+
+
+def test_concat_mp3_joins_frames_under_one_info_frame() -> None:
+    """The joined stream is one Info frame whose counts cover every audio frame."""
+    first, second = _frames(2), _frames(3, first_fill=2)
+    joined = concat_mp3([_segment(first, _lame_tag(576, 100)), _segment(second, _lame_tag(576, 200))])
+
+    tag, frame_count, byte_count = _info_counts(joined)
+    assert tag == b"Info"
+    assert frame_count == 5
+    assert byte_count == len(joined)
+    _, split, lame_tag = split_mp3_frames(joined)
+    assert [bytes(frame) for frame in split] == first + second
+    assert lame_tag is not None
+    # Delay from the first chunk, padding from the last
+    assert (lame_tag["encoder_delay"], lame_tag["encoder_padding"]) == (576, 200)
+
+
+def test_concat_mp3_rejects_mismatched_formats() -> None:
+    """Segments with different sample rates cannot be spliced."""
+    with pytest.raises(ValueError, match="segment 1"):
+        _ = concat_mp3([b"".join(_frames(2)), b"".join(_frames(2, MPEG2_22K_HEADER))])
+
+
+def test_concat_mp3_rejects_no_segments() -> None:
+    """There is nothing to build an Info frame from."""
+    with pytest.raises(ValueError, match="no segments"):
+        _ = concat_mp3([])
+
+
+# ---------------------------------------------------------------------------
+# Job journal
+# ---------------------------------------------------------------------------
+
+ARTICLE_TEXT = " ".join(f"Sentence number {idx} of the article goes on for a while." for idx in range(600))
+
+
+def _chunk_audio(text: str) -> bytes:
+    # Distinct frames per chunk, so the episode shows which audio went where
+    return b"".join(_frames(2, first_fill=zlib.crc32(text.encode()) % 200))
+
+
+class FakeTextToSpeechClient:
+    """Stands in for TextToSpeechClient, optionally failing after *fail_after* requests."""
+
+    def __init__(self, fail_after: int | None = None) -> None:
+        """Record requests; fail once *fail_after* have succeeded."""
+        self.fail_after: int | None = fail_after
+        self.texts: list[str] = []
+
+    def synthesize_speech(self, request: dict[str, object], timeout: float) -> SimpleNamespace:
+        """Return synthetic MP3 audio for the request's text.
+
+        Returns:
+            An object with the ``audio_content`` of a real response.
+
+        Raises:
+            RuntimeError: Once *fail_after* requests have succeeded.
+
+        """
+        _ = timeout
+        if self.fail_after is not None and len(self.texts) >= self.fail_after:
+            msg = "simulated crash"
+            raise RuntimeError(msg)
+        text: str = request["input"].text  # pyright: ignore[reportAttributeAccessIssue, reportUnknownMemberType, reportUnknownVariableType]
+        self.texts.append(text)
+        return SimpleNamespace(audio_content=_chunk_audio(text))
+
+
+@pytest.fixture
+def job_dirs(tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch) -> pathlib.Path:
+    """Point temp and final output at *tmp_path* and stub the summary and tagging.
+
+    Returns:
+        The working directory for the test.
+
+    """
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(text_to_speech, "temp_output_dir", str(tmp_path / "temp-output"))
+    monkeypatch.setattr(text_to_speech, "final_output_dir", str(tmp_path / "audio"))
+    monkeypatch.setattr(text_to_speech, "generate_summary", lambda _text, _title: "Summary.")
+    monkeypatch.setattr(text_to_speech, "apply_id3_tags", lambda *_args, **_kwargs: None)
+    (tmp_path / "temp-output").mkdir()
+    (tmp_path / "audio").mkdir()
+    return tmp_path
+
+
+def test_interrupted_job_resumes_without_resynthesizing(
+    job_dirs: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Chunks finished before a crash are reused; only the rest are synthesized."""
+    incoming = job_dirs / "20240101-120000-Author- Title.txt"
+    _ = incoming.write_text(f"META_TITLE: Title\n\n{ARTICLE_TEXT}", encoding="utf-8")
+    chunks = [ARTICLE_TEXT[start:end] for start, end in find_chunk_boundaries(ARTICLE_TEXT, incoming.name)]
+    assert len(chunks) > 3
+
+    crashing = FakeTextToSpeechClient(fail_after=2)
+    monkeypatch.setattr(text_to_speech.texttospeech, "TextToSpeechClient", lambda: crashing)
+    with pytest.raises(RuntimeError, match="simulated crash"):
+        text_to_speech.text_to_speech(incoming, max_in_flight=1)
+
+    manifest_path = job_manifest_path(incoming.stem)
+    manifest = load_job_manifest(manifest_path)
+    assert manifest is not None
+    done = [chunk["segment"] for chunk in manifest["chunks"] if chunk["segment"] is not None]
+    assert len(done) == 2
+    assert all(pathlib.Path(segment).exists() for segment in done)
+
+    # A segment no journal references is swept; the journaled ones are kept
+    stray = job_dirs / "temp-output" / "stray.mp3"
+    _ = stray.write_bytes(b"")
+    collect_orphaned_segments()
+    assert not stray.exists()
+    assert all(pathlib.Path(segment).exists() for segment in done)
+
+    resumed = FakeTextToSpeechClient()
+    monkeypatch.setattr(text_to_speech.texttospeech, "TextToSpeechClient", lambda: resumed)
+    text_to_speech.text_to_speech(incoming, max_in_flight=1)
+
+    assert crashing.texts + resumed.texts == chunks
+    assert not manifest_path.exists()
+    assert not incoming.exists()
+    assert not list((job_dirs / "temp-output").glob("*.mp3"))
+    (episode,) = (job_dirs / "audio").glob("*.mp3")
+    _, frames, _ = split_mp3_frames(episode.read_bytes())
+    assert b"".join(frames) == b"".join(_chunk_audio(chunk) for chunk in chunks)
+
+
+def test_changed_input_restarts_job(job_dirs: pathlib.Path) -> None:
+    """A journal for different text is discarded rather than resumed."""
+    incoming = job_dirs / "article.txt"
+    _, first = start_or_resume_job(incoming, "article", ARTICLE_TEXT, ARTICLE_TEXT)
+    first["chunks"][0]["segment"] = str(job_dirs / "temp-output" / "article-001.mp3")
+    _ = pathlib.Path(first["chunks"][0]["segment"]).write_bytes(b"audio")
+    save_job_manifest(job_manifest_path("article"), first)
+
+    _, resumed = start_or_resume_job(incoming, "article", ARTICLE_TEXT, ARTICLE_TEXT)
+    assert resumed["chunks"][0]["segment"] == first["chunks"][0]["segment"]
+
+    changed_text = ARTICLE_TEXT.replace("Sentence", "Line")
+    _, restarted = start_or_resume_job(incoming, "article", changed_text, changed_text)
+    assert all(chunk["segment"] is None for chunk in restarted["chunks"])
+
+
+# ---------------------------------------------------------------------------
+# Summary overlap
+# ---------------------------------------------------------------------------
+
+
+def _raise_summary_error(_text: str, _title: str) -> str:
+    msg = "simulated summary failure"
+    raise RuntimeError(msg)
+
+
+@pytest.mark.parametrize(
+    "summarize",
+    [
+        pytest.param(lambda _text, _title: "", id="empty summary"),
+        pytest.param(_raise_summary_error, id="summary raises"),
+    ],
+)
+def test_failed_summary_still_tags_episode(
+    job_dirs: pathlib.Path, monkeypatch: pytest.MonkeyPatch, summarize: Callable[[str, str], str]
+) -> None:
+    """The episode is finished and tagged with a placeholder when the summary fails."""
+    tags: list[dict[str, str]] = []
+    monkeypatch.setattr(text_to_speech, "generate_summary", summarize)
+    monkeypatch.setattr(text_to_speech, "apply_id3_tags", lambda _path, **kwargs: tags.append(kwargs))
+    monkeypatch.setattr(text_to_speech.texttospeech, "TextToSpeechClient", FakeTextToSpeechClient)
+    incoming = job_dirs / "article.txt"
+    _ = incoming.write_text(f"META_TITLE: Title\nMETA_SOURCE_URL: https://example.com/a\n\n{ARTICLE_TEXT}")
+    text_to_speech.text_to_speech(incoming)
+
+    assert not incoming.exists()
+    assert len(list((job_dirs / "audio").glob("*.mp3"))) == 1
+    assert len(tags) == 1
+    assert tags[0]["title"] == "Title"
+    assert tags[0]["source_url"] == "https://example.com/a"
+    assert tags[0]["description"].startswith("Summary unavailable.")
@@ -1,24 +1,77 @@
 """Convert cleaned text files to MP3 podcast episodes via Google Cloud TTS."""
 
+from __future__ import annotations
+
+import argparse
 import functools
+import json
 import logging
-import math
 import operator
 import pathlib
 import re
-import uuid
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager, nullcontext
 from datetime import UTC, datetime
+from typing import TYPE_CHECKING, TypedDict
 
+from google.api_core import exceptions as api_exceptions
 from google.cloud import texttospeech
-from podcast_shared import apply_id3_tags, generate_summary, split_metadata
+from podcast_shared import (
+    DiskCache,
+    RateLimiter,
+    apply_id3_tags,
+    generate_summary,
+    get_summary_cache,
+    log_gemini_stats,
+    split_metadata,
+)
 from pydub import AudioSegment
 
+if TYPE_CHECKING:
+    from collections.abc import Callable, Generator
+
 logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
 
 input_dir = "../prepare-text/text-input-cleaned"
 temp_output_dir = "temp-output"
+JOBS_SUBDIR = "jobs"
 final_output_dir = "../dropcaster-docker/audio"
 
+# we can send up to 5000 characters per request, so split up the text
+MIN_STEP_SIZE = 3000
+MAX_STEP_SIZE = 5000
+VOICE = texttospeech.VoiceSelectionParams(
+    language_code="en-US",
+    name="en-US-Wavenet-F",
+)
+AUDIO_CONFIG = texttospeech.AudioConfig(
+    audio_encoding=texttospeech.AudioEncoding.MP3,
+)
+
+# Chunks are synthesized concurrently; results are reassembled in chunk order.
+# The in-flight and requests-per-minute limits are shared by all articles in a
+# run, so adding article workers never raises the load on the API.
+DEFAULT_MAX_IN_FLIGHT = 4
+DEFAULT_REQUESTS_PER_MINUTE = 300
+DEFAULT_WORKERS = 1
+SYNTHESIS_TIMEOUT_SECONDS = 120.0
+SYNTHESIS_MAX_ATTEMPTS = 5
+SYNTHESIS_RETRY_BASE_SECONDS = 2.0
+RETRYABLE_SYNTHESIS_ERRORS = (
+    api_exceptions.ResourceExhausted,
+    api_exceptions.ServiceUnavailable,
+    api_exceptions.InternalServerError,
+    api_exceptions.DeadlineExceeded,
+)
+
+# Synthesized chunks are cached by hash(text, voice, audio config) so crashed or
+# re-processed articles don't pay for the same audio twice.
+TTS_CACHE_DIR = "tts-cache"
+TTS_CACHE_MAX_AGE_SECONDS = 60 * 60 * 24 * 30
+TTS_CACHE_MAX_BYTES = 500 * 1024 * 1024
+
 
 INTAKE_TYPE_LABELS = {
     "email": "Email",
@@ -68,14 +121,777 @@ def to_base36(value: int) -> str:
     return "".join(reversed(digits))
 
 
-def process_files() -> None:
-    """Process all cleaned text files in the input directory."""
+# ---------------------------------------------------------------------------
+# MP3 frame-level concatenation
+# ---------------------------------------------------------------------------
+#
+# Every chunk comes back from Cloud TTS as a Layer III stream with identical
+# encoder settings, so episodes are assembled by splicing the MPEG frames
+# together instead of decoding to PCM and re-encoding. Per-chunk ID3 tags and
+# Xing/Info frames are dropped and one Info frame describing the whole episode
+# is written at the front.
+
+MP3_VERSION_MPEG1 = 3
+MP3_LAYER_III = 1
+MP3_CHANNEL_MODE_MONO = 3
+MP3_BITRATES_KBPS_MPEG1 = (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320)
+MP3_BITRATES_KBPS_MPEG2 = (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160)
+MP3_SAMPLE_RATES = {
+    3: (44100, 48000, 32000),  # MPEG-1
+    2: (22050, 24000, 16000),  # MPEG-2
+    0: (11025, 12000, 8000),  # MPEG-2.5
+}
+# Side information size in bytes, keyed by (is MPEG-1, is mono)
+MP3_SIDE_INFO_SIZES = {(True, False): 32, (True, True): 17, (False, False): 17, (False, True): 9}
+XING_FLAG_FRAMES = 0x1
+XING_FLAG_BYTES = 0x2
+XING_FLAG_TOC = 0x4
+XING_FLAG_QUALITY = 0x8
+XING_TOC_ENTRIES = 100
+LAME_TAG_SIZE = 36
+ID3V2_HEADER_SIZE = 10
+ID3V1_TAG_SIZE = 128
+
+
+def _build_crc16_table() -> tuple[int, ...]:
+    # CRC-16/ARC (reflected polynomial 0x8005), as used by the LAME tag.
+    table: list[int] = []
+    for byte in range(256):
+        crc = byte
+        for _ in range(8):
+            crc = (crc >> 1) ^ 0xA001 if crc & 1 else crc >> 1
+        table.append(crc)
+    return tuple(table)
+
+
+CRC16_TABLE = _build_crc16_table()
+
+
+def crc16(data: bytes | memoryview, crc: int = 0) -> int:
+    """Compute the CRC-16/ARC checksum used in LAME info tags.
+
+    Returns:
+        The 16-bit checksum.
+
+    """
+    table = CRC16_TABLE
+    for byte in data:
+        crc = (crc >> 8) ^ table[(crc ^ byte) & 0xFF]
+    return crc
+
+
+class Mp3FrameHeader(TypedDict):
+    """Decoded fields of a Layer III frame header."""
+
+    version: int  # 3 = MPEG-1, 2 = MPEG-2, 0 = MPEG-2.5
+    sample_rate: int
+    bitrate_kbps: int
+    mono: bool
+    frame_length: int
+    samples_per_frame: int
+    side_info_size: int
+    side_info_end: int  # offset of the first byte after header, CRC and side info
+
+
+class LameTag(TypedDict):
+    """Fields carried over from a chunk's LAME extension."""
+
+    raw: bytes
+    quality: int
+    encoder_delay: int
+    encoder_padding: int
+
+
+def parse_mp3_frame_header(header: bytes | memoryview) -> Mp3FrameHeader | None:
+    """Decode a 4-byte MPEG audio frame header.
+
+    Returns:
+        The decoded header, or None if the bytes are not a valid Layer III
+        frame header (free-format and reserved values are rejected).
+
+    """
+    if len(header) < 4 or header[0] != 0xFF or header[1] & 0xE0 != 0xE0:
+        return None
+    version = (header[1] >> 3) & 0x3
+    layer = (header[1] >> 1) & 0x3
+    has_crc = not header[1] & 0x1
+    bitrate_index = header[2] >> 4
+    sample_rate_index = (header[2] >> 2) & 0x3
+    padding = (header[2] >> 1) & 0x1
+    if version not in MP3_SAMPLE_RATES or layer != MP3_LAYER_III:
+        return None
+    if bitrate_index in {0, 15} or sample_rate_index == 3:
+        return None
+    is_mpeg1 = version == MP3_VERSION_MPEG1
+    bitrate_kbps = (MP3_BITRATES_KBPS_MPEG1 if is_mpeg1 else MP3_BITRATES_KBPS_MPEG2)[bitrate_index]
+    sample_rate = MP3_SAMPLE_RATES[version][sample_rate_index]
+    mono = header[3] >> 6 == MP3_CHANNEL_MODE_MONO
+    side_info_size = MP3_SIDE_INFO_SIZES[is_mpeg1, mono]
+    return {
+        "version": version,
+        "sample_rate": sample_rate,
+        "bitrate_kbps": bitrate_kbps,
+        "mono": mono,
+        "frame_length": _frame_length(version, bitrate_kbps, sample_rate) + padding,
+        "samples_per_frame": 1152 if is_mpeg1 else 576,
+        "side_info_size": side_info_size,
+        "side_info_end": 4 + (2 if has_crc else 0) + side_info_size,
+    }
+
+
+def _frame_length(version: int, bitrate_kbps: int, sample_rate: int) -> int:
+    coefficient = 144 if version == MP3_VERSION_MPEG1 else 72
+    return coefficient * bitrate_kbps * 1000 // sample_rate
+
+
+def _xing_fields_size(flags: int) -> int:
+    size = 8  # "Xing"/"Info" + flags
+    if flags & XING_FLAG_FRAMES:
+        size += 4
+    if flags & XING_FLAG_BYTES:
+        size += 4
+    if flags & XING_FLAG_TOC:
+        size += XING_TOC_ENTRIES
+    if flags & XING_FLAG_QUALITY:
+        size += 4
+    return size
+
+
+def _parse_info_frame(frame: bytes | memoryview, header: Mp3FrameHeader) -> tuple[bool, LameTag | None]:
+    """Detect a Xing/Info frame and extract its LAME extension, if any.
+
+    Returns:
+        ``(is_info_frame, lame_tag)``.
+
+    """
+    offset = header["side_info_end"]
+    tag = bytes(frame[offset : offset + 4])
+    if tag not in {b"Xing", b"Info"} or len(frame) < offset + 8:
+        return False, None
+    flags = int.from_bytes(frame[offset + 4 : offset + 8], "big")
+    lame_offset = offset + _xing_fields_size(flags)
+    lame = bytes(frame[lame_offset : lame_offset + LAME_TAG_SIZE])
+    if len(lame) < LAME_TAG_SIZE or not lame[:4].isalnum():
+        return True, None
+    quality = 0
+    if flags & XING_FLAG_QUALITY:
+        quality = int.from_bytes(frame[lame_offset - 4 : lame_offset], "big")
+    return True, {
+        "raw": lame,
+        "quality": quality,
+        "encoder_delay": (lame[21] << 4) | (lame[22] >> 4),
+        "encoder_padding": ((lame[22] & 0x0F) << 8) | lame[23],
+    }
+
+
+def split_mp3_frames(data: bytes) -> tuple[Mp3FrameHeader, list[memoryview], LameTag | None]:
+    """Split an MP3 stream into audio frames, dropping tags and any Xing/Info frame.
+
+    Returns:
+        ``(first_header, audio_frames, lame_tag)``.
+
+    Raises:
+        ValueError: If the stream is not a clean sequence of Layer III frames
+            with a single sample rate and channel layout.
+
+    """
+    view = memoryview(data)
+    start, end = 0, len(view)
+    if bytes(view[:3]) == b"ID3" and end >= ID3V2_HEADER_SIZE:
+        # Synchsafe size, plus a 10-byte footer when flag bit 4 is set.
+        tag_size = (view[6] << 21) | (view[7] << 14) | (view[8] << 7) | view[9]
+        start = ID3V2_HEADER_SIZE + tag_size + (ID3V2_HEADER_SIZE if view[5] & 0x10 else 0)
+    if end - start >= ID3V1_TAG_SIZE and bytes(view[end - ID3V1_TAG_SIZE : end - ID3V1_TAG_SIZE + 3]) == b"TAG":
+        end -= ID3V1_TAG_SIZE
+
+    first: Mp3FrameHeader | None = None
+    frames: list[memoryview] = []
+    lame_tag: LameTag | None = None
+    pos = start
+    while pos < end:
+        header = parse_mp3_frame_header(view[pos : pos + 4])
+        if header is None:
+            msg = f"no MPEG frame sync at byte {pos}"
+            raise ValueError(msg)
+        frame = view[pos : pos + header["frame_length"]]
+        if len(frame) < header["frame_length"]:
+            msg = f"truncated MPEG frame at byte {pos}"
+            raise ValueError(msg)
+        pos += header["frame_length"]
+        if first is None:
+            first = header
+            is_info_frame, lame_tag = _parse_info_frame(frame, header)
+            if is_info_frame:
+                continue
+        elif (header["version"], header["sample_rate"], header["mono"]) != (
+            first["version"],
+            first["sample_rate"],
+            first["mono"],
+        ):
+            msg = "MPEG version, sample rate or channel layout changes mid-stream"
+            raise ValueError(msg)
+        frames.append(frame)
+    if first is None or not frames:
+        msg = "stream contains no audio frames"
+        raise ValueError(msg)
+    return first, frames, lame_tag
+
+
+def build_info_frame(
+    template: Mp3FrameHeader,
+    raw_header: bytes,
+    frames: list[memoryview],
+    lame_tag: LameTag | None,
+) -> bytes:
+    """Build a Xing/Info frame describing *frames* (which must follow it directly).
+
+    The frame reuses the stream's MPEG version, sample rate and channel mode and
+    picks the smallest bitrate whose frame can hold the tag. When the source
+    chunks carried a LAME extension, it is rewritten with the first chunk's
+    encoder delay, the last chunk's padding, and fresh length/CRC fields.
+
+    Returns:
+        The complete info frame.
+
+    Raises:
+        ValueError: If no bitrate gives a frame large enough for the tag.
+
+    """
+    flags = XING_FLAG_FRAMES | XING_FLAG_BYTES | XING_FLAG_TOC
+    if lame_tag is not None:
+        flags |= XING_FLAG_QUALITY
+    tag_offset = 4 + template["side_info_size"]
+    needed = tag_offset + _xing_fields_size(flags) + (LAME_TAG_SIZE if lame_tag is not None else 0)
+
+    bitrates = MP3_BITRATES_KBPS_MPEG1 if template["version"] == MP3_VERSION_MPEG1 else MP3_BITRATES_KBPS_MPEG2
+    bitrate_index = next(
+        (
+            idx
+            for idx, kbps in enumerate(bitrates)
+            if idx and _frame_length(template["version"], kbps, template["sample_rate"]) >= needed
+        ),
+        None,
+    )
+    if bitrate_index is None:
+        msg = "no bitrate is large enough to hold the info tag"
+        raise ValueError(msg)
+    frame_length = _frame_length(template["version"], bitrates[bitrate_index], template["sample_rate"])
+    header = bytes(
+        (
+            0xFF,
+            raw_header[1] | 0x1,  # no CRC
+            (bitrate_index << 4) | (raw_header[2] & 0x0C),  # keep sample rate, no padding
+            raw_header[3],
+        ),
+    )
+
+    audio_bytes = sum(len(frame) for frame in frames)
+    total_bytes = frame_length + audio_bytes
+    frame_offsets: list[int] = []
+    offset = frame_length
+    for frame in frames:
+        frame_offsets.append(offset)
+        offset += len(frame)
+    toc = bytes(
+        min(255, 256 * frame_offsets[idx * len(frames) // XING_TOC_ENTRIES] // total_bytes)
+        for idx in range(XING_TOC_ENTRIES)
+    )
+
+    is_cbr = len({frame[2] >> 4 for frame in frames}) == 1
+    tag = bytearray(header)
+    tag += bytes(tag_offset - len(tag))
+    tag += b"Info" if is_cbr else b"Xing"
+    tag += flags.to_bytes(4, "big")
+    tag += len(frames).to_bytes(4, "big")
+    tag += total_bytes.to_bytes(4, "big")
+    tag += toc
+    if lame_tag is not None:
+        tag += lame_tag["quality"].to_bytes(4, "big")
+        lame = bytearray(lame_tag["raw"])
+        lame[11:19] = bytes(8)  # peak signal and replay gain no longer apply
+        lame[21:24] = bytes(
+            (
+                lame_tag["encoder_delay"] >> 4,
+                ((lame_tag["encoder_delay"] & 0x0F) << 4) | (lame_tag["encoder_padding"] >> 8),
+                lame_tag["encoder_padding"] & 0xFF,
+            ),
+        )
+        lame[28:32] = total_bytes.to_bytes(4, "big")
+        music_crc = 0
+        for frame in frames:
+            music_crc = crc16(frame, music_crc)
+        lame[32:34] = music_crc.to_bytes(2, "big")
+        tag += lame[:34]
+        tag += crc16(bytes(tag)).to_bytes(2, "big")
+    tag += bytes(frame_length - len(tag))
+    return bytes(tag)
+
+
+def concat_mp3(segments: list[bytes]) -> bytes:
+    """Join MP3 segments at the frame level without decoding.
+
+    Returns:
+        A single MP3 stream with one Info frame followed by every audio frame.
+
+    Raises:
+        ValueError: If any segment cannot be split into frames or the segments
+            differ in MPEG version, sample rate or channel layout.
+
+    """
+    first_header: Mp3FrameHeader | None = None
+    raw_header = b""
+    all_frames: list[memoryview] = []
+    first_lame: LameTag | None = None
+    last_lame: LameTag | None = None
+    for idx, segment in enumerate(segments):
+        header, frames, lame_tag = split_mp3_frames(segment)
+        if first_header is None:
+            first_header = header
+            raw_header = bytes(frames[0][:4])
+            first_lame = lame_tag
+        elif (header["version"], header["sample_rate"], header["mono"]) != (
+            first_header["version"],
+            first_header["sample_rate"],
+            first_header["mono"],
+        ):
+            msg = f"segment {idx} has a different MPEG version, sample rate or channel layout"
+            raise ValueError(msg)
+        last_lame = lame_tag
+        all_frames.extend(frames)
+    if first_header is None:
+        msg = "no segments to concatenate"
+        raise ValueError(msg)
+    lame_tag: LameTag | None = None
+    if first_lame is not None:
+        # Leading delay comes from the first chunk, trailing padding from the last;
+        # the delay/padding of inner chunks is audio inside the joined stream.
+        lame_tag = {
+            "raw": first_lame["raw"],
+            "quality": first_lame["quality"],
+            "encoder_delay": first_lame["encoder_delay"],
+            "encoder_padding": last_lame["encoder_padding"] if last_lame is not None else 0,
+        }
+    info_frame = build_info_frame(first_header, raw_header, all_frames, lame_tag)
+    return b"".join([info_frame, *all_frames])
+
+
+def find_chunk_boundaries(content_text: str, source_name: str) -> list[tuple[int, int]]:
+    """Split text into TTS request chunks, preferring sentence/line boundaries.
+
+    Returns:
+        ``(start, end)`` offsets of chunks of MIN_STEP_SIZE to MAX_STEP_SIZE
+        characters, in order.
+
+    """
+    compiled_regex_for_first_whitespace = re.compile(r"(\r\n|\r|\n|\.)+\s+")
+    boundaries: list[tuple[int, int]] = []
+    next_text_starter_position = 0
+    while next_text_starter_position < len(content_text):
+        first_whitespace_after_min_step_size_search = compiled_regex_for_first_whitespace.search(
+            content_text,
+            next_text_starter_position + MIN_STEP_SIZE,
+            next_text_starter_position + MAX_STEP_SIZE,
+        )
+        if first_whitespace_after_min_step_size_search is not None:
+            first_whitespace_after_min_step_size = first_whitespace_after_min_step_size_search.end()
+        else:
+            first_whitespace_after_min_step_size = min(next_text_starter_position + MAX_STEP_SIZE, len(content_text))
+            if first_whitespace_after_min_step_size < len(content_text):
+                logging.info("max_step_size met before end of %s", source_name)
+        boundaries.append((next_text_starter_position, first_whitespace_after_min_step_size))
+        next_text_starter_position = first_whitespace_after_min_step_size
+    return boundaries
+
+
+def open_chunk_cache() -> DiskCache:
+    """Return the on-disk cache of synthesized chunk audio.
+
+    Returns:
+        The chunk cache.
+
+    """
+    return DiskCache(
+        TTS_CACHE_DIR,
+        name="TTS chunk",
+        suffix=".mp3",
+        max_age_seconds=TTS_CACHE_MAX_AGE_SECONDS,
+        max_bytes=TTS_CACHE_MAX_BYTES,
+    )
+
+
+def chunk_cache_key(text: str) -> str:
+    """Build the cache key for a chunk under the current voice and audio config.
+
+    Returns:
+        The content hash identifying the chunk's audio.
+
+    """
+    return DiskCache.make_key(
+        text,
+        texttospeech.VoiceSelectionParams.to_json(VOICE),
+        texttospeech.AudioConfig.to_json(AUDIO_CONFIG),
+    )
+
+
+class SynthesisBudget:
+    """Request concurrency and rate limits shared by every article in a run.
+
+    Also totals the time spent in synthesis requests for the run summary.
+    """
+
+    def __init__(self, max_in_flight: int, requests_per_minute: float) -> None:
+        """Allow *max_in_flight* concurrent requests at *requests_per_minute*."""
+        self._slots: threading.BoundedSemaphore = threading.BoundedSemaphore(max_in_flight)
+        self._limiter: RateLimiter = RateLimiter(requests_per_minute / 60, burst=max_in_flight)
+        self._lock: threading.Lock = threading.Lock()
+        self.requests: int = 0
+        self.request_seconds: float = 0.0
+
+    @contextmanager
+    def slot(self) -> Generator[None]:
+        """Hold one request slot, waiting for both a free slot and a rate-limit token."""
+        with self._slots:
+            _ = self._limiter.acquire()
+            started = time.monotonic()
+            try:
+                yield
+            finally:
+                elapsed = time.monotonic() - started
+                with self._lock:
+                    self.requests += 1
+                    self.request_seconds += elapsed
+
+
+def synthesize_chunk(
+    client: texttospeech.TextToSpeechClient,
+    text: str,
+    label: str,
+    cache: DiskCache | None = None,
+    budget: SynthesisBudget | None = None,
+) -> bytes:
+    """Synthesize one chunk, retrying transient API errors with exponential backoff.
+
+    Returns:
+        The MP3 audio content for the chunk.
+
+    """
+    cache_key = chunk_cache_key(text) if cache is not None else ""
+    if cache is not None:
+        cached = cache.get(cache_key)
+        if cached is not None:
+            logging.info("Using cached audio for %s", label)
+            return cached
+    audio_content = _request_synthesis(client, text, label, budget)
+    if cache is not None:
+        try:
+            cache.put(cache_key, audio_content)
+        except OSError:
+            logging.warning("Could not write cached audio for %s", label, exc_info=True)
+    return audio_content
+
+
+def _request_synthesis(
+    client: texttospeech.TextToSpeechClient,
+    text: str,
+    label: str,
+    budget: SynthesisBudget | None,
+) -> bytes:
+    request = {
+        "input": texttospeech.SynthesisInput(text=text),
+        "voice": VOICE,
+        "audio_config": AUDIO_CONFIG,
+    }
+    logging.info("Synthesizing speech for %s", label)
+    for attempt in range(1, SYNTHESIS_MAX_ATTEMPTS):
+        try:
+            with budget.slot() if budget is not None else nullcontext():
+                response = client.synthesize_speech(request=request, timeout=SYNTHESIS_TIMEOUT_SECONDS)  # pyright: ignore[reportUnknownMemberType, reportArgumentType]
+        except RETRYABLE_SYNTHESIS_ERRORS as exc:
+            delay = SYNTHESIS_RETRY_BASE_SECONDS * 2 ** (attempt - 1)
+            logging.warning(
+                "Synthesis of %s failed (attempt %d/%d): %s; retrying in %.0fs",
+                label,
+                attempt,
+                SYNTHESIS_MAX_ATTEMPTS,
+                exc,
+                delay,
+            )
+            time.sleep(delay)
+        else:
+            return response.audio_content
+    # Final attempt: let any error propagate so the article is retried next run.
+    with budget.slot() if budget is not None else nullcontext():
+        response = client.synthesize_speech(request=request, timeout=SYNTHESIS_TIMEOUT_SECONDS)  # pyright: ignore[reportUnknownMemberType, reportArgumentType]
+    return response.audio_content
+
+
+def synthesize_chunks(
+    client: texttospeech.TextToSpeechClient,
+    chunks: list[str],
+    max_in_flight: int,
+    cache: DiskCache | None = None,
+    on_chunk_done: Callable[[int, bytes], None] | None = None,
+    budget: SynthesisBudget | None = None,
+) -> list[bytes]:
+    """Synthesize all chunks with at most *max_in_flight* concurrent requests.
+
+    When a *budget* is given, requests also wait for its run-wide limits.
+
+    *on_chunk_done* is called from the calling thread with ``(index, audio)``
+    as each chunk finishes, in completion order.
+
+    Returns:
+        MP3 audio for each chunk, in the same order as *chunks*.
+
+    """
+    logging.info("Synthesizing %d chunks with up to %d requests in flight", len(chunks), max_in_flight)
+    results: list[bytes] = [b""] * len(chunks)
+    with ThreadPoolExecutor(max_workers=max_in_flight, thread_name_prefix="tts") as executor:
+        futures = {
+            executor.submit(synthesize_chunk, client, chunk, f"chunk {idx + 1} of {len(chunks)}", cache, budget): idx
+            for idx, chunk in enumerate(chunks)
+        }
+        for future in as_completed(futures):
+            idx = futures[future]
+            results[idx] = future.result()
+            if on_chunk_done is not None:
+                on_chunk_done(idx, results[idx])
+    return results
+
+
+# ---------------------------------------------------------------------------
+# Job journal
+# ---------------------------------------------------------------------------
+#
+# Each article in progress has a manifest in temp-output/jobs/ recording its
+# chunk boundaries and hashes, the segments synthesized so far, and the final
+# output path. It is rewritten atomically after every finished chunk, so an
+# interrupted run resumes where it stopped instead of starting over.
+
+
+class JobChunk(TypedDict):
+    """One chunk of an article and its synthesized segment, if any."""
+
+    start: int
+    end: int
+    hash: str
+    segment: str | None
+
+
+class JobManifest(TypedDict):
+    """Resumable state for one article."""
+
+    source: str
+    source_hash: str
+    output_filename: str
+    chunks: list[JobChunk]
+
+
+def job_manifest_path(name: str) -> pathlib.Path:
+    """Return the manifest path for the article *name*.
+
+    Returns:
+        Path of the article's job manifest.
+
+    """
+    return pathlib.Path(temp_output_dir) / JOBS_SUBDIR / f"{name}.json"
+
+
+def save_job_manifest(path: pathlib.Path, manifest: JobManifest) -> None:
+    """Write the manifest atomically (temp file + rename)."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    _ = tmp_path.write_text(json.dumps(manifest, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+    _ = tmp_path.replace(path)
+
+
+def load_job_manifest(path: pathlib.Path) -> JobManifest | None:
+    """Read a job manifest, treating a missing or unreadable one as absent.
+
+    Returns:
+        The manifest, or None.
+
+    """
+    try:
+        manifest: JobManifest = json.loads(path.read_text(encoding="utf-8"))  # pyright: ignore[reportAny]
+    except FileNotFoundError:
+        return None
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        logging.warning("Ignoring unreadable job manifest %s", path)
+        return None
+    return manifest
+
+
+def start_or_resume_job(
+    incoming_filename: str | pathlib.Path,
+    name: str,
+    input_text_raw: str,
+    content_text: str,
+) -> tuple[pathlib.Path, JobManifest]:
+    """Load the article's manifest if it still matches the input, else start a new one.
+
+    Segments whose files have gone missing are marked pending again.
+
+    Returns:
+        ``(manifest_path, manifest)``.
+
+    """
+    path = job_manifest_path(name)
+    source_hash = DiskCache.make_key(input_text_raw)
+    boundaries = find_chunk_boundaries(content_text, pathlib.Path(incoming_filename).name)
+    chunk_hashes = [chunk_cache_key(content_text[start:end]) for start, end in boundaries]
+    existing = load_job_manifest(path)
+    if (
+        existing is not None
+        and existing["source_hash"] == source_hash
+        and [chunk["hash"] for chunk in existing["chunks"]] == chunk_hashes
+    ):
+        for chunk in existing["chunks"]:
+            if chunk["segment"] is not None and not pathlib.Path(chunk["segment"]).exists():
+                chunk["segment"] = None
+        done = sum(chunk["segment"] is not None for chunk in existing["chunks"])
+        logging.info("Resuming %s: %d of %d chunks already synthesized", name, done, len(existing["chunks"]))
+        return path, existing
+    if existing is not None:
+        logging.info("Input or chunking changed since last attempt; restarting %s", name)
+    manifest: JobManifest = {
+        "source": str(incoming_filename),
+        "source_hash": source_hash,
+        "output_filename": build_output_filename(name),
+        "chunks": [
+            {"start": start, "end": end, "hash": chunk_hash, "segment": None}
+            for (start, end), chunk_hash in zip(boundaries, chunk_hashes, strict=True)
+        ],
+    }
+    save_job_manifest(path, manifest)
+    return path, manifest
+
+
+def collect_orphaned_segments() -> None:
+    """Delete journals for vanished inputs and temp segments no journal references."""
+    temp_dir = pathlib.Path(temp_output_dir)
+    temp_dir.mkdir(parents=True, exist_ok=True)
+    referenced: set[pathlib.Path] = set()
+    jobs_dir = temp_dir / JOBS_SUBDIR
+    if jobs_dir.exists():
+        for path in jobs_dir.glob("*.json"):
+            manifest = load_job_manifest(path)
+            if manifest is None or not pathlib.Path(manifest["source"]).exists():
+                logging.info("Removing stale job manifest %s", path.name)
+                path.unlink(missing_ok=True)
+                continue
+            referenced.update(
+                pathlib.Path(chunk["segment"]).resolve() for chunk in manifest["chunks"] if chunk["segment"]
+            )
+    removed = 0
+    for segment in temp_dir.glob("*.mp3"):
+        if segment.resolve() not in referenced:
+            segment.unlink(missing_ok=True)
+            removed += 1
+    if removed:
+        logging.info("Removed %d orphaned temp segments", removed)
+
+
+def build_output_filename(name: str) -> str:
+    """Derive the episode MP3 path from the input file's base name.
+
+    Returns:
+        Path of the final MP3 in the Dropcaster audio directory.
+
+    """
+    current_datetime = datetime.now(tz=UTC).strftime("%Y%m%d")
+    # Filename format: "YYYYMMDD-HHMMSS-<rest>"
+    date_match = re.match(r"^(\d{8}-\d{6})-(.+)$", name)
+    if date_match:
+        date_prefix = date_match.group(1) + "-"
+        name_without_date = date_match.group(2)
+    else:
+        date_prefix = ""
+        name_without_date = name
+    dash_index = name_without_date.find("-")
+
+    if dash_index != -1:
+        return f"{final_output_dir}/{name_without_date[: dash_index + 1]} {date_prefix} {name_without_date[dash_index + 1 :]}-{current_datetime}.mp3"
+    return f"{final_output_dir}/{name_without_date}-{date_prefix}{current_datetime}.mp3"
+
+
+def stitch_segments(audio_chunks: list[bytes], mp3_segments: list[str], output_filename: str) -> None:
+    """Write the episode by joining chunk MP3s at the frame level.
+
+    Falls back to decoding and re-encoding with pydub when the chunks cannot be
+    joined frame-by-frame (e.g. mismatched sample rates).
+    """
+    try:
+        episode = concat_mp3(audio_chunks)
+    except ValueError as exc:
+        logging.warning("Frame-level MP3 join failed (%s); re-encoding with pydub", exc)
+        segments = [AudioSegment.from_mp3(f) for f in mp3_segments]
+        audio: AudioSegment = functools.reduce(operator.add, segments)  # pyright: ignore[reportAny]
+        logging.info("Exporting %s", output_filename)
+        _ = audio.export(output_filename, format="mp3")
+        return
+    logging.info("Writing %s (%d bytes)", output_filename, len(episode))
+    _ = pathlib.Path(output_filename).write_bytes(episode)
+
+
+def process_files(
+    max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+    workers: int = DEFAULT_WORKERS,
+    requests_per_minute: float = DEFAULT_REQUESTS_PER_MINUTE,
+) -> None:
+    """Process all cleaned text files in the input directory.
+
+    Up to *workers* articles are synthesized at once; their requests share one
+    run-wide in-flight and rate budget.
+
+    Raises:
+        RuntimeError: If any article failed (the others still finish first).
+
+    """
+    collect_orphaned_segments()
+    cache = open_chunk_cache()
+    cache.evict()
+    budget = SynthesisBudget(max_in_flight, requests_per_minute)
     txt_files = sorted(pathlib.Path(input_dir).glob("*.txt"))
-    for f in txt_files:
-        text_to_speech(f)
+    started = time.monotonic()
+    failed: list[str] = []
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="article") as executor:
+        futures = {
+            executor.submit(text_to_speech, f, max_in_flight=max_in_flight, cache=cache, budget=budget): f
+            for f in txt_files
+        }
+        for future in as_completed(futures):
+            try:
+                future.result()
+            except Exception:
+                logging.exception("Failed to synthesize %s", futures[future].name)
+                failed.append(futures[future].name)
+    wall_seconds = time.monotonic() - started
+    cache.log_stats()
+    get_summary_cache().log_stats()
+    log_gemini_stats()
+    logging.info(
+        "Processed %d articles (%d failed) with %d workers in %.1fs wall time; "
+        "%d synthesis requests took %.1fs in total (%.1fx overlap)",
+        len(txt_files),
+        len(failed),
+        workers,
+        wall_seconds,
+        budget.requests,
+        budget.request_seconds,
+        budget.request_seconds / wall_seconds if wall_seconds > 0 else 0.0,
+    )
+    if failed:
+        msg = f"Failed to synthesize {len(failed)} article(s): {', '.join(sorted(failed))}"
+        raise RuntimeError(msg)
 
 
-def text_to_speech(incoming_filename: str | pathlib.Path) -> None:
+def text_to_speech(
+    incoming_filename: str | pathlib.Path,
+    max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+    cache: DiskCache | None = None,
+    budget: SynthesisBudget | None = None,
+) -> None:
     """Synthesize a single text file into an MP3 with ID3 tags."""
     with pathlib.Path(incoming_filename).open("rb") as filename:
         logging.info("Synthesizing speech for %s", filename.name)
@@ -85,14 +901,6 @@ def text_to_speech(incoming_filename: str | pathlib.Path) -> None:
         metadata, content_text = split_metadata(input_text_raw)
         # initialize the API client
         client = texttospeech.TextToSpeechClient()
-        mp3files: list[str] = []
-        # we can send up to 5000 characters per request, so split up the text
-        min_step_size = 3000
-        max_step_size = 5000
-        compiled_regex_for_first_whitespace = re.compile(r"(\r\n|\r|\n|\.)+\s+")
-        next_text_starter_position = 0
-        counter = 0
-        max_steps = math.floor(1 + len(content_text) / min_step_size)
         if len(content_text) > 0:
             meta_from = metadata.get("from", "").strip()
             meta_title = metadata.get("title", "").strip()
@@ -102,83 +910,38 @@ def text_to_speech(incoming_filename: str | pathlib.Path) -> None:
             meta_intake_type = metadata.get("intake_type", "").strip()
             if meta_title or meta_source_url:
                 logging.info("Using metadata for summary and description")
-            summary = generate_summary(content_text, meta_title)
-            description = build_description(
-                summary,
-                meta_title,
-                meta_source_url,
-                meta_source_kind,
-                meta_source_name,
-                meta_intake_type,
-            )
-            while next_text_starter_position < len(content_text):
-                counter += 1
-                first_whitespace_after_min_step_size_search = compiled_regex_for_first_whitespace.search(
-                    content_text,
-                    next_text_starter_position + min_step_size,
-                    next_text_starter_position + max_step_size,
-                )
-                if first_whitespace_after_min_step_size_search is not None:
-                    first_whitespace_after_min_step_size = first_whitespace_after_min_step_size_search.end()
-                else:
-                    first_whitespace_after_min_step_size = next_text_starter_position + max_step_size
-                    if first_whitespace_after_min_step_size < len(content_text):
-                        logging.info(
-                            "max_step_size met before end of %s",
-                            filename.name,
-                        )
-                text_to_process = content_text[next_text_starter_position:first_whitespace_after_min_step_size]
-                next_text_starter_position = first_whitespace_after_min_step_size
-
-                synthesis_input = texttospeech.SynthesisInput(text=text_to_process)
-                voice = texttospeech.VoiceSelectionParams(
-                    language_code="en-US",
-                    name="en-US-Wavenet-F",
-                )
-                audio_config = texttospeech.AudioConfig(
-                    audio_encoding=texttospeech.AudioEncoding.MP3,
-                )
-                logging.info(
-                    "Synthesizing speech for file %s of at most %s",
-                    counter,
-                    max_steps,
-                )
-                response = client.synthesize_speech(  # pyright: ignore[reportUnknownMemberType]
-                    request={
-                        "input": synthesis_input,
-                        "voice": voice,
-                        "audio_config": audio_config,
-                    },
-                )
-                mp3_filename = f"{temp_output_dir}/{uuid.uuid4()}.mp3"
-                _ = pathlib.Path(mp3_filename).write_bytes(response.audio_content)
-                logging.info('Audio content written to file "%s"', mp3_filename)
-                mp3files.append(mp3_filename)
-
-            mp3_segments = mp3files
-            segments = [AudioSegment.from_mp3(f) for f in mp3_segments]
-
-            logging.info("Stitching together %d mp3 files for %s", len(segments), name)
-            audio: AudioSegment = functools.reduce(operator.add, segments)  # pyright: ignore[reportAny]
+            # The summary is only needed for tagging, so generate it while the
+            # chunks are synthesized instead of before.
+            summary_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="summary")
+            summary_future = summary_executor.submit(generate_summary, content_text, meta_title)
+            summary_executor.shutdown(wait=False)
+            manifest_path, manifest = start_or_resume_job(incoming_filename, name, input_text_raw, content_text)
+            output_filename = manifest["output_filename"]
+            pending = [idx for idx, chunk in enumerate(manifest["chunks"]) if chunk["segment"] is None]
 
-            current_datetime = datetime.now(tz=UTC).strftime("%Y%m%d")
-            # Filename format: "YYYYMMDD-HHMMSS-<rest>"
-            date_match = re.match(r"^(\d{8}-\d{6})-(.+)$", name)
-            if date_match:
-                date_prefix = date_match.group(1) + "-"
-                name_without_date = date_match.group(2)
-            else:
-                date_prefix = ""
-                name_without_date = name
-            dash_index = name_without_date.find("-")
+            def record_segment(pending_idx: int, audio_content: bytes) -> None:
+                chunk = manifest["chunks"][pending[pending_idx]]
+                mp3_filename = f"{temp_output_dir}/{name}-{pending[pending_idx] + 1:03d}-{chunk['hash'][:12]}.mp3"
+                _ = pathlib.Path(mp3_filename).write_bytes(audio_content)
+                logging.info('Audio content written to file "%s"', mp3_filename)
+                chunk["segment"] = mp3_filename
+                save_job_manifest(manifest_path, manifest)
 
-            if dash_index != -1:
-                output_filename = f"{final_output_dir}/{name_without_date[: dash_index + 1]} {date_prefix} {name_without_date[dash_index + 1 :]}-{current_datetime}.mp3"
-            else:
-                output_filename = f"{final_output_dir}/{name_without_date}-{date_prefix}{current_datetime}.mp3"
+            _ = synthesize_chunks(
+                client,
+                [content_text[manifest["chunks"][idx]["start"] : manifest["chunks"][idx]["end"]] for idx in pending],
+                max_in_flight,
+                cache,
+                on_chunk_done=record_segment,
+                budget=budget,
+            )
+            if cache is not None:
+                cache.log_stats()
+            mp3_segments = [str(chunk["segment"]) for chunk in manifest["chunks"]]
+            audio_chunks = [pathlib.Path(segment).read_bytes() for segment in mp3_segments]
 
-            logging.info("Exporting %s", output_filename)
-            _ = audio.export(output_filename, format="mp3")
+            logging.info("Stitching together %d mp3 files for %s", len(mp3_segments), name)
+            stitch_segments(audio_chunks, mp3_segments, output_filename)
             file_title = pathlib.Path(output_filename).stem
             file_title = re.sub(r"-\d{8}$", "", file_title)
             if meta_from and meta_title:
@@ -190,6 +953,19 @@ def text_to_speech(incoming_filename: str | pathlib.Path) -> None:
                 title_for_tag = f"{meta_from}- {unix_seconds_base36}- {meta_title}"
             else:
                 title_for_tag = meta_title or file_title
+            try:
+                summary = summary_future.result()
+            except Exception:
+                logging.exception("Summary generation failed for %s", name)
+                summary = ""
+            description = build_description(
+                summary,
+                meta_title,
+                meta_source_url,
+                meta_source_kind,
+                meta_source_name,
+                meta_intake_type,
+            )
             apply_id3_tags(output_filename, title=title_for_tag, description=description, source_url=meta_source_url)
 
             logging.info("Removing intermediate files")
@@ -198,9 +974,44 @@ def text_to_speech(incoming_filename: str | pathlib.Path) -> None:
 
             logging.info("Removing original text file")
             pathlib.Path(incoming_filename).unlink()
+            manifest_path.unlink()
         else:
             logging.warning("Skipping %s: file has no content.", filename.name)
 
 
+def main() -> None:
+    """Parse command-line options and synthesize all pending text files."""
+    arg_parser = argparse.ArgumentParser(description="Convert cleaned text files to MP3 podcast episodes")
+    arg_parser.add_argument(
+        "--max-in-flight",
+        type=int,
+        default=DEFAULT_MAX_IN_FLIGHT,
+        help=f"Maximum concurrent TTS requests across all articles (default: {DEFAULT_MAX_IN_FLIGHT})",
+    )
+    arg_parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_WORKERS,
+        help=f"Number of articles synthesized at once (default: {DEFAULT_WORKERS})",
+    )
+    arg_parser.add_argument(
+        "--requests-per-minute",
+        type=float,
+        default=DEFAULT_REQUESTS_PER_MINUTE,
+        help=f"Maximum TTS requests per minute across all articles (default: {DEFAULT_REQUESTS_PER_MINUTE})",
+    )
+    args = arg_parser.parse_args()
+    max_in_flight: int = args.max_in_flight  # pyright: ignore[reportAny]
+    workers: int = args.workers  # pyright: ignore[reportAny]
+    requests_per_minute: float = args.requests_per_minute  # pyright: ignore[reportAny]
+    if max_in_flight < 1:
+        arg_parser.error("--max-in-flight must be at least 1")
+    if workers < 1:
+        arg_parser.error("--workers must be at least 1")
+    if requests_per_minute <= 0:
+        arg_parser.error("--requests-per-minute must be positive")
+    process_files(max_in_flight=max_in_flight, workers=workers, requests_per_minute=requests_per_minute)
+
+
 if __name__ == "__main__":
-    process_files()
+    main()